@@ -5,7 +5,7 @@ Orchestrates all modules to detect, analyze, and promote innovative projects.
 
 import json
 import sys
-from modules import detect, promote, recommend, feedback, notifications, network_analysis
+from modules import detect, promote, recommend, feedback, notifications, network_analysis, ranking
 from modules.i18n import t, set_language, bilingual
 from ai import advanced_analysis
 from connectors import twitter, linkedin
@@ -51,12 +51,16 @@ def main():
     # Initialize notification manager
     notifier = notifications.NotificationManager()
     
+    # Write all promotions as one document to promotion.output_file; stdout keeps the summary
+    promotion = config.get("promotion", {})
+    output_file = promotion.get("output_file")
+    if output_file:
+        promote.promote_projects(projects, format=promotion.get("default_format", "console"), sink=output_file)
+        print(f"📄 Promotions written to {output_file}")
+    
     # Process each project
     for i, project in enumerate(projects, 1):
-        print(f"\n--- Project {i}/{len(projects)} ---")
-        
-        # Promote project
-        promote.promote_project(project, format=config.get("promotion", {}).get("default_format", "console"))
+        print(f"\n--- Project {i}/{len(projects)}: {project['full_name']} ---")
         
         # AI Analysis
         print("🤖 AI Analysis:")
@@ -76,7 +80,14 @@ def main():
         
         # Send notification if matches criteria
         if notifier.check_and_notify(project):
-            print("   ✓ Notification sent")
+            print("   ✓ Notification queued")
+    
+    # Trending and milestone alerts against the previous runs' star counts
+    for event in notifier.track_trends(projects):
+        print(f"   ✓ {event['type'].capitalize()} alert: {event['project'].get('full_name')}")
+    
+    # Deliver queued notifications before the summary
+    notifier.close()
     
     print(f"\n{'='*70}")
     print("📊 Summary & Recommendations")
@@ -84,10 +95,13 @@ def main():
     
     # Get recommendations
     user_interests = config.get("recommendations", {}).get("user_interests", ["ai", "innovation"])
+    feedback_ranking = ranking.FeedbackRanking(feedback.FeedbackCollector())
+    feedback_ranking.add_projects(projects)
     recommendations = recommend.recommend_collaborations(
         projects, 
         user_interests=user_interests,
-        limit=5
+        limit=5,
+        ranking=feedback_ranking
     )
     
     print(f"🎯 Top {len(recommendations)} Recommended Projects:")
@@ -101,15 +115,20 @@ def main():
     print("🌐 Network Analysis")
     print(f"{'='*70}\n")
     
-    ecosystem = network_analysis.analyze_ecosystem(projects)
+    ecosystem = network_analysis.analyze_ecosystem(
+        projects,
+        min_similarity=config.get("network", {}).get("min_similarity", 0)
+    )
     print(f"Total Projects: {ecosystem['total_projects']}")
     print(f"Total Connections: {ecosystem['total_connections']}")
     print(f"Communities Detected: {ecosystem['communities']}")
+    print(f"Community Sizes: {', '.join(str(size) for size in ecosystem['community_sizes'][:10]) or 'N/A'}")
+    print(f"Modularity: {ecosystem['modularity']}")
     print(f"Network Density: {ecosystem['network_density']}")
     
-    print("\nMost Central Projects:")
-    for name, connections in ecosystem['central_projects'][:5]:
-        print(f"   • {name}: {connections} connections")
+    print("\nMost Central Projects (PageRank):")
+    for name, score in ecosystem['central_projects'][:5]:
+        print(f"   • {name}: {score}")
     
     # Social media promotion
     print(f"\n{'='*70}")
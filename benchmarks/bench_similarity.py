@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the pairwise similarity kernel.
+Compares SimilarityKernel against the per-pair NetworkAnalyzer._calculate_similarity
+on the candidate pairs of synthetic networks.
+Run with: python benchmarks/bench_similarity.py [sizes...]
+"""
+
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.network_analysis import NetworkAnalyzer
+from modules import similarity
+from modules.similarity import SimilarityKernel
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+
+WORDS = (
+    "ai machine learning blockchain cloud quantum edge neural deep framework library "
+    "tool fast simple modern web api server client data analytics visualization security "
+    "crypto iot devops kubernetes docker platform engine runtime compiler database storage "
+    "search graph model agent"
+).split()
+LANGUAGES = ["Python", "Go", "Rust", "JavaScript", "TypeScript", "Java", "C++", "C", "Ruby", None]
+
+def make_projects(count, seed=42):
+    """Generate synthetic projects with a long-tailed star distribution."""
+    rng = random.Random(seed)
+    return [
+        {
+            "full_name": f"owner{i % 997}/repo-{i}",
+            "language": rng.choice(LANGUAGES),
+            "description": " ".join(rng.sample(WORDS, rng.randint(3, 9))),
+            "stargazers_count": int(rng.paretovariate(1.1) * 10)
+        }
+        for i in range(count)
+    ]
+
+def bench(count):
+    """Time the per-pair scorer and the kernel on the same candidate pairs."""
+    projects = make_projects(count)
+    
+    analyzer = NetworkAnalyzer()
+    for project in projects:
+        analyzer._index[project['full_name']] = analyzer.kernel.add(project)
+        analyzer.projects.append(project)
+    left, right = analyzer._candidate_pairs(range(count))
+    
+    start = time.perf_counter()
+    reference = [analyzer._calculate_similarity(projects[i], projects[j]) for i, j in zip(left, right)]
+    per_pair = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    kernel = SimilarityKernel()
+    for project in projects:
+        kernel.add(project)
+    serial_scores = kernel.score_pairs(left, right, workers=1)
+    serial = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    parallel_scores = kernel.score_pairs(left, right, workers=os.cpu_count())
+    parallel = time.perf_counter() - start
+    
+    assert list(serial_scores) == reference, "Kernel must match the per-pair scorer"
+    assert list(parallel_scores) == reference, "Parallel kernel must match the per-pair scorer"
+    
+    print(f"{count:>8} projects | {len(left):>9} pairs | per-pair {per_pair:7.2f}s | "
+          f"kernel {serial:7.2f}s ({per_pair / serial:4.1f}x) | "
+          f"kernel x{os.cpu_count()} {parallel:7.2f}s ({per_pair / parallel:4.1f}x)")
+
+def main():
+    """Run the benchmark for each requested size."""
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print("=" * 100)
+    print("SIMILARITY KERNEL BENCHMARK")
+    print(f"Shared words: {'NumPy batch intersection' if similarity.np is not None else 'pure-Python set intersection'}")
+    print("=" * 100)
+    for count in sizes:
+        bench(count)
+
+if __name__ == "__main__":
+    main()
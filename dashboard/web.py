@@ -7,12 +7,14 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 
-def show_dashboard(projects):
+def show_dashboard(projects, ranking=None):
     """
     Display the main dashboard with projects and analytics.
     
     Args:
         projects: List of project dictionaries
+        ranking: Optional FeedbackRanking blending community ratings into
+            the recommendations
     """
     st.set_page_config(
         page_title="GitHub Innovation Promoter",
@@ -68,7 +70,7 @@ def show_dashboard(projects):
         _show_analytics(filtered_projects)
     
     with tab3:
-        _show_recommendations(filtered_projects)
+        _show_recommendations(filtered_projects, ranking)
     
     with tab4:
         _show_trends(filtered_projects)
@@ -174,19 +176,26 @@ def _show_analytics(projects):
     st.write("**Statistical Overview**")
     st.dataframe(df.describe(), use_container_width=True)
 
-def _show_recommendations(projects):
+def _show_recommendations(projects, ranking=None):
     """Display personalized recommendations."""
     st.subheader("🎯 Personalized Recommendations")
     
     st.write("Based on your interests, we recommend exploring these projects:")
     
-    # Simple recommendation: highest innovation score
-    recommended = sorted(projects, key=lambda x: x.get("innovation_score", 0), reverse=True)[:5]
+    # Highest innovation score, weighted by community ratings when available
+    def score(project):
+        blended = ranking.score(project["full_name"]) if ranking is not None else None
+        return blended if blended is not None else project.get("innovation_score", 0)
+    
+    recommended = sorted(projects, key=score, reverse=True)[:5]
     
     for i, project in enumerate(recommended, 1):
         st.write(f"**{i}. {project['full_name']}**")
         st.write(f"   {project.get('description', 'No description')[:100]}...")
         st.write(f"   🎯 Innovation Score: {project.get('innovation_score', 0)} | ⭐ {project.get('stargazers_count', 0)} stars")
+        row = ranking.get(project["full_name"]) if ranking is not None else None
+        if row and row["reviews"]:
+            st.write(f"   💬 Community rating: {row['average_rating']:.1f}/5 ({row['reviews']} reviews)")
         st.write(f"   [Explore →]({project['html_url']})")
         st.write("")
 
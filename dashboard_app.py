@@ -6,8 +6,12 @@ Run with: streamlit run dashboard_app.py
 import sys
 sys.path.insert(0, '.')
 
+import streamlit as st
+
 from dashboard.web import show_dashboard
 from modules import detect
+from modules.feedback import get_feedback_service
+from modules.ranking import FeedbackRanking
 import json
 
 def load_config():
@@ -18,6 +22,11 @@ def load_config():
     except (FileNotFoundError, json.JSONDecodeError):
         return {"detection": {"limit": 20}}
 
+@st.cache_resource
+def get_feedback_ranking():
+    """Feedback ranking shared across reruns and sessions, following new ratings."""
+    return FeedbackRanking(get_feedback_service().collector)
+
 def main():
     """Main dashboard application."""
     config = load_config()
@@ -28,8 +37,13 @@ def main():
     
     projects = detect.get_innovative_projects(limit=limit, criteria=criteria)
     
+    # Join community ratings (picks up ratings stored by other processes)
+    ranking = get_feedback_ranking()
+    ranking.collector.refresh()
+    ranking.add_projects(projects)
+    
     # Show dashboard
-    show_dashboard(projects)
+    show_dashboard(projects, ranking)
 
 if __name__ == "__main__":
     main()
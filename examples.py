@@ -126,6 +126,7 @@ def example_notifications():
     for i, project in enumerate(projects):
         notification_types = ["new_project", "trending", "opportunity"]
         notifier.send_notification(notification_types[i % 3], project)
+    notifier.flush()  # Delivery runs in the background
     
     # Show notification history
     print("\nNotification History:")
@@ -147,12 +148,12 @@ def example_network_analysis():
     print("Ecosystem Analysis:")
     print(f"  Total Projects: {ecosystem['total_projects']}")
     print(f"  Total Connections: {ecosystem['total_connections']}")
-    print(f"  Communities: {ecosystem['communities']}")
+    print(f"  Communities: {ecosystem['communities']} (modularity: {ecosystem['modularity']})")
     print(f"  Network Density: {ecosystem['network_density']}")
     
-    print("\nMost Central Projects:")
-    for name, connections in ecosystem['central_projects']:
-        print(f"  • {name}: {connections} connections")
+    print("\nMost Central Projects (PageRank):")
+    for name, score in ecosystem['central_projects']:
+        print(f"  • {name}: {score}")
     
     # Find collaborators for first project
     if projects:
@@ -0,0 +1,11 @@
+"""
+File helpers shared by the append-only JSONL logs.
+"""
+
+import os
+
+def ends_with_newline(path):
+    """True if a non-empty file's last byte is a newline (a line torn by a crash is not)."""
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
@@ -0,0 +1,247 @@
+"""
+Community detection for the project network.
+Runs weighted label propagation and Louvain-style modularity optimization
+on the CSR ProjectGraph, with optional seeding from a previous run.
+"""
+
+import random
+from array import array
+from collections import defaultdict, deque
+
+# Community detection configuration
+DEFAULT_METHOD = "louvain"
+DEFAULT_RESOLUTION = 1.0
+MAX_LOUVAIN_LEVELS = 10
+MAX_PROPAGATION_ITERATIONS = 20
+MIN_GAIN = 1e-9
+
+def detect_communities(graph, method=DEFAULT_METHOD, seeds=None, resolution=DEFAULT_RESOLUTION,
+                       random_seed=0):
+    """
+    Detect communities in a weighted graph.
+    
+    Args:
+        graph: ProjectGraph
+        method: "louvain" or "label_propagation"
+        seeds: Optional initial labels per node (sequence or dict node -> label),
+            e.g. the labels of a previous run; unseeded nodes start alone
+        resolution: Modularity resolution (higher = smaller communities)
+        random_seed: Seed for the node visiting order
+    
+    Returns:
+        Dictionary with labels (one per node, 0 = largest community),
+        community sizes and modularity
+    """
+    if method == "louvain":
+        labels = louvain(graph, seeds, resolution, random_seed)
+    elif method == "label_propagation":
+        labels = label_propagation(graph, seeds, random_seed=random_seed)
+    else:
+        raise ValueError(f"Unknown community detection method: {method}")
+    
+    labels, sizes = _relabel_by_size(labels)
+    return {
+        "labels": labels,
+        "sizes": sizes,
+        "modularity": round(modularity(graph, labels, resolution), 4)
+    }
+
+def label_propagation(graph, seeds=None, max_iterations=MAX_PROPAGATION_ITERATIONS, random_seed=0):
+    """
+    Weighted label propagation.
+    
+    Each node adopts the label with the largest total edge weight among its
+    neighbours; ties keep the current label, then the smallest one. Only
+    neighbours of relabelled nodes are revisited, for at most
+    `max_iterations` visits per node on average.
+    
+    Returns:
+        array of labels, one per node
+    """
+    n = graph.num_nodes
+    labels = _initial_labels(n, seeds)
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    order = [node for node in range(n) if indptr[node + 1] > indptr[node]]
+    random.Random(random_seed).shuffle(order)
+    queue = deque(order)
+    queued = bytearray(n)
+    for node in order:
+        queued[node] = 1
+    budget = max_iterations * len(order)
+    
+    while queue and budget > 0:
+        budget -= 1
+        node = queue.popleft()
+        queued[node] = 0
+        start, end = indptr[node], indptr[node + 1]
+        scores = {}
+        for k in range(start, end):
+            label = labels[indices[k]]
+            scores[label] = scores.get(label, 0.0) + weights[k]
+        
+        current = labels[node]
+        best_score = max(scores.values())
+        if scores.get(current, 0.0) >= best_score:
+            continue
+        best = min(label for label, score in scores.items() if score == best_score)
+        labels[node] = best
+        
+        for k in range(start, end):
+            neighbor = indices[k]
+            if not queued[neighbor] and labels[neighbor] != best:
+                queued[neighbor] = 1
+                queue.append(neighbor)
+    
+    return labels
+
+def louvain(graph, seeds=None, resolution=DEFAULT_RESOLUTION, random_seed=0):
+    """
+    Louvain modularity optimization.
+    
+    Alternates local moving of nodes between neighbouring communities with
+    aggregation of each community into a single node, until no move improves
+    modularity.
+    
+    Returns:
+        array of labels, one per node
+    """
+    n = graph.num_nodes
+    # Level graph as adjacency dicts of directed weights (self-loops allowed)
+    adjacency = [dict() for _ in range(n)]
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    for node in range(n):
+        row = adjacency[node]
+        for k in range(indptr[node], indptr[node + 1]):
+            row[indices[k]] = row.get(indices[k], 0.0) + weights[k]
+    
+    membership = array('i', range(n))
+    partition = list(_initial_labels(n, seeds))
+    rng = random.Random(random_seed)
+    
+    for _ in range(MAX_LOUVAIN_LEVELS):
+        partition, moved = _local_moving(adjacency, partition, resolution, rng)
+        partition, count = _compact(partition)
+        for node in range(n):
+            membership[node] = partition[membership[node]]
+        
+        if not moved or count == len(adjacency):
+            break
+        
+        adjacency = _aggregate(adjacency, partition, count)
+        partition = list(range(count))
+    
+    return membership
+
+def modularity(graph, labels, resolution=DEFAULT_RESOLUTION):
+    """Weighted modularity of a partition of the graph."""
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    internal = defaultdict(float)
+    total = defaultdict(float)
+    m2 = 0.0
+    
+    for node in range(graph.num_nodes):
+        label = labels[node]
+        for k in range(indptr[node], indptr[node + 1]):
+            weight = weights[k]
+            m2 += weight
+            total[label] += weight
+            if labels[indices[k]] == label:
+                internal[label] += weight
+    
+    if m2 == 0:
+        return 0.0
+    return sum(internal[c] / m2 - resolution * (total[c] / m2) ** 2 for c in total)
+
+def _local_moving(adjacency, partition, resolution, rng):
+    """
+    Move nodes to the neighbouring community with the best modularity gain.
+    
+    Uses a work queue: after the first sweep only neighbours of nodes that
+    moved are revisited, which keeps later sweeps cheap on large graphs.
+    """
+    strength = [sum(row.values()) for row in adjacency]
+    m2 = sum(strength)
+    if m2 == 0:
+        return partition, False
+    
+    totals = defaultdict(float)
+    for node, community in enumerate(partition):
+        totals[community] += strength[node]
+    
+    order = [node for node in range(len(adjacency)) if adjacency[node]]
+    rng.shuffle(order)
+    queue = deque(order)
+    queued = bytearray(len(adjacency))
+    for node in order:
+        queued[node] = 1
+    moved_any = False
+    
+    while queue:
+        node = queue.popleft()
+        queued[node] = 0
+        current = partition[node]
+        k_node = strength[node]
+        links = {}
+        for neighbor, weight in adjacency[node].items():
+            if neighbor != node:
+                community = partition[neighbor]
+                links[community] = links.get(community, 0.0) + weight
+        
+        totals[current] -= k_node
+        scale = resolution * k_node / m2
+        best = current
+        best_gain = links.get(current, 0.0) - totals[current] * scale
+        for community, weight in links.items():
+            gain = weight - totals[community] * scale
+            if gain > best_gain + MIN_GAIN:
+                best, best_gain = community, gain
+        totals[best] += k_node
+        
+        if best != current:
+            partition[node] = best
+            moved_any = True
+            for neighbor in adjacency[node]:
+                if not queued[neighbor] and partition[neighbor] != best:
+                    queued[neighbor] = 1
+                    queue.append(neighbor)
+    
+    return partition, moved_any
+
+def _aggregate(adjacency, partition, count):
+    """Collapse each community into one node, summing edge weights."""
+    aggregated = [dict() for _ in range(count)]
+    for node, row in enumerate(adjacency):
+        target = aggregated[partition[node]]
+        for neighbor, weight in row.items():
+            community = partition[neighbor]
+            target[community] = target.get(community, 0.0) + weight
+    return aggregated
+
+def _initial_labels(n, seeds):
+    """Start from the seeded labels; unseeded nodes get a singleton label."""
+    labels = array('i', range(n))
+    if not seeds:
+        return labels
+    
+    items = seeds.items() if isinstance(seeds, dict) else enumerate(seeds)
+    mapping = {}
+    for node, label in items:
+        if node < n and label is not None and label >= 0:
+            labels[node] = mapping.setdefault(label, n + len(mapping))
+    labels, _ = _compact(labels)
+    return labels
+
+def _compact(labels):
+    """Renumber labels to 0..k-1 in order of first appearance."""
+    mapping = {}
+    compacted = array('i', (mapping.setdefault(label, len(mapping)) for label in labels))
+    return compacted, len(mapping)
+
+def _relabel_by_size(labels):
+    """Renumber labels so that community 0 is the largest."""
+    counts = defaultdict(int)
+    for label in labels:
+        counts[label] += 1
+    ranking = sorted(counts, key=lambda label: (-counts[label], label))
+    mapping = {label: rank for rank, label in enumerate(ranking)}
+    return array('i', (mapping[label] for label in labels)), [counts[label] for label in ranking]
@@ -0,0 +1,132 @@
+"""
+Contributor-overlap network.
+Builds a user-project bipartite graph from repository contributor lists and
+projects it onto weighted project-project edges counting shared contributors.
+"""
+
+import time
+from array import array
+
+import requests
+
+from modules.github_client import GitHubClient
+from modules.graph import GraphBuilder
+
+# Contributor network configuration
+MIN_SHARED_CONTRIBUTORS = 1  # Shared contributors needed to link two projects
+MAX_USER_PROJECTS = 500  # Users on more tracked projects than this (bots, mass committers) are ignored
+REFRESH_AGE = 7 * 24 * 3600  # Seconds before a project's contributor list is refetched
+CONTRIBUTOR_PAGES = 1  # Contributor pages per project (100 users each, most active first)
+
+class ContributorNetwork:
+    """
+    User-project bipartite graph built from contributor lists.
+    
+    Contributor lists are fetched concurrently through a pooled, caching
+    GitHubClient and only for projects that are new or older than
+    `refresh_age`, so refreshing a large network costs API calls only for
+    what is stale. The bipartite graph is kept as sorted user-ID arrays per
+    project (the rows of a sparse project x user matrix B); the overlap
+    network is the sparse product B * B^T.
+    """
+    
+    def __init__(self, client=None, min_shared=MIN_SHARED_CONTRIBUTORS, refresh_age=REFRESH_AGE,
+                 max_pages=CONTRIBUTOR_PAGES):
+        """
+        Args:
+            client: GitHubClient (a default one is created when omitted)
+            min_shared: Minimum shared contributors for an edge
+            refresh_age: Seconds before a contributor list is fetched again
+            max_pages: Contributor pages fetched per project
+        """
+        self.client = client or GitHubClient()
+        self.min_shared = min_shared
+        self.refresh_age = refresh_age
+        self.max_pages = max_pages
+        self.users = {}  # login -> user ID
+        self.contributors = {}  # project full_name -> sorted array of user IDs
+        self._fetched = {}  # project full_name -> fetch time
+    
+    def refresh(self, projects, force=False):
+        """
+        Fetch contributor lists for projects that are new or stale.
+        
+        Failed fetches keep the previous list, if any.
+        
+        Returns:
+            Number of projects whose contributors were fetched
+        """
+        now = time.time()
+        names = []
+        for project in projects:
+            name = project['full_name'] if isinstance(project, dict) else project
+            if force or now - self._fetched.get(name, 0) >= self.refresh_age:
+                names.append(name)
+        
+        fetched = 0
+        for name, contributors in zip(names, self.client.map(self._fetch, names)):
+            if contributors is not None:
+                self.set_contributors(name, contributors)
+                fetched += 1
+        self.client.save_cache()
+        return fetched
+    
+    def set_contributors(self, project_name, logins):
+        """Record the contributors of a project (logins or GitHub user dicts)."""
+        ids = set()
+        for user in logins:
+            if isinstance(user, dict):
+                if user.get('type') == "Bot" or not user.get('login'):
+                    continue
+                user = user['login']
+            ids.add(self.users.setdefault(user, len(self.users)))
+        self.contributors[project_name] = array('i', sorted(ids))
+        self._fetched[project_name] = time.time()
+    
+    def build_graph(self, project_names):
+        """
+        Project the bipartite graph onto the given projects.
+        
+        Edge weights count shared contributors. Node IDs follow the order of
+        `project_names`, so the result lines up with NetworkAnalyzer.projects.
+        
+        Returns:
+            ProjectGraph
+        """
+        rows = [self.contributors.get(name, array('i')) for name in project_names]
+        
+        # Transpose B: user ID -> projects they contributed to
+        members = {}
+        for node, row in enumerate(rows):
+            for user in row:
+                members.setdefault(user, array('i')).append(node)
+        
+        # B * B^T, row by row, upper triangle only
+        builder = GraphBuilder()
+        for node, row in enumerate(rows):
+            shared = {}
+            for user in row:
+                projects = members[user]
+                if len(projects) > MAX_USER_PROJECTS:
+                    continue
+                for other in projects:
+                    if other > node:
+                        shared[other] = shared.get(other, 0) + 1
+            for other, count in shared.items():
+                if count >= self.min_shared:
+                    builder.add_edge(node, other, count)
+        
+        return builder.build(len(rows))
+    
+    def shared_contributors(self, project1_name, project2_name):
+        """Logins contributing to both projects."""
+        logins = {user_id: login for login, user_id in self.users.items()}
+        common = set(self.contributors.get(project1_name, ())) & set(self.contributors.get(project2_name, ()))
+        return sorted(logins[user_id] for user_id in common)
+    
+    def _fetch(self, name):
+        try:
+            return self.client.get_contributors(name, max_pages=self.max_pages)
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️  Could not fetch contributors of {name}: {e}")
+            return None
@@ -0,0 +1,217 @@
+"""
+Persistent notification deduplication.
+Remembers which (subscriber, project, notification type) alerts were sent,
+with per-type TTLs, in a memory-mapped open-addressing hash table on disk.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import time
+from array import array
+
+# Deduplication configuration
+SEEN_FILE = "notifications_seen.bin"
+INITIAL_CAPACITY = 1 << 16  # Slots; the table doubles past MAX_LOAD
+MAX_LOAD = 0.7
+DAY = 24 * 3600
+DEFAULT_TTL = 30 * DAY
+NOTIFICATION_TTLS = {
+    "new_project": 90 * DAY,
+    "trending": 3 * DAY,
+    "milestone": None,  # Milestones are keyed by threshold and never repeat
+    "opportunity": 7 * DAY,
+    "update": DAY
+}
+
+SEEN_MAGIC = b"GIPSEEN1"
+_HEADER = struct.Struct("<8sQQ")  # magic, capacity, used slots
+_NEVER = 0xFFFFFFFF  # Expiry of entries without TTL
+
+class SeenStore:
+    """
+    On-disk set of sent notifications with expiry.
+    
+    Each entry is a 64-bit hash of (subscriber, project, type[, threshold])
+    plus a 32-bit expiry time, stored in a linear-probing hash table inside
+    a memory-mapped file (native byte order): 12 bytes per slot, O(1)
+    membership checks without loading the file. Expired slots are reused in
+    place and dropped when the table grows.
+    """
+    
+    def __init__(self, path=SEEN_FILE, ttls=None, default_ttl=DEFAULT_TTL, capacity=INITIAL_CAPACITY):
+        """
+        Args:
+            path: Table file, created on first use
+            ttls: Seconds before a notification type may repeat (None = never)
+            default_ttl: TTL for types missing from ttls
+            capacity: Initial slot count for a new file (rounded up to a power of two)
+        """
+        self.path = path
+        self.ttls = dict(NOTIFICATION_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.initial_capacity = 1 << max(capacity - 1, 1).bit_length()
+        self._file = None
+        self._mmap = None
+    
+    def __len__(self):
+        """Number of occupied slots (including expired entries not yet reused)."""
+        self._open()
+        return self._used
+    
+    def check_and_add(self, subscriber, project, notification_type, threshold=None, now=None):
+        """
+        Record a notification unless an unexpired identical one exists.
+        
+        Args:
+            subscriber: Subscriber ID
+            project: Project full_name
+            notification_type: Notification type (selects the TTL)
+            threshold: Optional value making the event distinct, e.g. the
+                milestone crossed
+            now: Current time in seconds (default: time.time())
+        
+        Returns:
+            True if the notification is new and should be sent
+        """
+        self._open()
+        now = int(now if now is not None else time.time())
+        key = _hash_key(subscriber, project, notification_type, threshold)
+        ttl = self.ttls.get(notification_type, self.default_ttl)
+        expiry = _NEVER if ttl is None else min(now + ttl, _NEVER - 1)
+        
+        slot, found = self._find(key, now)
+        if found:
+            if self._expiries[slot] > now:
+                return False
+            self._expiries[slot] = expiry
+            return True
+        
+        if self._keys[slot] == 0:
+            if (self._used + 1) > MAX_LOAD * self._capacity:
+                self._resize(self._capacity * 2, now)
+                slot, _ = self._find(key, now)
+            if self._keys[slot] == 0:
+                self._used += 1
+                _HEADER.pack_into(self._mmap, 0, SEEN_MAGIC, self._capacity, self._used)
+        self._keys[slot] = key
+        self._expiries[slot] = expiry
+        return True
+    
+    def seen(self, subscriber, project, notification_type, threshold=None, now=None):
+        """True if an unexpired identical notification was recorded."""
+        self._open()
+        now = int(now if now is not None else time.time())
+        slot, found = self._find(_hash_key(subscriber, project, notification_type, threshold), now)
+        return found and self._expiries[slot] > now
+    
+    def forget(self, subscriber, project, notification_type, threshold=None):
+        """
+        Drop a recorded notification (e.g. one that could not be delivered) so it may be sent again.
+        
+        Returns:
+            True if an entry was removed
+        """
+        self._open()
+        slot, found = self._find(_hash_key(subscriber, project, notification_type, threshold), 0)
+        if not found or not self._expiries[slot]:
+            return False
+        self._expiries[slot] = 0  # Expired: reused in place like any other stale slot
+        return True
+    
+    def flush(self):
+        """Write dirty pages to disk."""
+        if self._mmap is not None:
+            self._mmap.flush()
+    
+    def close(self):
+        """Flush and unmap the table."""
+        if self._mmap is None:
+            return
+        self._release()
+        self._mmap.close()
+        self._file.close()
+        self._mmap = self._file = None
+    
+    def _find(self, key, now):
+        """
+        Probe for a key.
+        
+        Returns:
+            (slot, True) if the key is present, otherwise (slot, False) where
+            slot is the first expired slot on the probe path or the empty slot
+            ending it
+        """
+        keys, expiries = self._keys, self._expiries
+        mask = self._capacity - 1
+        slot = key & mask
+        reusable = None
+        while True:
+            current = keys[slot]
+            if current == key:
+                return slot, True
+            if current == 0:
+                return (slot if reusable is None else reusable), False
+            if reusable is None and expiries[slot] <= now:
+                reusable = slot
+            slot = (slot + 1) & mask
+    
+    def _open(self):
+        if self._mmap is not None:
+            return
+        if not os.path.exists(self.path):
+            self._write_table(self.path, self.initial_capacity, [])
+        self._map(self.path)
+    
+    def _map(self, path):
+        self._file = open(path, "r+b")
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        magic, self._capacity, self._used = _HEADER.unpack_from(self._mmap, 0)
+        if magic != SEEN_MAGIC:
+            raise ValueError(f"Not a notification seen-set: {path}")
+        keys_end = _HEADER.size + 8 * self._capacity
+        view = memoryview(self._mmap)
+        self._keys = view[_HEADER.size:keys_end].cast('Q')
+        self._expiries = view[keys_end:keys_end + 4 * self._capacity].cast('I')
+    
+    def _release(self):
+        self._keys.release()
+        self._expiries.release()
+        self._mmap.flush()
+    
+    def _resize(self, capacity, now):
+        """Rehash live entries into a table of the given capacity."""
+        entries = [(key, expiry) for key, expiry in zip(self._keys, self._expiries) if key and expiry > now]
+        while len(entries) + 1 > MAX_LOAD * capacity:
+            capacity *= 2
+        temp_path = f"{self.path}.tmp{os.getpid()}"
+        self._write_table(temp_path, capacity, entries)
+        self.close()
+        os.replace(temp_path, self.path)
+        self._map(self.path)
+    
+    @staticmethod
+    def _write_table(path, capacity, entries):
+        """Create a table file holding the given (key, expiry) entries."""
+        keys = array('Q', bytes(8 * capacity))
+        expiries = array('I', bytes(4 * capacity))
+        mask = capacity - 1
+        for key, expiry in entries:
+            slot = key & mask
+            while keys[slot]:
+                slot = (slot + 1) & mask
+            keys[slot] = key
+            expiries[slot] = expiry
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(SEEN_MAGIC, capacity, len(entries)))
+            keys.tofile(f)
+            expiries.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+def _hash_key(subscriber, project, notification_type, threshold):
+    """64-bit non-zero key for a notification identity."""
+    text = f"{subscriber}\0{project}\0{notification_type}\0{'' if threshold is None else threshold}"
+    key = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+    return key or 1
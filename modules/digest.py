@@ -0,0 +1,156 @@
+"""
+Digest scheduling for notification subscribers.
+Buffers matched events per subscriber over daily or weekly windows and,
+when a window closes, renders every subscriber's digest from per-project
+fragments that are rendered once and shared.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+# Digest configuration
+DIGEST_FILE = "notifications_digests.json"
+PERIODS = ("daily", "weekly")
+MAX_DIGEST_ITEMS = 10  # Projects listed per digest
+DESCRIPTION_LENGTH = 80
+TYPE_PRIORITY = {"milestone": 4, "trending": 3, "new_project": 2, "opportunity": 1, "update": 0}
+PROJECT_FIELDS = ("full_name", "stargazers_count", "description")  # Kept per buffered project
+
+class DigestScheduler:
+    """
+    Collects events into per-subscriber digests over time windows.
+    
+    Repeated events for the same subscriber and project within a window are
+    coalesced into one entry (keeping the most significant type). Project
+    records are stored once per window, not per subscriber, and each
+    project's digest line is rendered once when the window closes and
+    reused for every subscriber listing it.
+    
+    With a path, open windows are saved there (save) and loaded on the next
+    start, so events buffered by a short-lived process reach the digest
+    sent by a later one.
+    """
+    
+    def __init__(self, path=None, max_items=MAX_DIGEST_ITEMS):
+        """
+        Args:
+            path: Optional JSON file open windows are loaded from and saved to
+            max_items: Projects listed per digest
+        """
+        self.path = path
+        self.max_items = max_items
+        self._windows = {}  # (period, window start) -> {"projects": {...}, "subscribers": {...}}
+        self._dirty = False
+        if path and os.path.exists(path):
+            self.load(path)
+    
+    def add_event(self, subscriber, project, notification_type="new_project", period="daily", now=None):
+        """
+        Buffer an event for a subscriber's next digest.
+        
+        Args:
+            subscriber: Subscriber ID
+            project: Project dictionary
+            notification_type: Type of the event
+            period: "daily" or "weekly"
+            now: Event time (default: now)
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown digest period: {period}")
+        start = window_start(now or datetime.now(), period)
+        window = self._windows.setdefault((period, start), {"projects": {}, "subscribers": {}})
+        
+        name = project.get("full_name")
+        window["projects"][name] = {field: project.get(field) for field in PROJECT_FIELDS}
+        events = window["subscribers"].setdefault(subscriber, {})
+        current = events.get(name)
+        if current is None or TYPE_PRIORITY.get(notification_type, 0) > TYPE_PRIORITY.get(current, 0):
+            events[name] = notification_type
+        self._dirty = True
+    
+    def pending(self):
+        """Number of buffered (subscriber, project) entries across open windows."""
+        return sum(len(events) for window in self._windows.values() for events in window["subscribers"].values())
+    
+    def close_due(self, now=None):
+        """
+        Close every window that has ended and stream its digests.
+        
+        Yields:
+            (subscriber, period, digest text) tuples
+        """
+        now = now or datetime.now()
+        for period, start in sorted(self._windows):
+            if window_end(start, period) <= now:
+                yield from self.close_window(period, start)
+    
+    def close_window(self, period, start):
+        """Render and drop one window, yielding (subscriber, period, digest text)."""
+        window = self._windows.pop((period, start), None)
+        if window is None:
+            return
+        self._dirty = True
+        
+        projects = window["projects"]
+        fragments = {}  # (project, type) -> rendered line, shared by all subscribers
+        header = f"\n{'=' * 70}\n📊 {period.upper()} INNOVATION DIGEST ({start:%Y-%m-%d})\n{'=' * 70}\n"
+        footer = f"\n{'=' * 70}\n"
+        
+        for subscriber, events in window["subscribers"].items():
+            ranked = sorted(events.items(), key=lambda event: (
+                -TYPE_PRIORITY.get(event[1], 0), -(projects[event[0]].get("stargazers_count", 0) or 0)
+            ))
+            items = []
+            for i, (name, notification_type) in enumerate(ranked[:self.max_items], 1):
+                fragment = fragments.get((name, notification_type))
+                if fragment is None:
+                    fragment = render_fragment(projects[name], notification_type)
+                    fragments[(name, notification_type)] = fragment
+                items.append(f"{i}. {fragment}")
+            summary = f"\n🎯 {len(events)} projects for you\n\n"
+            yield subscriber, period, header + summary + "\n\n".join(items) + footer
+    
+    def load(self, path):
+        """Replace the open windows with the ones saved at path."""
+        with open(path, "r", encoding="utf-8") as f:
+            windows = json.load(f).get("windows", [])
+        self._windows = {
+            (window["period"], datetime.fromisoformat(window["start"])): {
+                "projects": window["projects"], "subscribers": window["subscribers"]
+            }
+            for window in windows
+        }
+        self._dirty = False
+    
+    def save(self, path=None):
+        """Write the open windows to path (default: the scheduler's path) if they changed."""
+        path = path or self.path
+        if not path or not self._dirty:
+            return False
+        windows = [
+            {"period": period, "start": start.isoformat(), **window}
+            for (period, start), window in self._windows.items()
+        ]
+        temp_path = f"{path}.tmp{os.getpid()}"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "windows": windows}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, path)
+        self._dirty = False
+        return True
+
+def render_fragment(project, notification_type=None):
+    """One digest line for a project (without its list number)."""
+    icon = {"trending": "🔥 ", "milestone": "🎯 ", "opportunity": "💡 "}.get(notification_type, "")
+    name = project.get("full_name", "")
+    stars = project.get("stargazers_count", 0)
+    desc = (project.get("description") or "No description")[:DESCRIPTION_LENGTH]
+    return f"{icon}{name} ({stars} ⭐)\n   {desc}..."
+
+def window_start(moment, period):
+    """Start of the daily or weekly (Monday) window containing a moment."""
+    day = datetime(moment.year, moment.month, moment.day)
+    return day - timedelta(days=day.weekday()) if period == "weekly" else day
+
+def window_end(start, period):
+    return start + timedelta(days=7 if period == "weekly" else 1)
@@ -0,0 +1,278 @@
+"""
+Asynchronous notification delivery.
+Runs an asyncio event loop in a background thread with a bounded queue, a
+batch collector and a pool of sender threads per channel, retrying failed
+batches with backoff and writing undeliverable notifications to a
+dead-letter file.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import json
+import random
+import threading
+from datetime import datetime
+
+# Dispatcher configuration
+QUEUE_SIZE = 10000  # Pending notifications per channel before new ones are dead-lettered
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.5  # Seconds, doubled on each retry
+RETRY_MAX_DELAY = 30
+DEAD_LETTER_FILE = "notifications_dead_letter.jsonl"
+FLUSH_TIMEOUT = 30  # Seconds
+
+class Channel:
+    """
+    A notification delivery channel.
+    
+    Subclasses implement `send_batch`, which may block (it runs in a worker
+    thread) and should raise on failure so the batch is retried.
+    """
+    
+    name = "channel"
+    batch_size = 1  # Notifications per send_batch call
+    batch_interval = 0  # Seconds to wait for a batch to fill
+    workers = 1  # Batches sent concurrently
+    
+    def send_batch(self, notifications):
+        raise NotImplementedError
+    
+    def close(self):
+        """Release connections; called once the dispatcher has drained."""
+
+class CallbackChannel(Channel):
+    """Channel that calls a function once per notification."""
+    
+    def __init__(self, name, callback, batch_size=1, workers=1):
+        self.name = name
+        self.callback = callback
+        self.batch_size = batch_size
+        self.workers = workers
+    
+    def send_batch(self, notifications):
+        for notification in notifications:
+            self.callback(notification)
+
+class NotificationDispatcher:
+    """
+    Queues notifications per channel and delivers them in the background.
+    
+    `submit` returns immediately; each channel has its own bounded queue and
+    sender threads, so a slow or failing channel never holds up the caller
+    or the other channels. One collector per channel builds batches of
+    `batch_size` notifications (or whatever arrived within `batch_interval`
+    of the first) and hands them to up to `workers` concurrent sends; a
+    flush sends partial batches without waiting for the interval. Batches
+    that still fail after `max_retries` attempts are appended to the
+    dead-letter file, as are notifications arriving while a channel's queue
+    is full.
+    """
+    
+    def __init__(self, channels=(), queue_size=QUEUE_SIZE, max_retries=MAX_RETRIES,
+                 retry_delay=RETRY_BASE_DELAY, dead_letter_file=DEAD_LETTER_FILE, on_result=None):
+        """
+        Args:
+            channels: Channel instances to deliver to
+            queue_size: Maximum pending notifications per channel
+            max_retries: Retries per batch before dead-lettering
+            retry_delay: Initial retry delay in seconds (exponential backoff)
+            dead_letter_file: JSONL file for undeliverable notifications
+            on_result: Optional callback(channel name, notifications, error)
+                run on the dispatcher thread once a batch is delivered (error
+                None) or dead-lettered
+        """
+        self.channels = {channel.name: channel for channel in channels}
+        self.queue_size = queue_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.dead_letter_file = dead_letter_file
+        self.on_result = on_result
+        self.stats = {"queued": 0, "delivered": 0, "retried": 0, "dead_lettered": 0}
+        
+        self._loop = None
+        self._thread = None
+        self._queues = {}
+        self._executors = {}  # channel name -> ThreadPoolExecutor of channel.workers threads
+        self._file_executor = None  # Single thread for dead-letter appends
+        self._flushing = None  # asyncio.Event set while a flush is draining the queues
+        self._workers = []
+        self._sending = set()
+        self._lock = threading.Lock()
+    
+    def add_channel(self, channel):
+        """Register a channel; must be called before the first submit."""
+        if self._loop is not None:
+            raise RuntimeError("Channels must be added before the dispatcher starts")
+        self.channels[channel.name] = channel
+    
+    def submit(self, notification, channels=None):
+        """
+        Queue a notification for delivery without waiting for it.
+        
+        Args:
+            notification: Notification dictionary
+            channels: Channel names to deliver to (default: all)
+        """
+        self._start()
+        for name in channels if channels is not None else self.channels:
+            if name in self.channels:
+                self._loop.call_soon_threadsafe(self._enqueue, name, notification)
+    
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """
+        Block until every queued notification is delivered or dead-lettered.
+        
+        Returns:
+            True if the queues drained within the timeout
+        """
+        if self._loop is None:
+            return True
+        future = asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+        try:
+            future.result(timeout)
+            return True
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return False
+    
+    def close(self, timeout=FLUSH_TIMEOUT):
+        """Drain the queues, stop the workers and close the channels."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None:
+                return
+            self.flush(timeout)
+            asyncio.run_coroutine_threadsafe(self._stop(), loop).result(timeout)
+            for executor in (*self._executors.values(), self._file_executor):
+                executor.shutdown()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            loop.close()
+            self._loop = self._thread = None
+            atexit.unregister(self.close)
+        for channel in self.channels.values():
+            channel.close()
+    
+    def _start(self):
+        """Start the event loop thread and channel workers on first use."""
+        if self._loop is not None:
+            return
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            self._executors = {
+                name: concurrent.futures.ThreadPoolExecutor(channel.workers, thread_name_prefix=f"notify-{name}")
+                for name, channel in self.channels.items()
+            }
+            self._file_executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="notify-dead-letter")
+            self._thread = threading.Thread(target=loop.run_forever, name="notification-dispatcher", daemon=True)
+            self._thread.start()
+            asyncio.run_coroutine_threadsafe(self._spawn_workers(), loop).result()
+            self._loop = loop
+            atexit.register(self.close)
+    
+    async def _spawn_workers(self):
+        self._queues = {name: asyncio.Queue(self.queue_size) for name in self.channels}
+        self._flushing = asyncio.Event()
+        self._workers = [asyncio.create_task(self._collect(channel)) for channel in self.channels.values()]
+    
+    def _enqueue(self, name, notification):
+        try:
+            self._queues[name].put_nowait(notification)
+            self.stats["queued"] += 1
+        except asyncio.QueueFull:
+            self._dead_letter(name, [notification], "queue full")
+    
+    async def _collect(self, channel):
+        """Build full batches from the channel's queue and start a send for each."""
+        queue = self._queues[channel.name]
+        slots = asyncio.Semaphore(channel.workers)
+        while True:
+            await slots.acquire()  # Wait for a free sender, so batches fill meanwhile
+            batch = [await queue.get()]
+            await self._fill(queue, batch, channel)
+            task = asyncio.create_task(self._send(channel, batch, slots))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+    
+    async def _fill(self, queue, batch, channel):
+        """Add to a batch until it is full, its interval has passed or a flush starts."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + channel.batch_interval
+        while len(batch) < channel.batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0 or self._flushing.is_set():
+                return
+            getter = asyncio.ensure_future(queue.get())
+            flushing = asyncio.ensure_future(self._flushing.wait())
+            await asyncio.wait((getter, flushing), timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            flushing.cancel()
+            if getter.done():
+                batch.append(getter.result())
+            else:
+                getter.cancel()  # The queue keeps any item it was about to hand over
+    
+    async def _send(self, channel, batch, slots):
+        try:
+            await self._deliver(channel, batch)
+        finally:
+            slots.release()
+            queue = self._queues[channel.name]
+            for _ in batch:
+                queue.task_done()
+    
+    async def _deliver(self, channel, batch):
+        """Send a batch on the channel's own threads, retrying with exponential backoff and jitter."""
+        loop = asyncio.get_running_loop()
+        executor = self._executors[channel.name]
+        for attempt in range(self.max_retries + 1):
+            try:
+                await loop.run_in_executor(executor, channel.send_batch, batch)
+                self.stats["delivered"] += len(batch)
+                self._report(channel.name, batch, None)
+                return
+            except Exception as e:
+                error = e
+            if attempt < self.max_retries:
+                self.stats["retried"] += 1
+                delay = min(self.retry_delay * 2 ** attempt, RETRY_MAX_DELAY)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        await self._dead_letter(channel.name, batch, repr(error))
+    
+    def _dead_letter(self, channel, notifications, error):
+        """Append undeliverable notifications to the dead-letter file on the file thread."""
+        self.stats["dead_lettered"] += len(notifications)
+        self._report(channel, notifications, error)
+        return asyncio.get_running_loop().run_in_executor(self._file_executor, self._write_dead_letter,
+                                                          channel, list(notifications), error)
+    
+    def _report(self, channel, notifications, error):
+        if self.on_result is not None:
+            self.on_result(channel, notifications, error)
+    
+    def _write_dead_letter(self, channel, notifications, error):
+        failed_at = datetime.now().isoformat()
+        with open(self.dead_letter_file, "a", encoding="utf-8") as f:
+            for notification in notifications:
+                record = {"channel": channel, "error": error, "failed_at": failed_at, "notification": notification}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    
+    async def _drain(self):
+        self._flushing.set()
+        try:
+            for queue in self._queues.values():
+                await queue.join()
+        finally:
+            self._flushing.clear()
+    
+    async def _stop(self):
+        tasks = self._workers + list(self._sending)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
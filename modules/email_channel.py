@@ -0,0 +1,155 @@
+"""
+Email notification channel.
+Sends notification batches over a single authenticated SMTP connection,
+grouping recipients of identical messages into one transaction.
+"""
+
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+
+from modules.dispatcher import Channel
+
+# Email configuration
+BATCH_SIZE = 500  # Notifications sent per connection checkout
+BATCH_INTERVAL_MS = 1000
+MAX_RECIPIENTS = 50  # Envelope recipients per message
+IDLE_TIMEOUT = 60  # Seconds an idle connection is kept before being checked with NOOP
+SMTP_TIMEOUT = 30
+SUBJECT_PREFIX = "[GitHub Innovation Promoter]"
+
+class EmailChannel(Channel):
+    """
+    Delivers notifications by email over a reused SMTP connection.
+    
+    A batch is sent over one connection (STARTTLS and login happen once per
+    connection, not per message), and the connection stays open for the
+    next batch. Notifications with identical content are merged into one
+    message whose envelope lists up to `max_recipients` recipients, so an
+    alert going to thousands of subscribers costs a few transactions rather
+    than one session per subscriber.
+    
+    Recipients come from each notification's "recipients" list, falling
+    back to the channel's default recipients.
+    """
+    
+    def __init__(self, host, port=587, sender="", recipients=(), username=None, password=None,
+                 use_tls=True, use_ssl=False, name="email", batch_size=BATCH_SIZE,
+                 batch_interval_ms=BATCH_INTERVAL_MS, max_recipients=MAX_RECIPIENTS, timeout=SMTP_TIMEOUT):
+        """
+        Args:
+            host: SMTP server
+            port: SMTP port
+            sender: From address
+            recipients: Default recipient addresses
+            username: Optional login user
+            password: Optional login password
+            use_tls: Upgrade the connection with STARTTLS when offered
+            use_ssl: Connect with implicit TLS (SMTP_SSL) instead
+            name: Channel name used by the dispatcher
+            batch_size: Notifications per batch
+            batch_interval_ms: Longest wait for a batch to fill
+            max_recipients: Envelope recipients per message
+            timeout: Socket timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.name = name
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval_ms / 1000
+        self.max_recipients = max_recipients
+        self.timeout = timeout
+        self.stats = {"connections": 0, "messages": 0, "recipients": 0}
+        
+        self._connection = None
+        self._last_used = 0
+        self._lock = threading.Lock()
+    
+    def send_batch(self, notifications):
+        """Send a batch of notifications; raises on failure so the batch is retried."""
+        groups = {}
+        for notification in notifications:
+            recipients = notification.get("recipients") or self.recipients
+            key = (self._subject(notification), self._body(notification))
+            groups.setdefault(key, {}).update(dict.fromkeys(recipients))
+        
+        with self._lock:
+            connection = self._connect()
+            try:
+                for (subject, body), recipients in groups.items():
+                    recipients = list(recipients)
+                    for start in range(0, len(recipients), self.max_recipients):
+                        chunk = recipients[start:start + self.max_recipients]
+                        connection.send_message(self._message(subject, body), self.sender, chunk)
+                        self.stats["messages"] += 1
+                        self.stats["recipients"] += len(chunk)
+            except (smtplib.SMTPException, OSError):
+                self._disconnect()
+                raise
+            self._last_used = time.monotonic()
+    
+    def close(self):
+        with self._lock:
+            self._disconnect()
+    
+    def _connect(self):
+        """Return the open connection, reconnecting when it was dropped."""
+        if self._connection is not None and time.monotonic() - self._last_used > IDLE_TIMEOUT:
+            try:
+                self._connection.noop()
+            except (smtplib.SMTPException, OSError):
+                self._connection = None
+        if self._connection is not None:
+            return self._connection
+        
+        if self.use_ssl:
+            connection = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            connection.ehlo()
+            if self.use_tls and connection.has_extn("starttls"):
+                connection.starttls()
+                connection.ehlo()
+        if self.username:
+            connection.login(self.username, self.password)
+        
+        self.stats["connections"] += 1
+        self._connection = connection
+        return connection
+    
+    def _disconnect(self):
+        if self._connection is None:
+            return
+        try:
+            self._connection.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._connection = None
+    
+    def _message(self, subject, body):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = "undisclosed-recipients:;"
+        message["Subject"] = subject
+        message.set_content(body)
+        return message
+    
+    def _subject(self, notification):
+        # Multi-line messages (digests) use their "subject" or first non-empty line
+        subject = notification.get("subject")
+        if not subject:
+            subject = next((line.strip() for line in notification.get("message", "").splitlines() if line.strip()), "")
+        return f"{SUBJECT_PREFIX} {subject}"[:200]
+    
+    def _body(self, notification):
+        lines = [notification.get("message", "")]
+        if notification.get("url"):
+            lines.append(notification["url"])
+        return "\n\n".join(lines) + "\n"
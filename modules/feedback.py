@@ -3,28 +3,148 @@ Feedback collection module for innovative projects.
 Collects and manages feedback from the community.
 """
 
+import atexit
+import csv
 import json
+import queue
+import threading
+import time
 from datetime import datetime
+from heapq import heapify, heappop, heappush
+from itertools import chain
+
+from modules.feedback_store import open_feedback_store
+
+# Rating configuration
+BAYESIAN_PRIOR = 3.0  # Rating assumed before any reviews (scale midpoint)
+BAYESIAN_WEIGHT = 5  # Reviews the prior counts as
+
+# Feedback service configuration
+BATCH_SIZE = 1000  # Most ratings written per group commit
+REFRESH_INTERVAL = 1.0  # Seconds between checks for other writers' ratings
+
+# Import/export configuration
+FEEDBACK_FIELDS = ("project", "user", "rating", "comment", "timestamp")
+FEEDBACK_FORMATS = ("jsonl", "csv")
 
 class FeedbackCollector:
-    """Collects and manages project feedback."""
+    """
+    Collects and manages project feedback.
+    
+    Each project keeps running aggregates (review count, rating sum and a
+    5-bucket histogram) next to its comments, so a new rating updates them
+    in O(1). Projects are also kept in two rating-ordered heaps, by plain and
+    by Bayesian average, so the top-rated list costs O(k log n) rather than a
+    sort of every project.
+    
+    Collectors in several processes can share one storage: every write
+    first applies what others stored since this collector last read, under
+    the storage's lock, and refresh() does the same for readers.
+    """
     
-    def __init__(self, storage_file="feedback_data.json"):
+    def __init__(self, storage_file="feedback_data.json", store=None):
+        """
+        Args:
+            storage_file: Feedback snapshot (its log is <base>.jsonl), or a
+                .db/.sqlite file for the SQLite backend
+            store: Optional storage backend (see modules.feedback_store)
+        """
         self.storage_file = storage_file
+        self.store = store if store is not None else open_feedback_store(storage_file)
+        self._lock = threading.RLock()
+        self._listeners = []
+        # Replay without the write lock, which is taken only if others wrote meanwhile
         self.feedback = self._load_feedback()
+        self.refresh()
     
     def _load_feedback(self):
-        """Load existing feedback from storage."""
-        try:
-            with open(self.storage_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def _save_feedback(self):
-        """Save feedback to storage."""
-        with open(self.storage_file, 'w') as f:
-            json.dump(self.feedback, f, indent=2)
+        """Load existing feedback: the stored snapshot plus the entries logged after it."""
+        self.feedback, entries = self.store.load()
+        for data in self.feedback.values():
+            _upgrade(data)
+        for entry in entries:
+            self._apply(entry.pop("project"), entry)
+        
+        self._ranking = _RankIndex((name, data["average_rating"]) for name, data in self.feedback.items())
+        self._bayesian_ranking = _RankIndex((name, bayesian_average(data)) for name, data in self.feedback.items())
+        return self.feedback
+    
+    def _save_feedback(self, entries):
+        """
+        Apply and persist new entries (dicts with a "project" key) as one commit.
+        
+        Entries stored meanwhile by other writers are applied first, then the
+        storage is compacted if its log has grown.
+        """
+        with self._lock, self.store.lock():
+            self._catch_up()
+            self.store.append(entries)
+            
+            # One pass over the entries, then one index update per project touched
+            touched = set()
+            for entry in entries:
+                entry = dict(entry)
+                project_name = entry.pop("project")
+                self._apply(project_name, entry)
+                touched.add(project_name)
+                self._notify(project_name, entry)
+            for project_name in touched:
+                data = self.feedback[project_name]
+                self._ranking.update(project_name, data["average_rating"])
+                self._bayesian_ranking.update(project_name, bayesian_average(data))
+            
+            if self.store.should_compact():
+                self.store.compact(self.feedback)
+    
+    def _catch_up(self):
+        """Apply entries other writers stored since the last read (storage lock held)."""
+        entries = self.store.poll()
+        if entries is None:
+            self._load_feedback()  # Storage was compacted by another process
+            self._notify(None, None)
+            return
+        for entry in entries:
+            project_name = entry.pop("project")
+            self._apply_ranked(project_name, entry)
+            self._notify(project_name, entry)
+    
+    def add_listener(self, callback):
+        """
+        Call `callback(project_name, entry)` for every rating applied from now
+        on, by this collector or picked up from other writers, and
+        `callback(None, None)` after the feedback was reloaded wholesale.
+        """
+        self._listeners.append(callback)
+    
+    def _notify(self, project_name, entry):
+        for callback in self._listeners:
+            callback(project_name, entry)
+    
+    def _apply_ranked(self, project_name, feedback_entry):
+        """Apply an entry and move the project in the rating indexes."""
+        self._apply(project_name, feedback_entry)
+        data = self.feedback[project_name]
+        self._ranking.update(project_name, data["average_rating"])
+        self._bayesian_ranking.update(project_name, bayesian_average(data))
+    
+    def _apply(self, project_name, feedback_entry):
+        """Add an entry to the in-memory feedback and its aggregates."""
+        data = self.feedback.get(project_name)
+        if data is None:
+            data = self.feedback[project_name] = {
+                "count": 0,
+                "sum": 0,
+                "histogram": [0, 0, 0, 0, 0],
+                "average_rating": 0,
+                "comments": []
+            }
+        
+        rating = feedback_entry["rating"]
+        data["count"] += 1
+        data["sum"] += rating
+        data["histogram"][rating - 1] += 1
+        data["average_rating"] = data["sum"] / data["count"]
+        data["comments"].append(feedback_entry)
     
     def add_feedback(self, project_name, rating, comment, user="anonymous"):
         """
@@ -39,41 +159,122 @@ class FeedbackCollector:
         Returns:
             True if successful
         """
-        if project_name not in self.feedback:
-            self.feedback[project_name] = {
-                "ratings": [],
-                "comments": [],
-                "average_rating": 0
-            }
+        self._save_feedback([_make_entry(project_name, rating, comment, user)])
+        return True
+    
+    def import_feedback(self, records, format=None):
+        """
+        Bulk-load ratings as a single commit.
         
-        feedback_entry = {
-            "user": user,
-            "rating": min(max(int(rating), 1), 5),  # Clamp between 1-5
-            "comment": comment,
-            "timestamp": datetime.now().isoformat()
-        }
+        Ratings are rounded and clamped to 1-5; records without a project or
+        a numeric rating are skipped, and a missing or non-ISO timestamp is
+        replaced by the import time.
+        
+        Args:
+            records: Iterable of dicts, or a text stream of JSONL or CSV
+                (with a header row) records with project, rating and
+                optional user, comment and timestamp fields
+            format: "jsonl" or "csv" for streams (default: guessed from the
+                first line)
+        
+        Returns:
+            {"imported": count, "skipped": count}
+        """
+        entries = []
+        skipped = 0
+        now = datetime.now().isoformat()  # For records without a timestamp
+        for record in _read_records(records, format):
+            entry = _validate_record(record, now)
+            if entry is None:
+                skipped += 1
+            else:
+                entries.append(entry)
+        
+        if entries:
+            self._save_feedback(entries)
+        return {"imported": len(entries), "skipped": skipped}
+    
+    def export_feedback(self, stream, format="jsonl"):
+        """
+        Write every stored rating to a text stream, one record at a time.
+        
+        Records are streamed from the storage (snapshot and log, or the
+        SQLite rows) as of the call, without taking the collector's or the
+        storage's lock, so writers are not blocked while the export runs.
         
-        self.feedback[project_name]["ratings"].append(feedback_entry["rating"])
-        self.feedback[project_name]["comments"].append(feedback_entry)
+        Args:
+            stream: Writable text stream (open CSV files with newline="")
+            format: "jsonl" or "csv"
+        
+        Returns:
+            Number of records written
+        """
+        if format not in FEEDBACK_FORMATS:
+            raise ValueError(f"Unknown feedback format: {format}")
+        entries = self.store.export()
         
-        # Update average
-        ratings = self.feedback[project_name]["ratings"]
-        self.feedback[project_name]["average_rating"] = sum(ratings) / len(ratings)
+        if format == "csv":
+            writer = csv.writer(stream)
+            writer.writerow(FEEDBACK_FIELDS)
+        count = 0
+        for entry in entries:
+            if format == "csv":
+                writer.writerow([entry["project"], entry["user"], entry["rating"], entry["comment"], entry["timestamp"]])
+            else:
+                stream.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            count += 1
+        return count
+    
+    def refresh(self):
+        """
+        Pick up ratings stored by other processes.
         
-        self._save_feedback()
+        Returns:
+            True if anything changed; a quick file check when nothing did
+        """
+        if not self.store.changed():
+            return False
+        with self._lock, self.store.lock():
+            self._catch_up()
         return True
     
+    def compact(self):
+        """Fold the storage log into a fresh snapshot."""
+        with self._lock, self.store.lock():
+            self._catch_up()
+            self.store.compact(self.feedback)
+    
+    def close(self):
+        """Close the storage backend."""
+        self.store.close()
+    
     def get_feedback(self, project_name):
         """Get all feedback for a project."""
         return self.feedback.get(project_name, {})
     
-    def get_top_rated_projects(self, limit=10):
-        """Get top-rated projects."""
-        projects = [(name, data["average_rating"]) 
-                   for name, data in self.feedback.items() 
-                   if data.get("average_rating", 0) > 0]
-        projects.sort(key=lambda x: x[1], reverse=True)
-        return projects[:limit]
+    def ratings(self):
+        """
+        Snapshot of every applied rating.
+        
+        Returns:
+            List of (project_name, entry) pairs, as of the call
+        """
+        with self._lock:
+            return [(project_name, entry) for project_name, data in self.feedback.items() for entry in data["comments"]]
+    
+    def get_top_rated_projects(self, limit=10, bayesian=False):
+        """
+        Get top-rated projects.
+        
+        Args:
+            limit: Number of projects
+            bayesian: Rank by Bayesian average, so a few 5-star reviews do not
+                outrank many good ones
+        
+        Returns:
+            List of (project name, rating) tuples, best first
+        """
+        return (self._bayesian_ranking if bayesian else self._ranking).top(limit)
     
     def get_project_stats(self, project_name):
         """Get statistics for a project."""
@@ -83,20 +284,233 @@ class FeedbackCollector:
         data = self.feedback[project_name]
         return {
             "average_rating": data["average_rating"],
-            "total_reviews": len(data["ratings"]),
-            "rating_distribution": self._get_rating_distribution(data["ratings"])
+            "bayesian_rating": bayesian_average(data),
+            "total_reviews": data["count"],
+            "rating_distribution": dict(enumerate(data["histogram"], 1))
         }
+
+class FeedbackService:
+    """
+    Shared, thread-safe front end for submitting and reading feedback.
+    
+    Submissions are queued and a background writer group-commits whatever
+    has accumulated (up to `batch_size`) with one storage lock and one
+    write, so many concurrent submitters cost a few commits rather than one
+    each. Reads are served from the collector's in-memory aggregates,
+    refreshed from other processes' writes at most every
+    `refresh_interval` seconds.
+    """
+    
+    def __init__(self, storage_file="feedback_data.json", collector=None, batch_size=BATCH_SIZE,
+                 refresh_interval=REFRESH_INTERVAL):
+        """
+        Args:
+            storage_file: Feedback storage (see FeedbackCollector)
+            collector: Optional FeedbackCollector to serve
+            batch_size: Most ratings per group commit
+            refresh_interval: Seconds between checks for other writers' ratings
+        """
+        self.collector = collector if collector is not None else FeedbackCollector(storage_file)
+        self.batch_size = batch_size
+        self.refresh_interval = refresh_interval
+        self.stats = {"submitted": 0, "commits": 0}
+        self._queue = queue.Queue()
+        self._last_refresh = time.monotonic()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, project_name, rating, comment="", user="anonymous"):
+        """Queue a rating for the next group commit; returns True if queued."""
+        if self._closed:
+            return False
+        self._queue.put(_make_entry(project_name, rating, comment, user))
+        self.stats["submitted"] += 1
+        return True
+    
+    def flush(self):
+        """Wait until every queued rating is committed."""
+        self._queue.join()
+    
+    def close(self):
+        """Commit queued ratings, stop the writer and close the storage."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self.collector.close()
+    
+    def get_feedback(self, project_name):
+        self._refresh()
+        with self.collector._lock:
+            return self.collector.get_feedback(project_name)
     
-    def _get_rating_distribution(self, ratings):
-        """Get distribution of ratings."""
-        distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        for rating in ratings:
-            distribution[rating] = distribution.get(rating, 0) + 1
-        return distribution
+    def get_project_stats(self, project_name):
+        self._refresh()
+        with self.collector._lock:
+            return self.collector.get_project_stats(project_name)
+    
+    def get_top_rated_projects(self, limit=10, bayesian=False):
+        self._refresh()
+        with self.collector._lock:
+            return self.collector.get_top_rated_projects(limit, bayesian)
+    
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._last_refresh >= self.refresh_interval:
+            self._last_refresh = now
+            self.collector.refresh()
+    
+    def _run(self):
+        """Writer loop: commit whatever is queued as one batch."""
+        stop = False
+        while not stop:
+            batch = []
+            entry = self._queue.get()
+            while entry is not None:
+                batch.append(entry)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            stop = entry is None
+            
+            if batch:
+                try:
+                    self.collector._save_feedback(batch)
+                    self.stats["commits"] += 1
+                except Exception as e:  # Keep the writer alive; the batch is reported lost
+                    print(f"❌ Error saving feedback: {e}")
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+
+def bayesian_average(data, prior=BAYESIAN_PRIOR, weight=BAYESIAN_WEIGHT):
+    """
+    Average rating shrunk towards a prior by `weight` virtual reviews.
+    
+    Args:
+        data: Project feedback aggregates (count and sum)
+        prior: Rating assumed before any reviews
+        weight: Number of reviews the prior counts as
+    
+    Returns:
+        Bayesian average rating
+    """
+    return (prior * weight + data["sum"]) / (weight + data["count"])
+
+class _RankIndex:
+    """
+    Projects ordered by score for top-k queries.
+    
+    Updates push a new heap entry in O(log n); outdated entries are dropped
+    when they surface at the top, and the heap is rebuilt once they make up
+    half of it.
+    """
+    
+    def __init__(self, scores=()):
+        self.scores = dict(scores)  # project -> current score
+        self._rebuild()
+    
+    def update(self, name, score):
+        self.scores[name] = score
+        heappush(self._heap, (-score, name))
+        if len(self._heap) > 2 * len(self.scores) + 1000:
+            self._rebuild()
+    
+    def top(self, limit):
+        """Highest-scoring (name, score) pairs, best first (ties by name)."""
+        heap, scores = self._heap, self.scores
+        found = []
+        while heap and len(found) < limit:
+            entry = heappop(heap)
+            # Skip outdated scores and duplicates of an entry already taken
+            if scores.get(entry[1]) == -entry[0] and (not found or found[-1] != entry):
+                found.append(entry)
+        for entry in found:
+            heappush(heap, entry)
+        return [(name, -score) for score, name in found]
+    
+    def _rebuild(self):
+        self._heap = [(-score, name) for name, score in self.scores.items()]
+        heapify(self._heap)
+
+def _make_entry(project_name, rating, comment, user, timestamp=None):
+    return {
+        "project": project_name,
+        "user": user,
+        "rating": min(max(int(rating), 1), 5),  # Clamp between 1-5
+        "comment": comment,
+        "timestamp": timestamp or datetime.now().isoformat()
+    }
+
+def _read_records(records, format):
+    """Yield record dicts from an iterable of dicts or a JSONL/CSV text stream."""
+    if not hasattr(records, "read"):
+        yield from records
+        return
+    
+    first = records.readline()
+    if format is None:
+        format = "jsonl" if first.lstrip().startswith("{") else "csv"
+    if format not in FEEDBACK_FORMATS:
+        raise ValueError(f"Unknown feedback format: {format}")
+    
+    lines = chain([first], records)
+    if format == "csv":
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+
+def _validate_record(record, now):
+    """Feedback entry for an imported record, or None if it is unusable."""
+    try:
+        project_name = str(record.get("project") or "").strip()
+        rating = round(float(record["rating"]))
+    except (AttributeError, KeyError, TypeError, ValueError, OverflowError):
+        return None
+    if not project_name:
+        return None
+    return _make_entry(project_name, rating, record.get("comment") or "", record.get("user") or "anonymous",
+                       _iso_timestamp(record.get("timestamp"), now))
+
+def _iso_timestamp(value, default):
+    """An ISO timestamp as stored, or `default` if it is missing or not ISO 8601."""
+    try:
+        datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return default
+    return value
+
+def _upgrade(data):
+    """Convert project feedback stored with a ratings list to running aggregates."""
+    ratings = data.pop("ratings", None)
+    if ratings is None:
+        return
+    data["count"] = len(ratings)
+    data["sum"] = sum(ratings)
+    data["histogram"] = [ratings.count(rating) for rating in range(1, 6)]
+
+_services = {}  # storage file -> FeedbackService shared within the process
+
+def get_feedback_service(storage_file="feedback_data.json"):
+    """Process-wide FeedbackService for a storage file, created on first use."""
+    service = _services.get(storage_file)
+    if service is None or service._closed:
+        service = _services[storage_file] = FeedbackService(storage_file)
+    return service
 
-def collect_feedback_interactive(project):
-    """Interactive feedback collection for a project."""
-    collector = FeedbackCollector()
+def collect_feedback_interactive(project, service=None):
+    """Interactive feedback collection for a project (through the shared FeedbackService)."""
+    service = service or get_feedback_service()
     
     print(f"\n📝 Feedback for: {project['full_name']}")
     print("Rate this project (1-5): ", end="")
@@ -105,7 +519,7 @@ def collect_feedback_interactive(project):
         print("Your comment: ", end="")
         comment = input()
         
-        collector.add_feedback(project['full_name'], rating, comment)
+        service.submit(project['full_name'], rating, comment)
         print("✅ Thank you for your feedback!")
         
     except (ValueError, KeyboardInterrupt):
@@ -0,0 +1,443 @@
+"""
+Storage backends for project feedback.
+An append-only JSONL log with a periodically compacted snapshot, or a SQLite
+database in WAL mode; either one is written incrementally per rating instead
+of rewriting all feedback.
+"""
+
+import json
+import os
+import sqlite3
+import uuid
+from contextlib import contextmanager
+
+from modules._fileutil import ends_with_newline
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+# Feedback storage configuration
+COMPACT_RATIO = 1.0  # Compact once the log tail outgrows this fraction of the snapshot
+MIN_COMPACT_BYTES = 1024 * 1024  # Tail size below which the log is never compacted
+SNAPSHOT_VERSION = 2  # 1: one JSON document; 2: a header line, then one line per project
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+SQLITE_TIMEOUT = 30  # Seconds to wait for another writer's transaction
+WRITE_CHUNK = 10000  # Entries encoded per write when appending large batches
+
+_encode = json.JSONEncoder(ensure_ascii=False).encode  # Built once rather than per dumps() call
+
+class JsonlFeedbackStore:
+    """
+    Feedback log plus compacted snapshot.
+    
+    Every rating is appended as one JSON line to `<base>.jsonl`. The
+    snapshot (`path`, e.g. feedback_data.json) holds the collector's state as
+    of a position in the log, one JSON line per project after a header line,
+    so loading reads the snapshot and replays only the tail after it, and an
+    export streams it project by project. Once the tail outgrows the
+    snapshot, the state is written to a new snapshot and the log restarts
+    empty; the log's first line carries an ID the snapshot refers to, so a
+    crash at any point of compaction neither loses nor double-counts ratings. A snapshot in the
+    old plain-dict feedback_data.json format, or a version 1 single-document
+    snapshot, is read as a whole until the next compaction rewrites it.
+    
+    Several processes can share the files: writers hold an exclusive lock on
+    `<base>.lock` and first read what others appended since their own last
+    position (`poll`), and a log restarted by another process's compaction
+    is detected by its ID so the reader reloads. Loading and exporting need
+    no lock, and the log and lock files are only created by the first
+    write.
+    """
+    
+    def __init__(self, path="feedback_data.json", compact_ratio=COMPACT_RATIO):
+        """
+        Args:
+            path: Snapshot file; the log is stored next to it as <base>.jsonl
+            compact_ratio: Tail-to-snapshot size ratio that triggers compaction
+        """
+        self.path = path
+        base = os.path.splitext(path)[0]
+        self.log_path = base + ".jsonl"
+        self.lock_path = base + ".lock"
+        self.compact_ratio = compact_ratio
+        self._log = None
+        self._log_id = None
+        self._offset = 0  # Log position covered by the snapshot
+        self._position = 0  # Log position read or written so far
+        self._seen = None  # (inode, size) of the log at _position
+        self._snapshot_bytes = 0
+        self._lock_file = None
+    
+    @contextmanager
+    def lock(self):
+        """Hold the cross-process write lock (a no-op where fcntl is unavailable)."""
+        if self._lock_file is None:
+            self._lock_file = open(self.lock_path, "a")
+        if fcntl is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+    
+    def load(self):
+        """
+        Read the stored feedback (no lock needed).
+        
+        Returns:
+            (snapshot state dict, iterator of log entries recorded after it)
+        """
+        self._close_log()
+        projects, log_id, offset, log, continues, self._snapshot_bytes = self._open_state()
+        state = dict(projects)
+        self._log_id = log_id
+        self._offset = self._position = offset
+        self._seen = None
+        if log is not None and not continues:
+            # Already covered by the snapshot; replaced by the next write, or polled once another process did
+            with log:
+                self._seen = _file_key(log)
+            log = None
+        return state, self._read_tail(log) if log is not None else iter(())
+    
+    def changed(self):
+        """Cheap check whether the log moved past what this store has read."""
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return self._seen is not None
+        return (stat.st_ino, stat.st_size) != self._seen
+    
+    def poll(self):
+        """
+        Entries appended by other writers since this store's position.
+        
+        Returns:
+            List of entries, or None if the log was restarted by another
+            process's compaction and the caller must load() again
+        """
+        if not self.changed():
+            return []
+        if _read_log_id(self.log_path) != self._log_id:
+            self._close_log()
+            return None
+        return list(self._read_tail(open(self.log_path, "rb")))
+    
+    def append(self, entries):
+        """Append entries (dicts with a "project" key) to the log (call with the lock held, after poll)."""
+        if self._log is None:
+            self._open_log()
+        entries = list(entries)
+        for start in range(0, len(entries), WRITE_CHUNK):
+            chunk = entries[start:start + WRITE_CHUNK]
+            self._log.write("".join(_encode(entry) + "\n" for entry in chunk).encode("utf-8"))
+        self._log.flush()
+        self._position = self._log.tell()
+        self._seen = (os.fstat(self._log.fileno()).st_ino, self._position)
+    
+    def export(self):
+        """
+        Every stored entry as of now, read lazily (no lock needed).
+        
+        The snapshot and the log are opened here and read line by line as
+        the iterator is consumed, the log up to its current end: compaction
+        replaces both files instead of rewriting them, so the open handles
+        stay consistent.
+        
+        Returns:
+            Iterator of entries (dicts with a "project" key)
+        """
+        projects, _, offset, log, continues, _ = self._open_state()
+        if log is not None and not continues:
+            log.close()
+            log = None
+        end = os.fstat(log.fileno()).st_size if log is not None else 0
+        return _read_stored_entries(projects, log, offset, end)
+    
+    def should_compact(self):
+        """True once the log tail is large relative to the snapshot."""
+        tail = self._position - self._offset
+        return tail > MIN_COMPACT_BYTES and tail > self.compact_ratio * self._snapshot_bytes
+    
+    def compact(self, state):
+        """Write the current state as the snapshot and restart the log (call with the lock held)."""
+        log_id = uuid.uuid4().hex
+        header = _log_header(log_id)
+        temp_log = f"{self.log_path}.tmp{os.getpid()}"
+        _write_log_header(temp_log, log_id)
+        
+        temp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(_encode({"version": SNAPSHOT_VERSION, "log": log_id, "offset": len(header)}) + "\n")
+            for project_name, data in state.items():
+                f.write(_encode({"project": project_name, "data": data}) + "\n")
+        os.replace(temp_path, self.path)  # From here on the old log is covered by the snapshot
+        
+        self._close_log()
+        os.replace(temp_log, self.log_path)
+        self._log_id = log_id
+        self._offset = self._position = len(header)
+        self._seen = None
+        self._snapshot_bytes = os.path.getsize(self.path)
+    
+    def close(self):
+        self._close_log()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+    
+    def _close_log(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+    
+    def _open_log(self):
+        """Open the log for appending, first (re)starting it if it does not continue the snapshot."""
+        if self._log_id is None or _read_log_id(self.log_path) != self._log_id:
+            # No log yet, or one already folded into the snapshot by an interrupted compaction
+            self._log_id = self._log_id or uuid.uuid4().hex
+            _write_log_header(self.log_path, self._log_id)
+            self._offset = self._position = len(_log_header(self._log_id))
+        self._log = open(self.log_path, "ab")
+        if not ends_with_newline(self.log_path):
+            self._log.write(b"\n")  # Terminate a line torn by a crash
+    
+    def _open_state(self):
+        """
+        Open the snapshot and the log, without the lock.
+        
+        The log is opened before the snapshot is read. Compaction replaces
+        the snapshot first, so a log whose ID differs from the snapshot's is
+        one the snapshot already covers (after an interrupted compaction, or
+        one running meanwhile, which the next poll picks up).
+        
+        Returns:
+            (iterator of the snapshot's (project, data) pairs, log ID, log
+            position the snapshot covers, open log file or None, whether the
+            log continues the snapshot, snapshot size)
+        """
+        log = _open_if_exists(self.log_path)
+        projects, log_id, offset, snapshot_bytes = iter(()), None, 0, 0
+        snapshot_file = _open_if_exists(self.path)
+        if snapshot_file is not None:
+            snapshot_bytes = os.fstat(snapshot_file.fileno()).st_size
+            projects, log_id, offset = _open_snapshot(snapshot_file)
+        if log is None:
+            return projects, log_id, offset, None, False, snapshot_bytes
+        
+        header = log.readline()
+        header_id = _parse_log_id(header)
+        if header_id is not None and log_id in (None, header_id):
+            return projects, header_id, offset if log_id else len(header), log, True, snapshot_bytes
+        return projects, log_id, offset, log, False, snapshot_bytes
+    
+    def _read_tail(self, f):
+        """Yield complete entries of an open log after the current position, advancing it."""
+        with f:
+            f.seek(self._position)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Being written by another process, or torn by a crash
+                self._position += len(line)
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+            self._seen = (os.fstat(f.fileno()).st_ino, self._position)
+
+class SqliteFeedbackStore:
+    """
+    Feedback rows in a SQLite database using write-ahead logging.
+    
+    Writers serialize through `BEGIN IMMEDIATE` transactions and read the
+    rows other connections inserted since their last row ID; WAL mode lets
+    readers proceed while a batch is written.
+    """
+    
+    def __init__(self, path="feedback_data.db"):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=SQLITE_TIMEOUT)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS feedback (id INTEGER PRIMARY KEY, project TEXT NOT NULL, "
+                "user TEXT, rating INTEGER NOT NULL, comment TEXT, timestamp TEXT)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS feedback_project ON feedback (project)")
+        self._last_id = 0
+    
+    @contextmanager
+    def lock(self):
+        """Run the enclosed reads and writes as one write transaction."""
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.rollback()
+            raise
+        self._connection.commit()
+    
+    def load(self):
+        """
+        Read the stored feedback (no lock needed: the rows are read in one statement).
+        
+        Returns:
+            (empty state dict, iterator of all entries in insertion order)
+        """
+        self._last_id = 0
+        return {}, self._read_tail()
+    
+    def changed(self):
+        """Cheap check whether rows were added past this store's last row."""
+        return self._max_id() != self._last_id
+    
+    def poll(self):
+        """Entries inserted by other connections since the last row read."""
+        return list(self._read_tail())
+    
+    def append(self, entries):
+        """Insert entries (dicts with a "project" key); call with the lock held, after poll."""
+        self._connection.executemany(
+            "INSERT INTO feedback (project, user, rating, comment, timestamp) VALUES (?, ?, ?, ?, ?)",
+            ((e["project"], e["user"], e["rating"], e["comment"], e["timestamp"]) for e in entries)
+        )
+        self._last_id = self._max_id()
+    
+    def export(self):
+        """
+        Every stored row, read lazily through a separate connection.
+        
+        The rows are selected in one statement, which reads a consistent
+        WAL snapshot without blocking writers.
+        
+        Returns:
+            Iterator of entries (dicts with a "project" key)
+        """
+        return self._read_rows()
+    
+    def should_compact(self):
+        return False
+    
+    def compact(self, state):
+        """Nothing to fold: rows are the state (checkpoint the WAL when closing)."""
+    
+    def close(self):
+        self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._connection.close()
+    
+    def _max_id(self):
+        return self._connection.execute("SELECT COALESCE(MAX(id), 0) FROM feedback").fetchone()[0]
+    
+    def _read_rows(self):
+        connection = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT)
+        try:
+            cursor = connection.execute("SELECT project, user, rating, comment, timestamp FROM feedback ORDER BY id")
+            for row in cursor:
+                yield {"project": row[0], "user": row[1], "rating": row[2], "comment": row[3], "timestamp": row[4]}
+        finally:
+            connection.close()
+    
+    def _read_tail(self):
+        cursor = self._connection.execute(
+            "SELECT id, project, user, rating, comment, timestamp FROM feedback WHERE id > ? ORDER BY id",
+            (self._last_id,)
+        )
+        for row in cursor:
+            self._last_id = row[0]
+            yield {"project": row[1], "user": row[2], "rating": row[3], "comment": row[4], "timestamp": row[5]}
+
+def open_feedback_store(path):
+    """Storage backend for a path: SQLite for .db/.sqlite files, otherwise the JSONL log."""
+    if path.endswith(SQLITE_SUFFIXES):
+        return SqliteFeedbackStore(path)
+    return JsonlFeedbackStore(path)
+
+def _open_if_exists(path):
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+def _open_snapshot(f):
+    """
+    Read the header of an open snapshot file.
+    
+    Returns:
+        (iterator of (project, data) pairs, closing the file once consumed,
+        log ID, log position the snapshot covers)
+    """
+    header = _parse_json(f.readline())
+    if isinstance(header, dict) and header.get("version") == SNAPSHOT_VERSION:
+        return _read_snapshot_projects(f), header["log"], header["offset"]
+    
+    # Earlier formats are one JSON document, read whole
+    with f:
+        if not isinstance(header, dict):
+            f.seek(0)
+            header = _parse_json(f.read())
+    snapshot = header if isinstance(header, dict) else {}
+    if "version" in snapshot:
+        return iter(snapshot["projects"].items()), snapshot["log"], snapshot["offset"]
+    return iter(snapshot.items()), None, 0  # Legacy plain-dict format
+
+def _read_snapshot_projects(f):
+    with f:
+        for line in f:
+            record = _parse_json(line)
+            if isinstance(record, dict) and "project" in record:
+                yield record["project"], record["data"]
+
+def _parse_json(text):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return None
+
+def _read_stored_entries(projects, log_file, offset, end):
+    """Yield the entries of snapshot (project, data) pairs, then those of its log between byte `offset` and `end`."""
+    for project_name, data in projects:
+        for entry in data.get("comments", ()):
+            yield {"project": project_name, **entry}
+    
+    if log_file is None:
+        return
+    with log_file:
+        log_file.seek(offset)
+        position = offset
+        for line in log_file:
+            position += len(line)
+            if position > end or not line.endswith(b"\n"):
+                break  # Appended after the export started, or torn by a crash
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+def _log_header(log_id):
+    return (json.dumps({"log": log_id}) + "\n").encode("utf-8")
+
+def _write_log_header(path, log_id):
+    with open(path, "wb") as f:
+        f.write(_log_header(log_id))
+
+def _read_log_id(path):
+    """ID from a log's header line, or None if there is no valid log."""
+    try:
+        with open(path, "rb") as f:
+            return _parse_log_id(f.readline())
+    except FileNotFoundError:
+        return None
+
+def _parse_log_id(header):
+    try:
+        return json.loads(header).get("log")
+    except (json.JSONDecodeError, AttributeError):
+        return None
+
+def _file_key(f):
+    stat = os.fstat(f.fileno())
+    return (stat.st_ino, stat.st_size)
@@ -0,0 +1,145 @@
+"""
+Pooled, caching GitHub REST client.
+Reuses HTTP connections across requests and threads, answers repeated
+requests from a TTL cache and revalidates stale entries with ETags, so
+conditional hits do not count against the rate limit.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Client configuration
+GITHUB_API_URL = "https://api.github.com"
+REQUEST_TIMEOUT = 10  # Seconds
+MAX_WORKERS = 8  # Concurrent requests (and pooled connections)
+CACHE_TTL = 24 * 3600  # Seconds before a cached response is revalidated
+PER_PAGE = 100
+MAX_PAGES = 5  # Pages fetched per paginated listing
+
+class GitHubClient:
+    """
+    GitHub API client with a shared connection pool and a response cache.
+    
+    Responses are cached per URL with their ETag. Fresh entries are served
+    without a request; stale ones are revalidated with If-None-Match and a
+    304 reply reuses the cached body. The cache can be persisted to a JSON
+    file so later runs only pay for what changed.
+    """
+    
+    def __init__(self, token=None, base_url=GITHUB_API_URL, cache_path=None, cache_ttl=CACHE_TTL,
+                 max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT):
+        """
+        Args:
+            token: Optional GitHub token (raises the rate limit)
+            base_url: API root, e.g. a local stub for tests
+            cache_path: Optional JSON file the cache is loaded from and saved to
+            cache_ttl: Seconds a cached response is served without revalidation
+            max_workers: Concurrent requests for batch fetches
+            timeout: Per-request timeout in seconds
+        """
+        self.base_url = base_url.rstrip("/")
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.stats = {"requests": 0, "cache_hits": 0, "not_modified": 0}
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept"] = "application/vnd.github+json"
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        
+        self._cache = self._load_cache()
+        self._lock = threading.Lock()
+    
+    def get(self, path, params=None):
+        """
+        GET an API path (or absolute URL), served from the cache when possible.
+        
+        Returns:
+            Tuple of (decoded JSON body, URL of the next page or None)
+        """
+        url = path if path.startswith("http") else f"{self.base_url}/{path.lstrip('/')}"
+        if params:
+            url = requests.Request("GET", url, params=params).prepare().url
+        
+        with self._lock:
+            entry = self._cache.get(url)
+            fresh = entry is not None and time.time() - entry["fetched"] < self.cache_ttl
+            self.stats["cache_hits" if fresh else "requests"] += 1
+        if fresh:
+            return entry["data"], entry["next"]
+        
+        headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        
+        if response.status_code == 304:
+            entry = dict(entry, fetched=time.time())
+        elif response.status_code in (403, 429) and entry:
+            # Rate limited: a stale answer beats none
+            return entry["data"], entry["next"]
+        else:
+            response.raise_for_status()
+            entry = {
+                "etag": response.headers.get("ETag"),
+                "fetched": time.time(),
+                "data": response.json() if response.status_code != 204 and response.content else [],
+                "next": response.links.get("next", {}).get("url")
+            }
+        
+        with self._lock:
+            self._cache[url] = entry
+            if response.status_code == 304:
+                self.stats["not_modified"] += 1
+        return entry["data"], entry["next"]
+    
+    def get_all(self, path, params=None, max_pages=MAX_PAGES):
+        """Follow `next` links of a paginated listing and concatenate the pages."""
+        params = dict(params or {}, per_page=PER_PAGE)
+        items, url = [], path
+        for _ in range(max_pages):
+            data, url = self.get(url, params)
+            items.extend(data)
+            params = None  # The next link already carries the query
+            if not url:
+                break
+        return items
+    
+    def get_contributors(self, full_name, max_pages=MAX_PAGES):
+        """List the contributors of a repository ("owner/name")."""
+        return self.get_all(f"repos/{full_name}/contributors", max_pages=max_pages)
+    
+    def map(self, function, items):
+        """Apply a fetching function to items concurrently over the shared pool."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(function, items))
+    
+    def save_cache(self):
+        """Write the response cache to cache_path, if configured."""
+        if not self.cache_path:
+            return
+        with self._lock:
+            data = json.dumps(self._cache)
+        temp_path = f"{self.cache_path}.tmp{os.getpid()}"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(temp_path, self.cache_path)
+    
+    def _load_cache(self):
+        """Load a persisted cache; a missing or corrupt file starts empty."""
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
@@ -0,0 +1,212 @@
+"""
+Compact graph storage for the project network.
+Stores an undirected weighted graph as CSR (compressed sparse row) arrays
+over integer node IDs, built from a stream of edges.
+"""
+
+import heapq
+from array import array
+from collections import deque
+
+class ProjectGraph:
+    """
+    Undirected weighted graph in CSR form.
+
+    The neighbours of node `u` are indices[indptr[u]:indptr[u + 1]], with the
+    matching edge weights at the same positions in `weights`. Every edge is
+    stored once per endpoint: 8 bytes per direction (int32 neighbour +
+    float32 weight) instead of a dict per edge.
+    """
+
+    def __init__(self, num_nodes=0, indptr=None, indices=None, weights=None):
+        self.num_nodes = num_nodes
+        self.indptr = indptr if indptr is not None else array('q', bytes(8 * (num_nodes + 1)))
+        self.indices = indices if indices is not None else array('i')
+        self.weights = weights if weights is not None else array('f')
+        self.metrics = {}
+
+    @property
+    def num_edges(self):
+        """Number of undirected edges."""
+        return len(self.indices) // 2
+
+    def degree(self, node):
+        """Number of neighbours of a node."""
+        if node >= self.num_nodes:
+            return 0
+        return self.indptr[node + 1] - self.indptr[node]
+
+    def neighbors(self, node):
+        """
+        Get the neighbours of a node.
+
+        Returns:
+            Tuple of (neighbour IDs, weights) array slices; weights are
+            float32, round them to 2 decimals to get the similarity back
+        """
+        if node >= self.num_nodes:
+            return array('i'), array('f')
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def edges(self):
+        """Yield each undirected edge once as (u, v, weight) with u < v."""
+        indptr = self.indptr
+        indices = self.indices
+        weights = self.weights
+        for u in range(self.num_nodes):
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if u < v:
+                    yield u, v, round(weights[k], 2)
+
+    def memory_usage(self):
+        """Bytes used by the CSR arrays."""
+        return sum(a.itemsize * len(a) for a in (self.indptr, self.indices, self.weights))
+
+def traverse(graph, source, max_depth=1, fanout=None, min_weight=0, max_nodes=None):
+    """
+    Breadth-first traversal with per-hop limits, streamed as nodes are expanded.
+    
+    Each expanded node keeps its edges with a similarity of at least
+    `min_weight`; with `fanout`, only its `fanout` heaviest edges to nodes
+    not discovered yet are followed, while edges to nodes already discovered
+    are always kept. At most `max_nodes` distinct nodes (the source included)
+    are discovered, so a query on a dense hub stays bounded.
+    
+    Args:
+        graph: ProjectGraph
+        source: Start node ID
+        max_depth: Number of hops to expand
+        fanout: Maximum edges followed per node (None = all)
+        min_weight: Minimum edge similarity
+        max_nodes: Total node budget (None = unlimited)
+    
+    Yields:
+        (node, depth, edges) for each expanded node, where edges is a list
+        of (neighbor, similarity) tuples, heaviest first
+    """
+    if source >= graph.num_nodes:
+        return
+    
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    discovered = {source}
+    queue = deque([(source, 0)])
+    
+    while queue:
+        node, depth = queue.popleft()
+        if depth >= max_depth:
+            continue
+        
+        edges = [
+            (indices[k], round(weights[k], 2))
+            for k in range(indptr[node], indptr[node + 1])
+            if round(weights[k], 2) >= min_weight
+        ]
+        if fanout is not None:
+            followed = set(heapq.nlargest(
+                fanout, (edge for edge in edges if edge[0] not in discovered), key=lambda edge: edge[1]
+            ))
+            edges = [edge for edge in edges if edge[0] in discovered or edge in followed]
+        edges.sort(key=lambda edge: edge[1], reverse=True)
+        
+        kept = []
+        for neighbor, weight in edges:
+            if neighbor not in discovered:
+                if max_nodes is not None and len(discovered) >= max_nodes:
+                    continue
+                discovered.add(neighbor)
+                queue.append((neighbor, depth + 1))
+            kept.append((neighbor, weight))
+        
+        yield node, depth, kept
+
+class GraphBuilder:
+    """
+    Collects an edge stream and compiles it into a ProjectGraph.
+
+    Pending edges cost 12 bytes each until `build` merges them into CSR.
+    """
+
+    def __init__(self):
+        self.sources = array('i')
+        self.targets = array('i')
+        self.weights = array('f')
+
+    def __len__(self):
+        return len(self.sources)
+
+    def add_edge(self, u, v, weight):
+        """Append an undirected edge; callers are responsible for not repeating pairs."""
+        self.sources.append(u)
+        self.targets.append(v)
+        self.weights.append(weight)
+
+    def build(self, num_nodes, base=None):
+        """
+        Compile pending edges, merged with an existing graph, into CSR.
+
+        Args:
+            num_nodes: Total number of nodes in the new graph
+            base: Optional ProjectGraph whose edges are kept
+
+        Returns:
+            New ProjectGraph; the builder is emptied
+        """
+        base = base or ProjectGraph()
+        sources, targets, weights = self.sources, self.targets, self.weights
+        base_indices = _as_array('i', base.indices)
+        base_weights = _as_array('f', base.weights)
+
+        # Count degrees: existing rows plus both endpoints of each new edge
+        counts = array('q', bytes(8 * num_nodes))
+        for u in range(base.num_nodes):
+            counts[u] = base.indptr[u + 1] - base.indptr[u]
+        for k in range(len(sources)):
+            counts[sources[k]] += 1
+            counts[targets[k]] += 1
+
+        indptr = array('q', bytes(8 * (num_nodes + 1)))
+        total = 0
+        for u in range(num_nodes):
+            indptr[u] = total
+            total += counts[u]
+        indptr[num_nodes] = total
+
+        indices = array('i', bytes(4 * total))
+        new_weights = array('f', bytes(4 * total))
+
+        # Copy existing rows, then fill new entries after them
+        cursor = array('q', indptr[:num_nodes])
+        for u in range(base.num_nodes):
+            start, end = base.indptr[u], base.indptr[u + 1]
+            if start == end:
+                continue
+            position = cursor[u]
+            indices[position:position + end - start] = base_indices[start:end]
+            new_weights[position:position + end - start] = base_weights[start:end]
+            cursor[u] = position + end - start
+
+        for k in range(len(sources)):
+            u = sources[k]
+            v = targets[k]
+            weight = weights[k]
+            position = cursor[u]
+            indices[position] = v
+            new_weights[position] = weight
+            cursor[u] = position + 1
+            position = cursor[v]
+            indices[position] = u
+            new_weights[position] = weight
+            cursor[v] = position + 1
+
+        self.__init__()
+        return ProjectGraph(num_nodes, indptr, indices, new_weights)
+
+def _as_array(typecode, values):
+    """Copy a memoryview (e.g. from a memory-mapped snapshot) into an array."""
+    if isinstance(values, array):
+        return values
+    copy = array(typecode)
+    copy.frombytes(values.cast('B'))
+    return copy
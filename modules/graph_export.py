@@ -0,0 +1,155 @@
+"""
+Streaming export of the project network.
+Writes the graph as an edge list, GraphML or GEXF straight from the CSR
+arrays, one line at a time, to a file (optionally gzipped) or stdout.
+"""
+
+import gzip
+import io
+import sys
+from contextlib import contextmanager
+from xml.sax.saxutils import escape, quoteattr
+
+from modules import communities
+
+# Export configuration
+FORMATS = ("edgelist", "graphml", "gexf")
+BUFFER_SIZE = 1024 * 1024  # Bytes buffered before each write to the file
+GZIP_LEVEL = 6
+
+# Node attributes: (name, GraphML/GEXF type)
+NODE_ATTRIBUTES = [
+    ("name", "string"),
+    ("language", "string"),
+    ("stars", "long"),
+    ("community", "int"),
+    ("pagerank", "double"),
+]
+
+def export_graph(analyzer, destination="-", format="edgelist", compress=None):
+    """
+    Export the project network for external tools.
+    
+    Edges are read from the graph one at a time and written through a
+    fixed-size buffer, so memory use does not grow with the network.
+    Community labels and PageRank are included when they have already
+    been computed.
+    
+    Args:
+        analyzer: NetworkAnalyzer
+        destination: File path, writable text stream, or "-" for stdout
+        format: "edgelist", "graphml" or "gexf"
+        compress: Gzip the output (None = when the path ends in ".gz")
+    
+    Returns:
+        Number of edges written
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format: {format}")
+    
+    writer = {"edgelist": write_edge_list, "graphml": write_graphml, "gexf": write_gexf}[format]
+    with _open_output(destination, compress) as out:
+        return writer(analyzer, out)
+
+def write_edge_list(analyzer, out):
+    """Write one tab-separated `source target similarity` line per edge."""
+    names = [project['full_name'] for project in analyzer.projects]
+    write = out.write
+    count = 0
+    write("# source\ttarget\tsimilarity\n")
+    for u, v, weight in analyzer.graph.edges():
+        write(f"{names[u]}\t{names[v]}\t{weight}\n")
+        count += 1
+    return count
+
+def write_graphml(analyzer, out):
+    """Write the network as a GraphML document."""
+    write = out.write
+    write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+    for name, kind in NODE_ATTRIBUTES:
+        write(f'  <key id="{name}" for="node" attr.name="{name}" attr.type="{kind}"/>\n')
+    write('  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n')
+    write('  <graph id="projects" edgedefault="undirected">\n')
+    
+    for node, attributes in _iter_nodes(analyzer):
+        data = "".join(f'<data key="{name}">{escape(str(value))}</data>' for name, value in attributes)
+        write(f'    <node id="n{node}">{data}</node>\n')
+    
+    count = 0
+    for u, v, weight in analyzer.graph.edges():
+        write(f'    <edge source="n{u}" target="n{v}"><data key="weight">{weight}</data></edge>\n')
+        count += 1
+    
+    write('  </graph>\n')
+    write('</graphml>\n')
+    return count
+
+def write_gexf(analyzer, out):
+    """Write the network as a GEXF 1.3 document."""
+    write = out.write
+    write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    write('<gexf xmlns="http://gexf.net/1.3" version="1.3">\n')
+    write('  <graph defaultedgetype="undirected">\n')
+    write('    <attributes class="node">\n')
+    for name, kind in NODE_ATTRIBUTES[1:]:
+        write(f'      <attribute id="{name}" title="{name}" type="{kind}"/>\n')
+    write('    </attributes>\n')
+    
+    write('    <nodes>\n')
+    for node, attributes in _iter_nodes(analyzer):
+        label = attributes[0][1]
+        values = "".join(
+            f'<attvalue for="{name}" value={quoteattr(str(value))}/>' for name, value in attributes[1:]
+        )
+        write(f'      <node id="{node}" label={quoteattr(label)}><attvalues>{values}</attvalues></node>\n')
+    write('    </nodes>\n')
+    
+    write('    <edges>\n')
+    count = 0
+    for u, v, weight in analyzer.graph.edges():
+        write(f'      <edge id="{count}" source="{u}" target="{v}" weight="{weight}"/>\n')
+        count += 1
+    write('    </edges>\n')
+    
+    write('  </graph>\n')
+    write('</gexf>\n')
+    return count
+
+def _iter_nodes(analyzer):
+    """Yield (node, [(attribute, value), ...]) for each project, skipping missing values."""
+    metrics = analyzer.graph.metrics
+    labels = metrics.get(('communities', communities.DEFAULT_METHOD), {}).get('labels')
+    ranks = metrics.get(('centrality', 'pagerank', ()))
+    
+    for node, project in enumerate(analyzer.projects):
+        attributes = [("name", project['full_name'])]
+        if project.get('language'):
+            attributes.append(("language", project['language']))
+        attributes.append(("stars", project.get('stargazers_count', 0) or 0))
+        if labels is not None:
+            attributes.append(("community", labels[node]))
+        if ranks is not None:
+            attributes.append(("pagerank", round(ranks[node], 8)))
+        yield node, attributes
+
+@contextmanager
+def _open_output(destination, compress):
+    """Open a buffered text stream for a path, stdout ("-") or an existing stream."""
+    if not isinstance(destination, str):
+        yield destination
+        return
+    
+    if destination == "-":
+        if not compress:
+            yield sys.stdout
+            sys.stdout.flush()
+            return
+        stream = gzip.GzipFile(fileobj=sys.stdout.buffer, mode="wb", compresslevel=GZIP_LEVEL)
+    elif compress or (compress is None and destination.endswith(".gz")):
+        stream = gzip.open(destination, "wb", compresslevel=GZIP_LEVEL)
+    else:
+        stream = open(destination, "wb")
+    
+    with io.TextIOWrapper(io.BufferedWriter(stream, BUFFER_SIZE), encoding="utf-8") as out:
+        yield out
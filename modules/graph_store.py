@@ -0,0 +1,289 @@
+"""
+Persistent binary snapshots of the project network.
+Saves the node table, CSR adjacency arrays, weights and computed metrics to a
+versioned file that is memory-mapped on load, with append-only deltas for
+incremental updates.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from modules.graph import GraphBuilder, ProjectGraph
+
+# Snapshot format configuration
+SNAPSHOT_MAGIC = b"GIPGRAPH"
+SNAPSHOT_VERSION = 1
+DELTA_MAGIC = b"GIPDELTA"
+DELTA_SUFFIX = ".delta"
+COMPACT_RATIO = 0.25  # Compact once deltas hold this fraction of the base edges
+
+_HEADER = struct.Struct("<8sIII")  # magic, version, byte order, section count
+_SECTION = struct.Struct("<16sQQ")  # name, offset, length
+_DELTA_HEADER = struct.Struct("<8sIIIQ")  # magic, version, projects, edges, records length
+_BYTEORDER = {"little": 0, "big": 1}[sys.byteorder]
+
+class GraphStore:
+    """
+    Snapshot file plus append-only delta log for a NetworkAnalyzer.
+    
+    The snapshot holds the full network; each `save` after the first only
+    appends the projects and edges added since the previous save to
+    `<path>.delta`. Deltas are folded back into a new snapshot once the log
+    grows past `compact_ratio` of the snapshot size. Deltas are only valid
+    for an analyzer that was loaded from, or last saved to, this store.
+    """
+    
+    def __init__(self, path, compact_ratio=COMPACT_RATIO):
+        self.path = path
+        self.delta_path = path + DELTA_SUFFIX
+        self.compact_ratio = compact_ratio
+    
+    def save(self, analyzer):
+        """
+        Persist the analyzer, writing a delta when a snapshot already exists.
+        
+        Returns:
+            "snapshot" or "delta", depending on what was written, or
+            "unchanged" if nothing was added since the last save
+        """
+        if not os.path.exists(self.path) or analyzer._saved_nodes == 0:
+            write_snapshot(analyzer, self.path)
+            self._remove_delta()
+            return "snapshot"
+        if analyzer._saved_nodes == len(analyzer.projects) and not len(analyzer._journal):
+            return "unchanged"
+        
+        append_delta(analyzer, self.delta_path)
+        if os.path.getsize(self.delta_path) > self.compact_ratio * os.path.getsize(self.path):
+            write_snapshot(analyzer, self.path)
+            self._remove_delta()
+            return "snapshot"
+        return "delta"
+    
+    def load(self, **analyzer_options):
+        """
+        Load the network: memory-map the snapshot, then replay any deltas.
+        
+        Returns:
+            NetworkAnalyzer
+        """
+        analyzer = read_snapshot(self.path, **analyzer_options)
+        if os.path.exists(self.delta_path):
+            apply_deltas(analyzer, self.delta_path)
+        return analyzer
+    
+    def compact(self):
+        """Fold the delta log into a fresh snapshot."""
+        analyzer = self.load()
+        write_snapshot(analyzer, self.path)
+        self._remove_delta()
+        return analyzer
+    
+    def _remove_delta(self):
+        if os.path.exists(self.delta_path):
+            os.remove(self.delta_path)
+
+def write_snapshot(analyzer, path):
+    """
+    Write the full network of an analyzer to a snapshot file.
+    
+    The file is written next to the target and renamed into place, so
+    readers never see a partial snapshot.
+    """
+    graph = analyzer.graph
+    centrality = {
+        key[1]: _centrality_array(value)
+        for key, value in graph.metrics.items() if key[0] == "centrality" and not key[2]
+    }
+    sections = [
+        ("meta", json.dumps(_snapshot_meta(analyzer, graph, centrality)).encode("utf-8")),
+        ("projects", "\n".join(json.dumps(p, ensure_ascii=False) for p in analyzer.projects).encode("utf-8")),
+        ("indptr", _to_bytes(graph.indptr)),
+        ("indices", _to_bytes(graph.indices)),
+        ("weights", _to_bytes(graph.weights)),
+    ]
+    for metric, values in centrality.items():
+        sections.append((f"c:{metric}", _to_bytes(values)))
+    for key, value in graph.metrics.items():
+        if key[0] == "communities":
+            sections.append((f"l:{key[1]}", _to_bytes(value["labels"])))
+    
+    temp_path = f"{path}.tmp{os.getpid()}"
+    with open(temp_path, "wb") as f:
+        offset = _HEADER.size + _SECTION.size * len(sections)
+        table = []
+        for name, data in sections:
+            offset = _align(offset)
+            table.append((name, offset, len(data)))
+            offset += len(data)
+        
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _BYTEORDER, len(sections)))
+        for name, offset, length in table:
+            f.write(_SECTION.pack(name.encode("ascii"), offset, length))
+        for (name, offset, length), (_, data) in zip(table, sections):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    
+    analyzer._saved_nodes = len(analyzer.projects)
+    analyzer._journal = GraphBuilder()
+
+def read_snapshot(path, **analyzer_options):
+    """
+    Load a snapshot with its arrays memory-mapped.
+    
+    The CSR arrays and metrics are views over the mapped file, so loading is
+    independent of the edge count and processes reading the same snapshot
+    share its pages. Project records are decoded from the node table.
+    
+    Returns:
+        NetworkAnalyzer
+    """
+    from modules.network_analysis import NetworkAnalyzer
+    
+    header, sections = _read_sections(path)
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    
+    def section(name, typecode=None):
+        offset, length = sections[name]
+        data = view[offset:offset + length]
+        if typecode is None:
+            return data
+        if header["byteorder"] != _BYTEORDER:
+            values = array(typecode)
+            values.frombytes(data)
+            values.byteswap()
+            return values
+        return data.cast(typecode)
+    
+    meta = json.loads(bytes(section("meta")))
+    records = bytes(section("projects")).decode("utf-8")
+    projects = [json.loads(line) for line in records.split("\n")] if records else []
+    
+    graph = ProjectGraph(meta["num_nodes"], section("indptr", 'q'), section("indices", 'i'),
+                         section("weights", 'f'))
+    labels = {}
+    for name in sections:
+        if name.startswith("c:"):
+            metric = name[2:]
+            typecode = meta.get("centrality_types", {}).get(metric, 'd')  # Older snapshots stored doubles only
+            graph.metrics[("centrality", metric, ())] = section(name, typecode)
+        elif name.startswith("l:"):
+            method = name[2:]
+            labels[method] = section(name, 'i')
+            graph.metrics[("communities", method)] = dict(meta["communities"][method], labels=labels[method])
+    
+    analyzer = NetworkAnalyzer(min_similarity=meta["min_similarity"], block_window=meta["block_window"],
+                               **analyzer_options)
+    analyzer._restore(projects, graph, labels)
+    analyzer._saved_nodes = len(projects)
+    return analyzer
+
+def append_delta(analyzer, path):
+    """Append the projects and edges added since the last save to a delta log."""
+    journal = analyzer._journal
+    new_projects = analyzer.projects[analyzer._saved_nodes:]
+    records = "\n".join(json.dumps(p, ensure_ascii=False) for p in new_projects).encode("utf-8")
+    
+    with open(path, "ab") as f:
+        f.write(_DELTA_HEADER.pack(DELTA_MAGIC, SNAPSHOT_VERSION, len(new_projects), len(journal),
+                                   len(records)))
+        f.write(records)
+        f.write(_to_bytes(journal.sources, little_endian=True))
+        f.write(_to_bytes(journal.targets, little_endian=True))
+        f.write(_to_bytes(journal.weights, little_endian=True))
+        f.flush()
+        os.fsync(f.fileno())
+    
+    analyzer._saved_nodes = len(analyzer.projects)
+    analyzer._journal = GraphBuilder()
+
+def apply_deltas(analyzer, path):
+    """
+    Replay a delta log onto a loaded analyzer.
+    
+    A truncated trailing frame (e.g. from a crash mid-write) is ignored.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    
+    offset = 0
+    while offset + _DELTA_HEADER.size <= len(data):
+        magic, version, num_projects, num_edges, records_length = _DELTA_HEADER.unpack_from(data, offset)
+        if magic != DELTA_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"Invalid graph delta in {path}")
+        end = offset + _DELTA_HEADER.size + records_length + 12 * num_edges
+        if end > len(data):
+            break
+        
+        position = offset + _DELTA_HEADER.size
+        records = data[position:position + records_length].decode("utf-8")
+        position += records_length
+        arrays = []
+        for typecode in ('i', 'i', 'f'):
+            values = array(typecode)
+            values.frombytes(data[position:position + 4 * num_edges])
+            if sys.byteorder != "little":
+                values.byteswap()
+            arrays.append(values)
+            position += 4 * num_edges
+        
+        projects = [json.loads(line) for line in records.split("\n")] if num_projects else []
+        analyzer._replay(projects, *arrays)
+        offset = end
+    
+    analyzer._saved_nodes = len(analyzer.projects)
+    analyzer._journal = GraphBuilder()
+
+def _snapshot_meta(analyzer, graph, centrality):
+    """JSON metadata stored alongside the arrays."""
+    return {
+        "num_nodes": graph.num_nodes,
+        "num_edges": graph.num_edges,
+        "min_similarity": analyzer.min_similarity,
+        "block_window": analyzer.block_window,
+        "centrality_types": {metric: values.typecode for metric, values in centrality.items()},
+        "communities": {
+            key[1]: {"sizes": result["sizes"], "modularity": result["modularity"]}
+            for key, result in graph.metrics.items() if key[0] == "communities"
+        }
+    }
+
+def _read_sections(path):
+    """Read and validate a snapshot header and section table."""
+    with open(path, "rb") as f:
+        magic, version, byteorder, count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a graph snapshot: {path}")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported graph snapshot version {version}: {path}")
+        sections = {}
+        for _ in range(count):
+            name, offset, length = _SECTION.unpack(f.read(_SECTION.size))
+            sections[name.rstrip(b"\0").decode("ascii")] = (offset, length)
+    return {"version": version, "byteorder": byteorder}, sections
+
+def _centrality_array(values):
+    """Centrality scores as an array, keeping integer metrics (degree) as 64-bit integers."""
+    typecode = getattr(values, "typecode", None) or getattr(values, "format", None)
+    if typecode == 'q':
+        return values if isinstance(values, array) else array('q', values)
+    return values if isinstance(values, array) and typecode == 'd' else array('d', values)
+
+def _to_bytes(values, little_endian=False):
+    """Serialize an array or memoryview, in native byte order unless little_endian."""
+    if little_endian and sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _align(offset, alignment=8):
+    return (offset + alignment - 1) // alignment * alignment
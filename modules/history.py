@@ -0,0 +1,234 @@
+"""
+Notification history storage.
+Keeps the most recent notifications in a fixed-size ring buffer and every
+notification in an append-only, size-rotated JSONL log with per-segment
+indexes for paging by time range or project.
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from itertools import islice
+
+from modules._fileutil import ends_with_newline
+
+# History configuration
+HISTORY_FILE = "notifications_history.jsonl"
+BUFFER_CAPACITY = 1000  # Notifications kept in memory
+MAX_SEGMENT_BYTES = 16 * 1024 * 1024  # Active log size before rotation
+MAX_SEGMENTS = 50  # Rotated segments kept on disk
+INDEX_INTERVAL = 256  # Records between sparse time-index entries
+
+class NotificationHistory:
+    """
+    Bounded in-memory history backed by a rotated on-disk log.
+    
+    Notifications are appended to the active log file; once it passes
+    `max_bytes` it is renamed to a numbered segment and a sidecar index is
+    written next to it: the segment's time range, a sparse (timestamp,
+    offset) entry every INDEX_INTERVAL records and each project's record
+    offsets. Queries skip segments outside the time range and seek straight
+    to matching records, so no file is read whole.
+    """
+    
+    def __init__(self, path=HISTORY_FILE, capacity=BUFFER_CAPACITY, max_bytes=MAX_SEGMENT_BYTES,
+                 max_segments=MAX_SEGMENTS):
+        """
+        Args:
+            path: Active log file; rotated segments are named <base>.<n>.jsonl
+            capacity: Notifications kept in the in-memory ring buffer
+            max_bytes: Active log size that triggers rotation
+            max_segments: Rotated segments kept (oldest are deleted)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_segments = max_segments
+        self.recent = deque(maxlen=capacity)
+        self._file = None
+        self._index = None  # Index of the active log, built on first use
+        self._segment_indexes = {}  # Rotated segments are immutable; their indexes are cached
+        self._lock = threading.Lock()
+    
+    def append(self, notification):
+        """Record a notification in the ring buffer and the log."""
+        line = (json.dumps(notification, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self.recent.append(notification)
+            self._open()
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            _index_record(self._index, notification, offset)
+            if offset + len(line) >= self.max_bytes:
+                self._rotate()
+    
+    def tail(self, limit=10):
+        """Most recent notifications held in memory, oldest first."""
+        if limit <= 0:
+            return []
+        return list(islice(self.recent, max(len(self.recent) - limit, 0), None))
+    
+    def query(self, since=None, until=None, project=None, limit=100, offset=0):
+        """
+        Page through the on-disk history.
+        
+        Args:
+            since: Earliest timestamp (datetime or ISO string), inclusive
+            until: Latest timestamp (datetime or ISO string), exclusive
+            project: Only notifications about this project
+            limit: Page size
+            offset: Records to skip (page * limit)
+        
+        Returns:
+            List of notifications in chronological order
+        """
+        return list(islice(self.iter_records(since, until, project), offset, offset + limit))
+    
+    def iter_records(self, since=None, until=None, project=None):
+        """Stream matching notifications from the log in chronological order."""
+        since = since.isoformat() if isinstance(since, datetime) else since
+        until = until.isoformat() if isinstance(until, datetime) else until
+        
+        with self._lock:
+            self._open()
+            self._file.flush()
+            segments = []
+            for path in self._segments():
+                if path not in self._segment_indexes:
+                    self._segment_indexes[path] = _load_index(path)
+                segments.append((path, self._segment_indexes[path]))
+            # Snapshot the active index; only the queried project's offsets are needed
+            active = dict(self._index, sparse=list(self._index["sparse"]), projects={})
+            if project in self._index["projects"]:
+                active["projects"][project] = list(self._index["projects"][project])
+            segments.append((self.path, active))
+        
+        for path, index in segments:
+            if index["count"] == 0:
+                continue
+            if since is not None and index["last"] < since:
+                continue
+            if until is not None and index["first"] >= until:
+                continue
+            yield from _read_segment(path, index, since, until, project)
+    
+    def close(self):
+        """Close the active log file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def _open(self):
+        """Open the active log for appending, indexing what it already holds."""
+        if self._file is not None:
+            return
+        if self._index is None:
+            self._index = _build_index(self.path)
+        self._file = open(self.path, "ab")
+        if self._file.tell() and not ends_with_newline(self.path):
+            self._file.write(b"\n")  # Terminate a line torn by a crash
+    
+    def _rotate(self):
+        """Move the active log to a numbered segment with its index."""
+        self._file.close()
+        self._file = None
+        segments = self._segments()
+        number = _segment_number(segments[-1]) + 1 if segments else 1
+        segment = f"{os.path.splitext(self.path)[0]}.{number:06d}.jsonl"
+        with open(segment + ".idx", "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(self.path, segment)
+        self._index = _empty_index()
+        
+        for old in segments[:max(len(segments) + 1 - self.max_segments, 0)]:
+            self._segment_indexes.pop(old, None)
+            os.remove(old)
+            if os.path.exists(old + ".idx"):
+                os.remove(old + ".idx")
+    
+    def _segments(self):
+        """Rotated segment paths, oldest first."""
+        base = os.path.splitext(self.path)[0]
+        directory = os.path.dirname(base) or "."
+        prefix = os.path.basename(base) + "."
+        names = [
+            name for name in os.listdir(directory)
+            if name.startswith(prefix) and name.endswith(".jsonl") and name[len(prefix):-6].isdigit()
+        ]
+        return sorted((os.path.join(directory, name) for name in names), key=_segment_number)
+
+def _empty_index():
+    return {"count": 0, "first": None, "last": None, "sparse": [], "projects": {}}
+
+def _index_record(index, notification, offset):
+    """Add one record at a byte offset to a segment index."""
+    timestamp = notification.get("timestamp", "")
+    if index["count"] == 0:
+        index["first"] = timestamp
+    if index["count"] % INDEX_INTERVAL == 0:
+        index["sparse"].append([timestamp, offset])
+    index["last"] = timestamp
+    index["count"] += 1
+    index["projects"].setdefault(notification.get("project"), []).append(offset)
+
+def _build_index(path):
+    """Index an existing log file (used for the active log after a restart)."""
+    index = _empty_index()
+    if not os.path.exists(path):
+        return index
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            try:
+                _index_record(index, json.loads(line), offset)
+            except json.JSONDecodeError:
+                pass  # Torn last line from a crash
+            offset += len(line)
+    return index
+
+def _load_index(segment):
+    """Load a segment's sidecar index, rebuilding it if missing."""
+    try:
+        with open(segment + ".idx", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return _build_index(segment)
+
+def _read_segment(path, index, since, until, project):
+    """Yield matching records of one segment, seeking via its index."""
+    # First offset that may hold a record at or after `since`
+    start = 0
+    if since is not None and index["sparse"]:
+        position = bisect_left([entry[0] for entry in index["sparse"]], since)
+        start = index["sparse"][max(position - 1, 0)][1]
+    
+    with open(path, "rb") as f:
+        if project is not None:
+            offsets = index["projects"].get(project, [])
+            for offset in offsets[bisect_left(offsets, start):]:
+                f.seek(offset)
+                record = json.loads(f.readline())
+                if until is not None and record.get("timestamp", "") >= until:
+                    return
+                if since is None or record.get("timestamp", "") >= since:
+                    yield record
+            return
+        
+        f.seek(start)
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            timestamp = record.get("timestamp", "")
+            if until is not None and timestamp >= until:
+                return
+            if since is None or timestamp >= since:
+                yield record
+
+def _segment_number(path):
+    return int(path.rsplit(".", 2)[-2])
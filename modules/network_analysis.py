@@ -3,34 +3,199 @@ Network analysis module for visualizing connections between projects and users.
 Analyzes collaboration patterns and community structures.
 """
 
+import heapq
+import math
+from array import array
+from bisect import bisect_left, insort
 from collections import defaultdict
+from collections.abc import Mapping
+
+from modules import centrality, communities
+from modules.graph import GraphBuilder, ProjectGraph, traverse
+from modules.graph_export import export_graph
+from modules.graph_store import GraphStore
+from modules.similarity import SimilarityIndex, SimilarityKernel
+
+# Candidate generation (blocking) configuration
+DEFAULT_MIN_SIMILARITY = 0
+BLOCK_WINDOW = 4  # Neighbours compared on each side, in star order, per block
+MIN_TOKEN_LENGTH = 3
+STOP_WORDS = {
+    "and", "the", "for", "with", "from", "your", "that", "this", "into", "are",
+    "you", "all", "any", "our", "its", "using", "based", "via", "more", "not"
+}
 
 class NetworkAnalyzer:
     """Analyzes project and user networks."""
     
-    def __init__(self):
+    def __init__(self, min_similarity=DEFAULT_MIN_SIMILARITY, block_window=BLOCK_WINDOW,
+                 workers=None):
+        """
+        Args:
+            min_similarity: Minimum similarity for two projects to be connected
+            block_window: Neighbours compared on each side within a block
+            workers: Processes used to score candidate pairs (None = automatic)
+        """
         self.projects = []
-        self.connections = defaultdict(list)
+        self.min_similarity = min_similarity
+        self.block_window = block_window
+        self.workers = workers
+        self.kernel = SimilarityKernel()
+        self._index = {}
+        self._blocks = defaultdict(list)
+        self._graph = ProjectGraph()
+        self._pending = GraphBuilder()
+        self._journal = GraphBuilder()
+        self._saved_nodes = 0
+        self._community_labels = {}
+    
+    @property
+    def graph(self):
+        """The project network as a CSR ProjectGraph, compiled on demand."""
+        if len(self._pending) or self._graph.num_nodes < len(self.projects):
+            self._graph = self._pending.build(len(self.projects), base=self._graph)
+        return self._graph
+    
+    @property
+    def connections(self):
+        """Read-only mapping of project name -> {neighbour name: similarity}."""
+        return _ConnectionsView(self)
     
     def add_projects(self, projects):
-        """Add projects to the network."""
-        self.projects.extend(projects)
-        self._build_connections()
-    
-    def _build_connections(self):
-        """Build connections between projects based on shared attributes."""
-        for i, p1 in enumerate(self.projects):
-            for p2 in self.projects[i+1:]:
-                similarity = self._calculate_similarity(p1, p2)
-                if similarity > 0:
-                    self.connections[p1['full_name']].append({
-                        'project': p2['full_name'],
-                        'similarity': similarity
-                    })
-                    self.connections[p2['full_name']].append({
-                        'project': p1['full_name'],
-                        'similarity': similarity
-                    })
+        """
+        Add projects to the network.
+        
+        Only the new projects are compared, against the existing ones and
+        against each other, so feeding the analyzer batch by batch costs the
+        size of each batch rather than a full rebuild. Projects already in
+        the network (same full_name) are skipped.
+        """
+        self._ensure_indexed()
+        new_ids = []
+        for project in projects:
+            name = project['full_name']
+            if name in self._index:
+                continue
+            self._index[name] = self.kernel.add(project)
+            self.projects.append(project)
+            new_ids.append(self._index[name])
+        
+        self._build_connections(new_ids)
+    
+    def _build_connections(self, new_ids):
+        """Score the candidate pairs of new projects and record the edges."""
+        left, right = self._candidate_pairs(new_ids)
+        scores = self.kernel.score_pairs(left, right, workers=self.workers)
+        
+        min_similarity = self.min_similarity
+        add_edge = self._pending.add_edge
+        journal = self._journal.add_edge
+        for i, j, similarity in zip(left, right, scores):
+            if similarity > 0 and similarity >= min_similarity:
+                add_edge(i, j, similarity)
+                journal(i, j, similarity)
+    
+    def _ensure_indexed(self):
+        """Tokenize and block projects restored from a snapshot, on first use."""
+        for index in range(len(self.kernel), len(self.projects)):
+            project = self.projects[index]
+            self.kernel.add(project)
+            entry = (self.kernel.stars[index], index)
+            for key in _blocking_keys(project):
+                insort(self._blocks[key], entry)
+    
+    def _restore(self, projects, graph, community_labels):
+        """Install state loaded from a snapshot; indexing is deferred."""
+        self.projects = projects
+        self._index = {project['full_name']: i for i, project in enumerate(projects)}
+        self._graph = graph
+        self._community_labels = community_labels
+    
+    def _replay(self, projects, sources, targets, weights):
+        """Apply a persisted delta: append projects and their recorded edges."""
+        for project in projects:
+            self._index[project['full_name']] = len(self.projects)
+            self.projects.append(project)
+        for u, v, weight in zip(sources, targets, weights):
+            self._pending.add_edge(u, v, weight)
+    
+    def save_snapshot(self, path):
+        """
+        Persist the network to a binary snapshot (see modules/graph_store.py).
+        
+        Returns:
+            "snapshot" or "delta", depending on what was written, or
+            "unchanged" if nothing was added since the last save
+        """
+        return GraphStore(path).save(self)
+    
+    @classmethod
+    def load_snapshot(cls, path, **options):
+        """Load a network saved with save_snapshot, memory-mapping its arrays."""
+        return GraphStore(path).load(**options)
+    
+    def get_contributor_graph(self, contributor_network, refresh=True):
+        """
+        Link this network's projects by shared contributors.
+        
+        Args:
+            contributor_network: modules.contributors.ContributorNetwork
+            refresh: Fetch contributor lists that are missing or stale first
+        
+        Returns:
+            ProjectGraph over the same node IDs, weighted by shared contributors
+        """
+        if refresh:
+            contributor_network.refresh(self.projects)
+        return contributor_network.build_graph([project['full_name'] for project in self.projects])
+    
+    def export(self, destination="-", format="edgelist", compress=None):
+        """Stream the network as an edge list, GraphML or GEXF (see modules/graph_export.py)."""
+        return export_graph(self, destination, format=format, compress=compress)
+    
+    def _candidate_pairs(self, new_ids):
+        """
+        Generate the pairs worth scoring for new projects.
+        
+        Candidates come from inverted indexes (blocks) on language, significant
+        description tokens and star magnitude. Each block is kept sorted by
+        stars and only the closest `block_window` members on each side are
+        paired, so the cost per project stays bounded on large networks.
+        
+        Returns:
+            Tuple of aligned (left, right) project ID arrays
+        """
+        left = array('i')
+        right = array('i')
+        window = self.block_window
+        
+        for index in new_ids:
+            project = self.projects[index]
+            entry = (self.kernel.stars[index], index)
+            candidates = set()
+            for key in _blocking_keys(project):
+                block = self._blocks[key]
+                position = bisect_left(block, entry)
+                candidates.update(i for _, i in block[max(position - window, 0):position + window])
+                insort(block, entry)
+            
+            left.extend([index] * len(candidates))
+            right.extend(candidates)
+        
+        return left, right
+    
+    def get_connections(self, project_name):
+        """Return connections of a project as a list of dicts."""
+        index = self._index.get(project_name)
+        if index is None:
+            return []
+        
+        neighbors, weights = self.graph.neighbors(index)
+        projects = self.projects
+        return [
+            {'project': projects[neighbor]['full_name'], 'similarity': round(weight, 2)}
+            for neighbor, weight in zip(neighbors, weights)
+        ]
     
     def _calculate_similarity(self, p1, p2):
         """Calculate similarity score between two projects."""
@@ -55,65 +220,108 @@ class NetworkAnalyzer:
         
         return round(score, 2)
     
-    def get_project_network(self, project_name, depth=1):
+    def get_project_network(self, project_name, depth=1, fanout=None, min_similarity=0,
+                            max_nodes=None):
         """
         Get network of connected projects.
         
         Args:
             project_name: Name of the project
             depth: How many levels deep to search
+            fanout: Maximum connections followed per project (None = all)
+            min_similarity: Minimum similarity of followed connections
+            max_nodes: Maximum number of projects discovered (None = unlimited)
         
         Returns:
-            Dictionary of connections
+            Dictionary of connections, strongest first
+        """
+        return dict(self.iter_project_network(project_name, depth, fanout, min_similarity, max_nodes))
+    
+    def iter_project_network(self, project_name, depth=1, fanout=None, min_similarity=0,
+                             max_nodes=None):
         """
-        network = {project_name: self.connections.get(project_name, [])}
+        Stream the network around a project as it is traversed.
         
-        if depth > 1:
-            for conn in network[project_name]:
-                second_level = self.connections.get(conn['project'], [])
-                network[conn['project']] = second_level
+        Same arguments as get_project_network; yields (project_name,
+        connections) for each expanded project so callers can render
+        progressively.
+        """
+        index = self._index.get(project_name)
+        if index is None:
+            yield project_name, []
+            return
         
-        return network
+        projects = self.projects
+        for node, _, edges in traverse(self.graph, index, depth, fanout, min_similarity, max_nodes):
+            yield projects[node]['full_name'], [
+                {'project': projects[neighbor]['full_name'], 'similarity': similarity}
+                for neighbor, similarity in edges
+            ]
     
-    def find_communities(self, min_connections=2):
+    def detect_communities(self, method=communities.DEFAULT_METHOD, incremental=True):
         """
-        Identify communities of related projects.
+        Run community detection on the current graph.
+        
+        Results are cached on the graph. When the graph has grown since the
+        last run, the previous labels seed the new run so only the changed
+        neighbourhoods need to settle.
         
         Args:
-            min_connections: Minimum connections to be in a community
+            method: "louvain" or "label_propagation"
+            incremental: Seed with the labels of the previous run
         
         Returns:
-            List of communities
+            Dictionary with labels, sizes and modularity
+        """
+        graph = self.graph
+        key = ('communities', method)
+        if key not in graph.metrics:
+            seeds = self._community_labels.get(method) if incremental else None
+            result = communities.detect_communities(graph, method=method, seeds=seeds)
+            graph.metrics[key] = result
+            self._community_labels[method] = result['labels']
+        return graph.metrics[key]
+    
+    def find_communities(self, min_size=2, method=communities.DEFAULT_METHOD):
         """
-        communities = []
-        visited = set()
+        Identify communities of related projects.
         
-        for project_name in self.connections:
-            if project_name in visited:
-                continue
-            
-            connections = self.connections[project_name]
-            if len(connections) >= min_connections:
-                community = [project_name]
-                community.extend([c['project'] for c in connections])
-                communities.append(list(set(community)))
-                visited.update(community)
+        Args:
+            min_size: Minimum number of projects in a community
+            method: "louvain" or "label_propagation"
         
-        return communities
+        Returns:
+            List of communities (lists of project names), largest first
+        """
+        result = self.detect_communities(method)
+        members = [[] for _ in result['sizes']]
+        for node, label in enumerate(result['labels']):
+            if result['sizes'][label] >= min_size:
+                members[label].append(self.projects[node]['full_name'])
+        return [community for community in members if community]
     
-    def get_central_projects(self, limit=10):
+    def get_central_projects(self, limit=10, metric=centrality.DEFAULT_METRIC):
         """
-        Get most central projects (with most connections).
+        Get most central projects.
+        
+        Args:
+            limit: Number of projects to return
+            metric: "pagerank", "weighted_degree", "betweenness" or "degree"
         
         Returns:
-            List of (project_name, connection_count) tuples
+            List of (project_name, score) tuples, projects without
+            connections excluded
         """
-        centrality = [
-            (name, len(connections))
-            for name, connections in self.connections.items()
-        ]
-        centrality.sort(key=lambda x: x[1], reverse=True)
-        return centrality[:limit]
+        graph = self.graph
+        scores = centrality.get_centrality(graph, metric)
+        connected = (node for node in range(graph.num_nodes) if graph.degree(node) > 0)
+        central = heapq.nlargest(limit, connected, key=scores.__getitem__)
+        return [(self.projects[node]['full_name'], round(scores[node], 4)) for node in central]
+    
+    def get_project(self, project_name):
+        """Return the project record for a name, or None."""
+        index = self._index.get(project_name)
+        return self.projects[index] if index is not None else None
     
     def analyze_collaboration_potential(self, project1_name, project2_name):
         """
@@ -122,13 +330,14 @@ class NetworkAnalyzer:
         Returns:
             Dictionary with analysis results
         """
-        p1 = next((p for p in self.projects if p['full_name'] == project1_name), None)
-        p2 = next((p for p in self.projects if p['full_name'] == project2_name), None)
+        p1 = self.get_project(project1_name)
+        p2 = self.get_project(project2_name)
         
         if not p1 or not p2:
             return {"potential": "unknown", "score": 0}
         
-        similarity = self._calculate_similarity(p1, p2)
+        self._ensure_indexed()
+        similarity = self.kernel.score(self._index[project1_name], self._index[project2_name])
         
         reasons = []
         if p1.get('language') == p2.get('language'):
@@ -148,6 +357,43 @@ class NetworkAnalyzer:
             "reasons": reasons
         }
 
+class _ConnectionsView(Mapping):
+    """Dict-like view of the CSR graph keyed by project name."""
+    
+    def __init__(self, analyzer):
+        self._analyzer = analyzer
+        self._graph = analyzer.graph
+    
+    def __getitem__(self, project_name):
+        index = self._analyzer._index.get(project_name)
+        if index is None or self._graph.degree(index) == 0:
+            raise KeyError(project_name)
+        return {conn['project']: conn['similarity'] for conn in self._analyzer.get_connections(project_name)}
+    
+    def __iter__(self):
+        projects = self._analyzer.projects
+        return (
+            projects[node]['full_name']
+            for node in range(self._graph.num_nodes) if self._graph.degree(node)
+        )
+    
+    def __len__(self):
+        return sum(1 for node in range(self._graph.num_nodes) if self._graph.degree(node))
+
+def _blocking_keys(project):
+    """Inverted-index keys under which a project is a candidate for others."""
+    language = project.get('language')
+    stars = project.get('stargazers_count', 0) or 0
+    keys = []
+    if language:
+        keys.append(('language', language))
+    for word in set((project.get('description') or '').lower().split()):
+        if len(word) >= MIN_TOKEN_LENGTH and word not in STOP_WORDS:
+            keys.append(('token', word))
+    if stars > 0:
+        keys.append(('stars', int(math.log2(stars))))
+    return keys
+
 def visualize_network_text(network):
     """
     Create a text-based visualization of the network.
@@ -158,39 +404,57 @@ def visualize_network_text(network):
     Returns:
         String representation
     """
-    output = ["\n🌐 PROJECT NETWORK VISUALIZATION\n"]
-    output.append("=" * 60)
+    return "\n".join(iter_network_text(network))
+
+def iter_network_text(network):
+    """
+    Stream the text visualization line by line.
+    
+    Args:
+        network: Network dictionary, or an iterable of (project, connections)
+            pairs such as NetworkAnalyzer.iter_project_network()
     
-    for project, connections in network.items():
-        output.append(f"\n📦 {project}")
-        output.append(f"   Connected to {len(connections)} projects:")
+    Yields:
+        Lines of the visualization
+    """
+    yield "\n🌐 PROJECT NETWORK VISUALIZATION\n"
+    yield "=" * 60
+    
+    items = network.items() if isinstance(network, dict) else network
+    for project, connections in items:
+        yield f"\n📦 {project}"
+        yield f"   Connected to {len(connections)} projects:"
         
         for conn in connections[:5]:  # Limit to top 5
-            output.append(f"   ├─ {conn['project']} (similarity: {conn['similarity']})")
+            yield f"   ├─ {conn['project']} (similarity: {conn['similarity']})"
         
         if len(connections) > 5:
-            output.append(f"   └─ ... and {len(connections) - 5} more")
+            yield f"   └─ ... and {len(connections) - 5} more"
     
-    output.append("\n" + "=" * 60)
-    return "\n".join(output)
+    yield "\n" + "=" * 60
 
-def analyze_ecosystem(projects):
+def analyze_ecosystem(projects, min_similarity=DEFAULT_MIN_SIMILARITY):
     """
     Analyze the entire ecosystem of projects.
     
     Args:
         projects: List of project dictionaries
+        min_similarity: Minimum similarity for two projects to be connected
     
     Returns:
         Ecosystem analysis dictionary
     """
-    analyzer = NetworkAnalyzer()
+    analyzer = NetworkAnalyzer(min_similarity=min_similarity)
     analyzer.add_projects(projects)
+    detected = analyzer.detect_communities()
+    community_sizes = [size for size in detected['sizes'] if size >= 2]
     
     return {
         "total_projects": len(projects),
-        "total_connections": sum(len(c) for c in analyzer.connections.values()) // 2,
-        "communities": len(analyzer.find_communities()),
+        "total_connections": analyzer.graph.num_edges,
+        "communities": len(community_sizes),
+        "community_sizes": community_sizes,
+        "modularity": detected['modularity'],
         "central_projects": analyzer.get_central_projects(5),
         "network_density": _calculate_network_density(analyzer)
     }
@@ -202,7 +466,7 @@ def _calculate_network_density(analyzer):
         return 0
     
     max_possible = n * (n - 1) / 2
-    actual = sum(len(c) for c in analyzer.connections.values()) / 2
+    actual = analyzer.graph.num_edges
     
     return round(actual / max_possible, 3) if max_possible > 0 else 0
 
@@ -218,21 +482,15 @@ def suggest_collaborators(project_name, projects, limit=5):
     Returns:
         List of suggested projects
     """
-    analyzer = NetworkAnalyzer()
-    analyzer.add_projects(projects)
-    
-    connections = analyzer.connections.get(project_name, [])
-    connections.sort(key=lambda x: x['similarity'], reverse=True)
+    index = SimilarityIndex(projects)
     
     suggestions = []
-    for conn in connections[:limit]:
-        project = next((p for p in projects if p['full_name'] == conn['project']), None)
-        if project:
-            suggestions.append({
-                "project": conn['project'],
-                "similarity": conn['similarity'],
-                "url": project.get('html_url'),
-                "stars": project.get('stargazers_count', 0)
-            })
+    for project, similarity in index.query(project_name, limit):
+        suggestions.append({
+            "project": project['full_name'],
+            "similarity": similarity,
+            "url": project.get('html_url'),
+            "stars": project.get('stargazers_count', 0)
+        })
     
     return suggestions
@@ -4,15 +4,53 @@ Supports multiple notification channels and user preferences.
 """
 
 import json
+import threading
 from datetime import datetime
 
+from modules.dispatcher import FLUSH_TIMEOUT, CallbackChannel, NotificationDispatcher
+from modules.dedup import SEEN_FILE, SeenStore
+from modules.digest import DIGEST_FILE, MAX_DIGEST_ITEMS, DigestScheduler, render_fragment
+from modules.email_channel import EmailChannel
+from modules.history import HISTORY_FILE, NotificationHistory
+from modules.subscriptions import SubscriptionIndex
+from modules.trends import TRENDS_FILE, TrendDetector
+from modules.webhook import WebhookChannel
+
+DEFAULT_SUBSCRIBER = "default"  # Subscriber ID of the config's own preferences
+
 class NotificationManager:
     """Manages notifications for users."""
     
-    def __init__(self, config_file="notifications_config.json"):
+    def __init__(self, config_file="notifications_config.json", dispatcher=None, seen_store=None, history=None,
+                 trends=None, digests=None):
+        """
+        Args:
+            config_file: Channel and preference configuration
+            dispatcher: Optional NotificationDispatcher (one with the built-in
+                channels is created by default)
+            seen_store: Optional SeenStore remembering sent alerts across runs
+                (defaults to the config's seen_file)
+            history: Optional NotificationHistory (defaults to the config's
+                history_file)
+            trends: Optional TrendDetector (defaults to one persisted in the
+                config's trends_file)
+            digests: Optional DigestScheduler (defaults to one persisted in
+                the config's digest_file)
+        """
         self.config_file = config_file
         self.config = self._load_config()
-        self.notification_history = []
+        self.history = history or NotificationHistory(self.config.get("history_file", HISTORY_FILE))
+        self.dispatcher = dispatcher or NotificationDispatcher(self._create_channels())
+        if self.dispatcher.on_result is None:
+            self.dispatcher.on_result = self._on_delivery_result
+        self.subscriptions = SubscriptionIndex()
+        self.seen = seen_store if seen_store is not None else SeenStore(self.config.get("seen_file", SEEN_FILE))
+        self.digests = digests if digests is not None else DigestScheduler(self.config.get("digest_file", DIGEST_FILE))
+        self._digest_keys = []  # Seen-set keys of digest events not yet saved with the digest windows
+        self._outstanding = {}  # id(notification) -> [notification, channels left, failed, seen-set keys]
+        self._undelivered = []  # Seen-set keys of dead-lettered alerts, forgotten on flush/close
+        self._outstanding_lock = threading.Lock()
+        self.trends = trends if trends is not None else TrendDetector(self.config.get("trends_file", TRENDS_FILE))
     
     def _load_config(self):
         """Load notification configuration."""
@@ -26,6 +64,15 @@ class NotificationManager:
                     "console": True,
                     "webhook": False
                 },
+                "webhook": {
+                    "url": "",
+                    "secret": ""
+                },
+                "email": {
+                    "host": "",
+                    "sender": "",
+                    "recipients": []
+                },
                 "preferences": {
                     "min_stars": 100,
                     "keywords": ["ai", "innovation"],
@@ -33,18 +80,45 @@ class NotificationManager:
                 }
             }
     
-    def send_notification(self, notification_type, project, message=""):
+    def _create_channels(self):
+        """Built-in delivery channels, enabled per notification from the config."""
+        webhook = self.config.get("webhook", {})
+        if webhook.get("url"):
+            webhook_channel = WebhookChannel(**webhook)
+        else:
+            webhook_channel = CallbackChannel("webhook", self._send_webhook_notification)
+        
+        email = self.config.get("email", {})
+        if email.get("host"):
+            email_channel = EmailChannel(**email)
+        else:
+            email_channel = CallbackChannel("email", self._send_email_notification)
+        
+        return [
+            CallbackChannel("console", self._send_console_notification),
+            email_channel,
+            webhook_channel
+        ]
+    
+    def send_notification(self, notification_type, project, message="", recipients=None):
         """
         Send a notification about a project.
         
+        Delivery is queued on the dispatcher, so this returns without waiting
+        for the channels; call flush() to wait for delivery.
+        
         Args:
             notification_type: Type of notification (new_project, trending, opportunity)
             project: Project dictionary
             message: Custom message
+            recipients: Optional delivery addresses (e.g. for the email channel)
         
         Returns:
-            True if notification was sent
+            True if notification was queued
         """
+        return self._queue(self._create_notification(notification_type, project, message, recipients))
+    
+    def _create_notification(self, notification_type, project, message="", recipients=None):
         notification = {
             "type": notification_type,
             "project": project.get("full_name"),
@@ -52,21 +126,109 @@ class NotificationManager:
             "timestamp": datetime.now().isoformat(),
             "url": project.get("html_url")
         }
+        if recipients:
+            notification["recipients"] = recipients
+        return notification
+    
+    def send_digests(self, now=None):
+        """
+        Deliver the digests of every digest window that has ended.
         
-        self.notification_history.append(notification)
+        Digests are rendered one subscriber at a time as the windows close and
+        queued straight onto the dispatcher. Windows still open are saved
+        first, so their events survive until a later run sends them.
         
-        # Send to enabled channels
-        if self.config["channels"].get("console", True):
-            self._send_console_notification(notification)
+        Args:
+            now: Current time (default: now)
         
-        if self.config["channels"].get("email", False):
-            self._send_email_notification(notification)
+        Returns:
+            Number of digests queued
+        """
+        self._save_digests()
+        sent = 0
+        for subscriber, period, text in self.digests.close_due(now):
+            rule = self.subscriptions.subscriptions.get(subscriber)
+            notification = {
+                "type": "digest",
+                "project": None,
+                "subject": f"{period.capitalize()} innovation digest",
+                "message": text,
+                "timestamp": datetime.now().isoformat(),
+                "url": None,
+                "subscriber": subscriber
+            }
+            if rule and rule["address"]:
+                notification["recipients"] = [rule["address"]]
+            self._queue(notification)
+            sent += 1
+        self.digests.save()
+        return sent
+    
+    def _save_digests(self):
+        """Save the digest windows, then mark their buffered events as seen."""
+        self.digests.save()
+        for key in self._digest_keys:
+            self.seen.check_and_add(*key)
+        self._digest_keys = []
+    
+    def _queue(self, notification, seen_keys=()):
+        """
+        Record a notification and queue it for the enabled channels.
         
-        if self.config["channels"].get("webhook", False):
-            self._send_webhook_notification(notification)
+        Args:
+            notification: Notification dictionary
+            seen_keys: Seen-set keys (subscriber, project, type, threshold)
+                recorded for this alert; they are forgotten again if any
+                channel dead-letters it, so a later run retries
+        """
+        self.history.append(notification)
+        
+        channels = self.config["channels"]
+        enabled = [name for name, default in (("console", True), ("email", False), ("webhook", False))
+                   if channels.get(name, default) and name in self.dispatcher.channels]
+        if seen_keys and enabled:
+            with self._outstanding_lock:
+                self._outstanding[id(notification)] = [notification, len(enabled), False, list(seen_keys)]
+        self.dispatcher.submit(notification, enabled)
         
         return True
     
+    def _on_delivery_result(self, channel, notifications, error):
+        """Dispatcher callback: collect the seen-set keys of alerts a channel dead-lettered."""
+        with self._outstanding_lock:
+            for notification in notifications:
+                entry = self._outstanding.get(id(notification))
+                if entry is None or entry[0] is not notification:
+                    continue
+                entry[1] -= 1
+                entry[2] = entry[2] or error is not None
+                if not entry[1]:
+                    del self._outstanding[id(notification)]
+                    if entry[2]:
+                        self._undelivered.extend(entry[3])
+    
+    def _forget_undelivered(self):
+        """Drop dead-lettered alerts from the seen-set (on the caller's thread, which owns it)."""
+        with self._outstanding_lock:
+            keys, self._undelivered = self._undelivered, []
+        for key in keys:
+            self.seen.forget(*key)
+    
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Wait until queued notifications are delivered (or dead-lettered)."""
+        drained = self.dispatcher.flush(timeout)
+        self._forget_undelivered()
+        return drained
+    
+    def close(self):
+        """Send due digests, deliver pending notifications, stop the dispatcher and save the state."""
+        self.send_digests()
+        self.dispatcher.close()
+        self._forget_undelivered()
+        self.trends.save()
+        self.seen.close()
+        self.history.close()
+    
     def _generate_message(self, notification_type, project):
         """Generate notification message."""
         name = project.get("full_name")
@@ -89,34 +251,51 @@ class NotificationManager:
             "trending": "🔥",
             "opportunity": "💡",
             "milestone": "🎯",
-            "update": "📢"
+            "update": "📢",
+            "digest": "📊"
         }
         
         icon = icons.get(notification["type"], "📬")
         print(f"\n{icon} NOTIFICATION [{notification['timestamp']}]")
         print(f"   {notification['message']}")
-        print(f"   🔗 {notification['url']}\n")
+        if notification.get("url"):
+            print(f"   🔗 {notification['url']}\n")
     
     def _send_email_notification(self, notification):
-        """Send email notification (mock)."""
-        # In production, integrate with email service
+        """Send email notification (mock, used when no SMTP host is configured)."""
         print(f"📧 Email notification queued: {notification['message']}")
     
     def _send_webhook_notification(self, notification):
-        """Send webhook notification (mock)."""
-        # In production, send to webhook URL
+        """Send webhook notification (mock, used when no webhook URL is configured)."""
         print(f"🔔 Webhook notification sent: {notification['message']}")
     
     def check_and_notify(self, project):
         """
         Check if project matches user preferences and send notification.
         
+        Projects already notified within the new_project TTL, in this run or
+        an earlier one, are skipped; alerts that end up dead-lettered are
+        retried on the next run.
+        
         Args:
             project: Project dictionary
         
         Returns:
             True if notification was sent
         """
+        if not self._matches_preferences(project):
+            return False
+        
+        # Skip projects already notified
+        key = (DEFAULT_SUBSCRIBER, project.get("full_name"), "new_project", None)
+        if not self.seen.check_and_add(*key):
+            return False
+        
+        # Send notification
+        return self._queue(self._create_notification("new_project", project), [key])
+    
+    def _matches_preferences(self, project):
+        """Check a project against the config's own preferences."""
         prefs = self.config.get("preferences", {})
         
         # Check minimum stars
@@ -135,12 +314,113 @@ class NotificationManager:
         if languages and project.get("language") not in languages:
             return False
         
-        # Send notification
-        return self.send_notification("new_project", project)
+        return True
+    
+    def track_trends(self, projects, now=None):
+        """
+        Feed a metrics snapshot to the trend detector and send its alerts.
+        
+        Trending and milestone events go to matching subscribers and, when
+        the project matches the config's preferences, to the default
+        subscriber; milestones are deduplicated per threshold.
+        
+        Args:
+            projects: Current project dictionaries
+            now: Snapshot time in seconds (default: now)
+        
+        Returns:
+            List of trend events (see TrendDetector.update)
+        """
+        events = self.trends.update(projects, now)
+        for event in events:
+            project, notification_type, threshold = event["project"], event["type"], event["threshold"]
+            self.notify_subscribers(project, notification_type, threshold)
+            key = (DEFAULT_SUBSCRIBER, project.get("full_name"), notification_type, threshold)
+            if self._matches_preferences(project) and self.seen.check_and_add(*key):
+                self._queue(self._create_notification(notification_type, project), [key])
+        return events
+    
+    def add_subscriber(self, subscriber_id, address=None, min_stars=0, keywords=(), languages=(), digest=None):
+        """
+        Register a subscriber's notification preferences.
+        
+        Args:
+            subscriber_id: Unique subscriber ID
+            address: Optional delivery address (e.g. email)
+            min_stars: Minimum stars
+            keywords: Words of which at least one must appear (empty = any)
+            languages: Accepted languages (empty = any)
+            digest: "daily" or "weekly" to receive matches in a periodic digest
+                (see send_digests) instead of immediately
+        """
+        self.subscriptions.add_subscription(subscriber_id, min_stars, keywords, languages, address, digest)
+    
+    def remove_subscriber(self, subscriber_id):
+        """Remove a subscriber; returns False if unknown."""
+        return self.subscriptions.remove_subscription(subscriber_id)
+    
+    def notify_subscribers(self, project, notification_type="new_project", threshold=None):
+        """
+        Notify every subscriber whose preferences match a project.
+        
+        Matching subscribers are found through the subscription index and
+        share a single notification addressed to all of them; subscribers who
+        chose a digest get the event buffered for their next digest instead
+        (recorded as seen once the digest windows are saved). Subscribers
+        already sent this notification within its TTL are left out.
+        
+        Args:
+            project: Project dictionary
+            notification_type: Type of notification
+            threshold: Optional value making the event distinct (e.g. the
+                milestone reached), so crossing a new one notifies again
+        
+        Returns:
+            List of notified (or digest-buffered) subscriber IDs
+        """
+        name = project.get("full_name")
+        subscribers = []
+        immediate = []
+        immediate_keys = []
+        for subscriber in self.subscriptions.match(project):
+            key = (subscriber, name, notification_type, threshold)
+            period = self.subscriptions.subscriptions[subscriber]["digest"]
+            if period:
+                if self.seen.seen(*key):
+                    continue
+                self.digests.add_event(subscriber, project, notification_type, period)
+                self._digest_keys.append(key)
+            elif self.seen.check_and_add(*key):
+                immediate.append(subscriber)
+                immediate_keys.append(key)
+            else:
+                continue
+            subscribers.append(subscriber)
+        if immediate:
+            notification = self._create_notification(notification_type, project,
+                                                     recipients=self.subscriptions.addresses(immediate))
+            self._queue(notification, immediate_keys)
+        return subscribers
     
     def get_notification_history(self, limit=10):
-        """Get recent notifications."""
-        return self.notification_history[-limit:]
+        """Get recent notifications (from the in-memory ring buffer)."""
+        return self.history.tail(limit)
+    
+    def query_history(self, since=None, until=None, project=None, limit=100, offset=0):
+        """
+        Page through the full on-disk notification history.
+        
+        Args:
+            since: Earliest timestamp (datetime or ISO string), inclusive
+            until: Latest timestamp (datetime or ISO string), exclusive
+            project: Only notifications about this project
+            limit: Page size
+            offset: Records to skip
+        
+        Returns:
+            List of notifications in chronological order
+        """
+        return self.history.query(since, until, project, limit, offset)
     
     def configure_channel(self, channel, enabled):
         """Enable or disable a notification channel."""
@@ -170,12 +450,7 @@ def create_digest(projects, period="daily"):
     
     summary = f"\n🎯 Found {len(projects)} innovative projects\n\n"
     
-    items = []
-    for i, project in enumerate(projects[:10], 1):
-        name = project.get("full_name", "")
-        stars = project.get("stargazers_count", 0)
-        desc = project.get("description", "No description")[:80]
-        items.append(f"{i}. {name} ({stars} ⭐)\n   {desc}...")
+    items = [f"{i}. {render_fragment(project)}" for i, project in enumerate(projects[:MAX_DIGEST_ITEMS], 1)]
     
     footer = f"\n{'='*70}\n"
     
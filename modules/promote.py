@@ -1,4 +1,77 @@
+"""
+Project promotion output.
+Renders projects for the console or as JSON, Markdown or HTML documents,
+one at a time or as a batch streamed into a buffered writer.
+"""
+
+import html
 import json
+import sys
+
+# Promotion output configuration
+BADGE = "badges/projet_innovant.svg"
+RENDER_CHUNK = 500  # Projects rendered before each write to the sink
+WRITE_BUFFER = 1024 * 1024  # Buffer size of output files opened by path
+RULE = "=" * 60
+
+# Pre-compiled templates, filled with str.format_map from _fields()
+_CONSOLE_TEMPLATE = (
+    f"\n{RULE}\n"
+    "🚀 Innovative Project / Projet Innovant\n"
+    f"{RULE}\n"
+    "📦 Name: {name}\n"
+    "📝 Description: {description}\n"
+    "⭐ Stars: {stars}\n"
+    "🍴 Forks: {forks}\n"
+    "👀 Watchers: {watchers}\n"
+    "🐛 Open Issues: {issues}\n"
+    "💻 Language: {language}\n"
+    "🎯 Innovation Score: {innovation_score}\n"
+    "🔗 Link / Lien: {url}\n"
+    "🏆 Badge: {badge}\n"
+    f"{RULE}\n\n"
+).format_map
+
+_MARKDOWN_TEMPLATE = """## 🚀 {name}
+
+**Description:** {description}
+
+- ⭐ Stars: {stars}
+- 🍴 Forks: {forks}
+- 💻 Language: {language}
+- 🎯 Innovation Score: {innovation_score}
+
+[View on GitHub]({url})
+
+![Innovation Badge]({badge})
+""".format_map
+
+_HTML_TEMPLATE = """<div class="innovative-project">
+    <h2>🚀 {name}</h2>
+    <p><strong>Description:</strong> {description}</p>
+    <ul>
+        <li>⭐ Stars: {stars}</li>
+        <li>🍴 Forks: {forks}</li>
+        <li>💻 Language: {language}</li>
+        <li>🎯 Innovation Score: {innovation_score}</li>
+    </ul>
+    <a href="{url}" target="_blank">View on GitHub</a>
+    <br>
+    <img src="{badge}" alt="Innovation Badge">
+</div>""".format_map
+
+# One object per line: indent= would switch json to its pure-Python encoder
+_json_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+# Batch documents: (header, separator between projects, footer)
+_DOCUMENTS = {
+    "console": ("", "", ""),
+    "json": ("[\n  ", ",\n  ", "\n]\n"),
+    "markdown": ("# 🚀 Innovative Projects / Projets Innovants\n\n", "\n", ""),
+    "html": ('<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+             "<title>Innovative Projects</title>\n</head>\n<body>\n", "\n", "\n</body>\n</html>\n")
+}
+_EMPTY_DOCUMENTS = {"json": "[]\n"}
 
 def promote_project(project, format="console"):
     """
@@ -7,6 +80,10 @@ def promote_project(project, format="console"):
     Args:
         project: Project dictionary
         format: Output format (console, json, markdown, html)
+    
+    HTML output entity-escapes every field (&, <, >, and quotes), the same
+    as promote_projects(); earlier versions inserted the raw text, so a
+    description containing "&" or "<" now comes back as "&amp;" or "&lt;".
     """
     if format == "console":
         _promote_console(project)
@@ -19,26 +96,84 @@ def promote_project(project, format="console"):
     else:
         _promote_console(project)
 
-def _promote_console(project):
-    """Console/terminal output format."""
-    print(f"\n{'='*60}")
-    print(f"🚀 Innovative Project / Projet Innovant")
-    print(f"{'='*60}")
-    print(f"📦 Name: {project['full_name']}")
-    print(f"📝 Description: {project.get('description', 'N/A')}")
-    print(f"⭐ Stars: {project.get('stargazers_count', 0)}")
-    print(f"🍴 Forks: {project.get('forks_count', 0)}")
-    print(f"👀 Watchers: {project.get('watchers_count', 0)}")
-    print(f"🐛 Open Issues: {project.get('open_issues_count', 0)}")
-    print(f"💻 Language: {project.get('language', 'N/A')}")
-    print(f"🎯 Innovation Score: {project.get('innovation_score', 'N/A')}")
-    print(f"🔗 Link / Lien: {project['html_url']}")
-    print(f"🏆 Badge: badges/projet_innovant.svg")
-    print(f"{'='*60}\n")
+def promote_projects(projects, format="console", sink=None):
+    """
+    Promote a batch of projects as one document.
+    
+    Projects are rendered through the pre-compiled templates and written to
+    the sink in chunks of RENDER_CHUNK, so a large batch (or a generator of
+    projects) streams to a file without the document being held in memory.
+    JSON output is a single array, Markdown and HTML a single document with
+    one section per project; console output matches promote_project().
+    
+    Args:
+        projects: Iterable of project dictionaries
+        format: Output format (console, json, markdown, html)
+        sink: Output file path or writable text stream (default: stdout)
+    
+    Returns:
+        Number of projects written
+    """
+    if format not in _DOCUMENTS:
+        format = "console"
+    if isinstance(sink, str):
+        with open(sink, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+            return _write_document(projects, format, f)
+    return _write_document(projects, format, sink if sink is not None else sys.stdout)
 
-def _promote_json(project):
-    """JSON output format."""
-    return json.dumps({
+def _write_document(projects, format, stream):
+    render = _RENDERERS[format]
+    header, separator, footer = _DOCUMENTS[format]
+    count = 0
+    chunk = []
+    for project in projects:
+        chunk.append(render(project))
+        count += 1
+        if len(chunk) >= RENDER_CHUNK:
+            stream.write((header if count == len(chunk) else separator) + separator.join(chunk))
+            chunk = []
+    
+    if not count:
+        stream.write(_EMPTY_DOCUMENTS.get(format, header + footer))
+    else:
+        if chunk:
+            stream.write((header if count == len(chunk) else separator) + separator.join(chunk))
+        stream.write(footer)
+    stream.flush()
+    return count
+
+def _fields(project, escape=None):
+    """Template fields of a project, optionally escaped."""
+    fields = {
+        "name": project['full_name'],
+        "description": project.get('description', 'N/A'),
+        "stars": project.get('stargazers_count', 0),
+        "forks": project.get('forks_count', 0),
+        "watchers": project.get('watchers_count', 0),
+        "issues": project.get('open_issues_count', 0),
+        "language": project.get('language', 'N/A'),
+        "innovation_score": project.get('innovation_score', 'N/A'),
+        "url": project['html_url'],
+        "badge": BADGE
+    }
+    if escape:
+        fields = {key: escape(str(value)) for key, value in fields.items()}
+    return fields
+
+def _render_console(project):
+    return _CONSOLE_TEMPLATE(_fields(project))
+
+def _render_markdown(project):
+    return _MARKDOWN_TEMPLATE(_fields(project))
+
+def _render_html(project):
+    return _HTML_TEMPLATE(_fields(project, html.escape))
+
+def _render_json(project):
+    return _json_encode(_json_record(project))
+
+def _json_record(project):
+    return {
         "name": project['full_name'],
         "description": project.get('description'),
         "stars": project.get('stargazers_count', 0),
@@ -48,37 +183,28 @@ def _promote_json(project):
         "language": project.get('language'),
         "innovation_score": project.get('innovation_score'),
         "url": project['html_url'],
-        "badge": "badges/projet_innovant.svg"
-    }, indent=2)
+        "badge": BADGE
+    }
 
-def _promote_markdown(project):
-    """Markdown output format."""
-    return f"""## 🚀 {project['full_name']}
+_RENDERERS = {
+    "console": _render_console,
+    "json": _render_json,
+    "markdown": _render_markdown,
+    "html": _render_html
+}
 
-**Description:** {project.get('description', 'N/A')}
-
-- ⭐ Stars: {project.get('stargazers_count', 0)}
-- 🍴 Forks: {project.get('forks_count', 0)}
-- 💻 Language: {project.get('language', 'N/A')}
-- 🎯 Innovation Score: {project.get('innovation_score', 'N/A')}
+def _promote_console(project):
+    """Console/terminal output format."""
+    sys.stdout.write(_render_console(project))
 
-[View on GitHub]({project['html_url']})
+def _promote_json(project):
+    """JSON output format."""
+    return json.dumps(_json_record(project), indent=2)
 
-![Innovation Badge](badges/projet_innovant.svg)
-"""
+def _promote_markdown(project):
+    """Markdown output format."""
+    return _render_markdown(project)
 
 def _promote_html(project):
-    """HTML output format."""
-    return f"""<div class="innovative-project">
-    <h2>🚀 {project['full_name']}</h2>
-    <p><strong>Description:</strong> {project.get('description', 'N/A')}</p>
-    <ul>
-        <li>⭐ Stars: {project.get('stargazers_count', 0)}</li>
-        <li>🍴 Forks: {project.get('forks_count', 0)}</li>
-        <li>💻 Language: {project.get('language', 'N/A')}</li>
-        <li>🎯 Innovation Score: {project.get('innovation_score', 'N/A')}</li>
-    </ul>
-    <a href="{project['html_url']}" target="_blank">View on GitHub</a>
-    <br>
-    <img src="badges/projet_innovant.svg" alt="Innovation Badge">
-</div>"""
\ No newline at end of file
+    """HTML output format (fields entity-escaped)."""
+    return _render_html(project)
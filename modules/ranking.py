@@ -0,0 +1,183 @@
+"""
+Feedback-weighted ranking for recommendations.
+Joins project features with community feedback aggregates into a cached
+table that recommenders read instead of the feedback storage, kept current
+as new ratings arrive.
+"""
+
+import time
+from datetime import datetime
+
+from modules.feedback import BAYESIAN_PRIOR, BAYESIAN_WEIGHT
+
+# Ranking configuration
+HALF_LIFE_DAYS = 90  # Age at which a rating counts half
+FEEDBACK_WEIGHT = 0.5  # Score multiplier spread: 1 +/- FEEDBACK_WEIGHT / 2 for the best/worst rated
+RESCORE_INTERVAL = 3600  # Seconds between re-decaying every row's precomputed scores
+DAY = 24 * 3600
+
+class FeedbackRanking:
+    """
+    Cached join of project features and feedback aggregates.
+    
+    Each row holds a project's features (stars, forks, language, innovation
+    score), its rating aggregates (average, review count, Bayesian average)
+    and a recency-decayed rating sum and count, where a rating's weight
+    halves every `half_life_days`. The recency score is a Bayesian average
+    over the decayed ratings: recent praise counts fully, and old or absent
+    feedback fades to the neutral prior.
+    
+    The blended columns (recency_score, weight, and score = innovation
+    score x weight) are precomputed, so a recommendation reads them in O(1)
+    per project. The table is built once from a FeedbackCollector, then a
+    new rating or a joined project updates only its own row; every row is
+    re-decayed at most once per `rescore_interval` seconds.
+    """
+    
+    def __init__(self, collector=None, half_life_days=HALF_LIFE_DAYS, weight=FEEDBACK_WEIGHT,
+                 rescore_interval=RESCORE_INTERVAL):
+        """
+        Args:
+            collector: Optional FeedbackCollector to join and follow
+            half_life_days: Age in days at which a rating counts half
+            weight: Multiplier spread applied by weight()
+            rescore_interval: Seconds between re-decaying every row's scores
+        """
+        self.half_life = half_life_days * DAY
+        self.weight_spread = weight
+        self.rescore_interval = rescore_interval
+        self.rows = {}  # project full_name -> joined row
+        self.scored_at = time.time()  # Time the blended columns are computed as of
+        self.collector = collector
+        if collector is not None:
+            collector.add_listener(self._on_feedback)
+            self.rebuild()
+    
+    def rebuild(self):
+        """Recompute every row's feedback columns from the collector."""
+        for row in self.rows.values():
+            row.update(_empty_feedback())
+        if self.collector is not None:
+            for project_name, entry in self.collector.ratings():
+                self._add_rating(self._row(project_name), entry)
+        self.rescore()
+    
+    def add_projects(self, projects):
+        """Join (or refresh) project features and their blended scores."""
+        for project in projects:
+            row = self._row(project.get("full_name"))
+            row["stars"] = project.get("stargazers_count", 0) or 0
+            row["forks"] = project.get("forks_count", 0) or 0
+            row["language"] = project.get("language")
+            row["innovation_score"] = project.get("innovation_score", 0) or 0
+            self._score(row, self.scored_at)
+    
+    def rescore(self, now=None):
+        """Recompute every row's blended columns as of `now` (default: now)."""
+        now = now if now is not None else time.time()
+        for row in self.rows.values():
+            self._score(row, now)
+        self.scored_at = now
+    
+    def get(self, project_name):
+        """
+        Joined row of a project.
+        
+        Returns:
+            Row dict (features, average_rating, reviews, bayesian_rating,
+            recency_score, weight, score), or None if the project is unknown
+        """
+        row = self._lookup(project_name)
+        return dict(row) if row is not None else None
+    
+    def weight(self, project_name):
+        """
+        Multiplier for blending community ratings into another score.
+        
+        Returns:
+            1.0 for neutral or no feedback, up to 1 + weight/2 for the best
+            rated and down to 1 - weight/2 for the worst rated projects
+        """
+        row = self._lookup(project_name)
+        return row["weight"] if row is not None else 1.0
+    
+    def score(self, project_name):
+        """Innovation score scaled by weight(), or None if the project is not joined."""
+        row = self._lookup(project_name)
+        return row["score"] if row is not None else None
+    
+    def recency_score(self, project_name, now=None):
+        """Bayesian average rating over recency-decayed ratings (the prior when unrated)."""
+        row = self.rows.get(project_name)
+        if row is None:
+            return BAYESIAN_PRIOR
+        return self._recency_score(row, now if now is not None else time.time())
+    
+    def _lookup(self, project_name):
+        if time.time() - self.scored_at >= self.rescore_interval:
+            self.rescore()
+        return self.rows.get(project_name)
+    
+    def _on_feedback(self, project_name, entry):
+        """Collector listener: apply one new rating, or rebuild after a reload."""
+        if project_name is None:
+            self.rebuild()
+        else:
+            row = self._row(project_name)
+            self._add_rating(row, entry)
+            self._score(row, self.scored_at)
+    
+    def _row(self, project_name):
+        row = self.rows.get(project_name)
+        if row is None:
+            row = self.rows[project_name] = {"stars": 0, "forks": 0, "language": None, "innovation_score": 0,
+                                             **_empty_feedback(), "recency_score": BAYESIAN_PRIOR,
+                                             "weight": 1.0, "score": 0}
+        return row
+    
+    def _recency_score(self, row, now):
+        if not row["decayed_count"]:
+            return BAYESIAN_PRIOR
+        decay = 0.5 ** (max(now - row["updated"], 0) / self.half_life)
+        return ((BAYESIAN_PRIOR * BAYESIAN_WEIGHT + row["decayed_sum"] * decay)
+                / (BAYESIAN_WEIGHT + row["decayed_count"] * decay))
+    
+    def _score(self, row, now):
+        """Precompute a row's blended columns as of `now`."""
+        recency_score = self._recency_score(row, now)
+        weight = 1 + self.weight_spread * ((recency_score - 1) / 4 - 0.5)  # 0..1 rating scale, 0.5 neutral
+        row["recency_score"] = recency_score
+        row["weight"] = weight
+        row["score"] = row["innovation_score"] * weight
+    
+    def _add_rating(self, row, entry):
+        """Fold one rating into a row's aggregates in O(1)."""
+        rating = entry["rating"]
+        row["reviews"] += 1
+        row["rating_sum"] += rating
+        row["average_rating"] = row["rating_sum"] / row["reviews"]
+        row["bayesian_rating"] = ((BAYESIAN_PRIOR * BAYESIAN_WEIGHT + row["rating_sum"])
+                                  / (BAYESIAN_WEIGHT + row["reviews"]))
+        
+        # Decayed sums are kept as of the newest rating; older ones enter pre-decayed
+        at = _timestamp(entry.get("timestamp"))
+        if at >= row["updated"]:
+            decay = 0.5 ** ((at - row["updated"]) / self.half_life) if row["decayed_count"] else 0.0
+            row["decayed_sum"] = row["decayed_sum"] * decay + rating
+            row["decayed_count"] = row["decayed_count"] * decay + 1
+            row["updated"] = at
+        else:
+            decay = 0.5 ** ((row["updated"] - at) / self.half_life)
+            row["decayed_sum"] += rating * decay
+            row["decayed_count"] += decay
+
+def _empty_feedback():
+    return {"reviews": 0, "rating_sum": 0, "average_rating": 0, "bayesian_rating": BAYESIAN_PRIOR,
+            "decayed_sum": 0.0, "decayed_count": 0.0, "updated": 0.0}
+
+def _timestamp(value):
+    """Seconds since the epoch of an ISO timestamp (now if missing or invalid)."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
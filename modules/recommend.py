@@ -6,7 +6,7 @@ Uses project similarity and user interests to recommend connections.
 # Default user interests
 DEFAULT_USER_INTERESTS = ["ai", "machine learning", "innovation"]
 
-def recommend_collaborations(projects, user_interests=None, limit=5):
+def recommend_collaborations(projects, user_interests=None, limit=5, ranking=None):
     """
     Recommend collaboration opportunities based on projects.
     
@@ -14,6 +14,8 @@ def recommend_collaborations(projects, user_interests=None, limit=5):
         projects: List of project dictionaries
         user_interests: List of keywords user is interested in
         limit: Maximum number of recommendations
+        ranking: Optional FeedbackRanking whose precomputed rating weights
+            scale the relevance scores
     
     Returns:
         List of recommended projects with reasons
@@ -26,10 +28,15 @@ def recommend_collaborations(projects, user_interests=None, limit=5):
     for project in projects:
         relevance_score = _calculate_relevance(project, user_interests)
         if relevance_score > 0:
+            reasons = _get_recommendation_reasons(project, user_interests)
+            row = ranking.get(project.get("full_name")) if ranking is not None else None
+            if row is not None:
+                relevance_score = round(relevance_score * row["weight"], 2)
+                reasons = _get_feedback_reasons(row) + reasons
             recommendations.append({
                 "project": project,
                 "relevance_score": relevance_score,
-                "reasons": _get_recommendation_reasons(project, user_interests)
+                "reasons": reasons
             })
     
     # Sort by relevance
@@ -85,6 +92,12 @@ def _get_recommendation_reasons(project, interests):
     
     return reasons if reasons else ["Recommended based on innovation criteria"]
 
+def _get_feedback_reasons(row):
+    """Reason mentioning the community rating, if the project has reviews."""
+    if not row or not row["reviews"]:
+        return []
+    return [f"Rated {row['average_rating']:.1f}/5 by the community ({row['reviews']} reviews)"]
+
 def find_similar_projects(target_project, all_projects, limit=5):
     """
     Find projects similar to a target project.
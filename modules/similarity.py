@@ -0,0 +1,290 @@
+"""
+Similarity kernel for scoring many project pairs at once.
+Tokenizes each project once into sorted integer token IDs and scores pairs in
+blocks, optionally spread across a process pool. With NumPy, a block's shared
+words are counted by one sorted-array intersection; without it, a pure-Python
+loop intersects token sets pair by pair.
+"""
+
+import heapq
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # Pure-Python scoring only
+    np = None
+
+# Kernel configuration
+PAIR_BLOCK_SIZE = 50000  # Pairs scored per block / per worker task
+MIN_PARALLEL_PAIRS = 200000  # Below this, scoring stays in-process
+MIN_NUMPY_PAIRS = 64  # Smaller blocks are scored in pure Python, where NumPy call overhead dominates
+
+LANGUAGE_WEIGHT = 3
+WORD_WEIGHT = 0.5
+STARS_WEIGHT = 2
+
+_worker_kernel = None
+
+class SimilarityKernel:
+    """
+    Precomputed project features for pairwise similarity scoring.
+
+    Scores are identical to NetworkAnalyzer._calculate_similarity: language
+    match, shared lowercase description words and star ratio. Each project's
+    token IDs are kept both as a set and, sorted, as a CSR row of
+    `token_ids` (bounded by `token_ptr`) for batch intersections.
+    """
+    
+    def __init__(self):
+        self.vocabulary = {}
+        self.languages = array('i')
+        self.stars = array('d')  # Star counts may arrive as floats from JSON caches
+        self.tokens = []
+        self.token_ptr = array('q', [0])
+        self.token_ids = array('i')
+        self._language_ids = {}
+    
+    def __len__(self):
+        return len(self.tokens)
+    
+    def add(self, project):
+        """
+        Tokenize a project and append it to the kernel.
+
+        Returns:
+            Integer ID of the project in the kernel
+        """
+        language = project.get('language')
+        if language:
+            language_id = self._language_ids.setdefault(language, len(self._language_ids))
+        else:
+            language_id = -1
+        
+        vocabulary = self.vocabulary
+        words = (project.get('description') or '').lower().split()
+        token_ids = frozenset(vocabulary.setdefault(word, len(vocabulary)) for word in words)
+        
+        self.languages.append(language_id)
+        self.stars.append(float(project.get('stargazers_count', 0) or 0))
+        self.tokens.append(token_ids)
+        self.token_ids.extend(sorted(token_ids))
+        self.token_ptr.append(len(self.token_ids))
+        return len(self.tokens) - 1
+    
+    def score(self, i, j):
+        """Score a single pair of project IDs."""
+        return _score_pairs(self, array('i', [i]), array('i', [j]))[0]
+    
+    def score_row(self, i, others=None):
+        """
+        Score one project against many others (the whole kernel by default).
+
+        Returns:
+            array of scores aligned with `others`
+        """
+        if others is None:
+            others = range(len(self))
+        others = array('i', others)
+        return _score_pairs(self, array('i', [i]) * len(others), others)
+    
+    def score_pairs(self, left, right, workers=None):
+        """
+        Score pairs (left[k], right[k]) in blocks.
+
+        Args:
+            left: Sequence of project IDs
+            right: Sequence of project IDs, same length as left
+            workers: Process count; None picks one per CPU for large inputs,
+                1 forces in-process scoring
+
+        Returns:
+            array('d') of scores aligned with the input pairs
+        """
+        left = array('i', left)
+        right = array('i', right)
+        if workers is None:
+            workers = (os.cpu_count() or 1) if len(left) >= MIN_PARALLEL_PAIRS else 1
+        
+        if workers <= 1 or len(left) <= PAIR_BLOCK_SIZE:
+            return _score_pairs(self, left, right)
+        
+        blocks = [
+            (left[start:start + PAIR_BLOCK_SIZE], right[start:start + PAIR_BLOCK_SIZE])
+            for start in range(0, len(left), PAIR_BLOCK_SIZE)
+        ]
+        scores = array('d')
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self,)) as pool:
+            for block_scores in pool.map(_score_block, blocks):
+                scores.extend(block_scores)
+        return scores
+    
+    def __getstate__(self):
+        # Workers only need the features used for scoring
+        return {
+            'languages': self.languages,
+            'stars': self.stars,
+            'tokens': self.tokens,
+            'token_ptr': self.token_ptr,
+            'token_ids': self.token_ids
+        }
+    
+    def __setstate__(self, state):
+        self.__init__()
+        self.languages = state['languages']
+        self.stars = state['stars']
+        self.tokens = state['tokens']
+        self.token_ptr = state['token_ptr']
+        self.token_ids = state['token_ids']
+
+class SimilarityIndex:
+    """
+    Name-indexed project corpus for single-source similarity queries.
+    
+    Answers "which projects are most similar to X" by scoring only X's row
+    against the corpus, without building the full project network.
+    """
+    
+    def __init__(self, projects=()):
+        self.kernel = SimilarityKernel()
+        self.projects = []
+        self._index = {}
+        self.add_projects(projects)
+    
+    def add_projects(self, projects):
+        """Add projects to the corpus; projects already indexed are skipped."""
+        for project in projects:
+            name = project['full_name']
+            if name not in self._index:
+                self._index[name] = self.kernel.add(project)
+                self.projects.append(project)
+    
+    def get_project(self, project_name):
+        """Return the project record for a name, or None."""
+        index = self._index.get(project_name)
+        return self.projects[index] if index is not None else None
+    
+    def query(self, project_name, limit=5, min_similarity=0):
+        """
+        Find the projects most similar to one project.
+        
+        Args:
+            project_name: Name of the target project
+            limit: Maximum number of results
+            min_similarity: Minimum similarity score
+        
+        Returns:
+            List of (project, similarity) tuples, best first
+        """
+        target = self._index.get(project_name)
+        if target is None:
+            return []
+        
+        scores = self.kernel.score_row(target)
+        candidates = (
+            i for i in range(len(scores))
+            if i != target and scores[i] > 0 and scores[i] >= min_similarity
+        )
+        best = heapq.nlargest(limit, candidates, key=scores.__getitem__)
+        return [(self.projects[i], scores[i]) for i in best]
+
+def _init_worker(kernel):
+    """Process pool initializer: receive the kernel once per worker."""
+    global _worker_kernel
+    _worker_kernel = kernel
+
+def _score_block(block):
+    """Score one block of pairs inside a worker process."""
+    left, right = block
+    return _score_pairs(_worker_kernel, left, right)
+
+def _score_pairs(kernel, left, right):
+    """Score aligned pair arrays, in one NumPy batch when available."""
+    if np is not None and len(left) >= MIN_NUMPY_PAIRS:
+        return _score_pairs_numpy(kernel, left, right)
+    return _score_pairs_python(kernel, left, right)
+
+def _score_pairs_numpy(kernel, left, right):
+    """Score a block of pairs with array operations, in the same order of operations as the loop."""
+    left = np.frombuffer(left, dtype=np.intc).astype(np.int64)
+    right = np.frombuffer(right, dtype=np.intc).astype(np.int64)
+    languages = np.frombuffer(kernel.languages, dtype=np.intc)
+    stars = np.frombuffer(kernel.stars, dtype=np.float64)
+    
+    language = languages[left]
+    scores = np.where((language >= 0) & (language == languages[right]), float(LANGUAGE_WEIGHT), 0.0)
+    scores += _shared_token_counts(kernel, left, right) * WORD_WEIGHT
+    
+    stars1 = stars[left]
+    stars2 = stars[right]
+    both = (stars1 > 0) & (stars2 > 0)
+    ratio = np.divide(np.minimum(stars1, stars2), np.maximum(stars1, stars2),
+                      out=np.zeros(len(left)), where=both)
+    scores += ratio * STARS_WEIGHT
+    
+    # rint(x * 100) / 100 equals round(x, 2) except next to a half cent, where
+    # the scaling error can tip it; those few scores are rounded by Python
+    scaled = scores * 100
+    rounded = np.rint(scaled) / 100
+    for k in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6):
+        rounded[k] = round(float(scores[k]), 2)
+    return array('d', rounded.tobytes())
+
+def _shared_token_counts(kernel, left, right):
+    """Shared token count per pair: one sorted-array intersection of (pair, token) keys for the whole block."""
+    token_ptr = np.frombuffer(kernel.token_ptr, dtype=np.int64)
+    token_ids = np.frombuffer(kernel.token_ids, dtype=np.intc)
+    left_pairs, left_tokens = _pair_tokens(token_ptr, token_ids, left)
+    right_pairs, right_tokens = _pair_tokens(token_ptr, token_ids, right)
+    
+    # Rows are sorted and pairs ascend, so both key arrays come out sorted and unique
+    width = int(max(left_tokens.max(initial=0), right_tokens.max(initial=0))) + 1
+    left_keys = left_pairs * width + left_tokens
+    right_keys = right_pairs * width + right_tokens
+    if not len(left_keys):
+        return np.zeros(len(left), dtype=np.int64)
+    positions = np.minimum(np.searchsorted(left_keys, right_keys), len(left_keys) - 1)
+    shared = left_keys[positions] == right_keys
+    return np.bincount(right_pairs[shared], minlength=len(left))
+
+def _pair_tokens(token_ptr, token_ids, nodes):
+    """Concatenated token rows of `nodes`, with the position in `nodes` each token belongs to."""
+    starts = token_ptr[nodes]
+    lengths = token_ptr[nodes + 1] - starts
+    pairs = np.repeat(np.arange(len(nodes)), lengths)
+    # Token k of the concatenation sits at its row start plus its offset within the row
+    row_offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    tokens = token_ids[row_offsets + np.arange(len(pairs))]
+    return pairs, tokens.astype(np.int64)
+
+def _score_pairs_python(kernel, left, right):
+    """Score aligned pair arrays one pair at a time; the hot loop keeps everything in locals."""
+    languages = kernel.languages
+    stars = kernel.stars
+    tokens = kernel.tokens
+    scores = array('d', bytes(8 * len(left)))
+    
+    for k in range(len(left)):
+        i = left[k]
+        j = right[k]
+        score = 0
+        
+        language = languages[i]
+        if language >= 0 and language == languages[j]:
+            score += LANGUAGE_WEIGHT
+        
+        score += len(tokens[i] & tokens[j]) * WORD_WEIGHT
+        
+        stars1 = stars[i]
+        stars2 = stars[j]
+        if stars1 > 0 and stars2 > 0:
+            if stars1 < stars2:
+                score += stars1 / stars2 * STARS_WEIGHT
+            else:
+                score += stars2 / stars1 * STARS_WEIGHT
+        
+        scores[k] = round(score, 2)
+    
+    return scores
@@ -0,0 +1,188 @@
+"""
+Subscription matching for notification preferences.
+Indexes many subscribers' rules (minimum stars, keywords, languages) so the
+subscribers interested in a project are found without scanning them all.
+"""
+
+from bisect import bisect_right, insort
+from collections import deque
+
+class SubscriptionIndex:
+    """
+    Index of subscriber preference rules.
+    
+    A rule matches a project like NotificationManager.check_and_notify: stars
+    at or above `min_stars`, any keyword contained in the lowercased
+    description or name (when keywords are given), and the project language
+    among `languages` (when given).
+    
+    Keywords are found through an Aho-Corasick automaton over all keywords,
+    which scans the project text once. Each keyword's subscribers, and the
+    subscribers without keywords (in per-language buckets plus an
+    any-language bucket), are kept sorted by star threshold, so only the
+    prefix whose threshold the project meets is visited; language rules of
+    keyword subscribers are then checked directly. Cost per project is the
+    text length plus the number of candidates, not the number of
+    subscribers.
+    """
+    
+    def __init__(self):
+        self.subscriptions = {}  # subscriber ID -> rule dict
+        self._keyword_postings = {}  # keyword -> sorted [(min_stars, subscriber ID)]
+        self._buckets = {}  # language (None = any) -> sorted [(min_stars, subscriber ID)]
+        self._automaton = None
+    
+    def __len__(self):
+        return len(self.subscriptions)
+    
+    def add_subscription(self, subscriber_id, min_stars=0, keywords=(), languages=(), address=None, digest=None):
+        """
+        Add or replace a subscriber's rule.
+        
+        Args:
+            subscriber_id: Unique subscriber ID
+            min_stars: Minimum stars
+            keywords: Words of which at least one must appear (empty = any)
+            languages: Accepted languages (empty = any)
+            address: Optional delivery address (e.g. email)
+            digest: Optional digest period ("daily" or "weekly"); None = immediate alerts
+        """
+        if subscriber_id in self.subscriptions:
+            self.remove_subscription(subscriber_id)
+        
+        rule = {
+            "min_stars": min_stars or 0,
+            "keywords": sorted({keyword.lower() for keyword in keywords if keyword}),
+            "languages": frozenset(languages),
+            "address": address,
+            "digest": digest
+        }
+        self.subscriptions[subscriber_id] = rule
+        
+        if rule["keywords"]:
+            for keyword in rule["keywords"]:
+                if keyword not in self._keyword_postings:
+                    self._keyword_postings[keyword] = []
+                    self._automaton = None
+                insort(self._keyword_postings[keyword], (rule["min_stars"], subscriber_id))
+        else:
+            for language in rule["languages"] or (None,):
+                insort(self._buckets.setdefault(language, []), (rule["min_stars"], subscriber_id))
+    
+    def remove_subscription(self, subscriber_id):
+        """Remove a subscriber; returns False if unknown."""
+        rule = self.subscriptions.pop(subscriber_id, None)
+        if rule is None:
+            return False
+        
+        if rule["keywords"]:
+            for keyword in rule["keywords"]:
+                postings = self._keyword_postings[keyword]
+                postings.remove((rule["min_stars"], subscriber_id))
+                if not postings:
+                    del self._keyword_postings[keyword]
+                    self._automaton = None
+        else:
+            for language in rule["languages"] or (None,):
+                self._buckets[language].remove((rule["min_stars"], subscriber_id))
+        return True
+    
+    def match(self, project):
+        """
+        Find the subscribers whose rules match a project.
+        
+        Returns:
+            List of subscriber IDs
+        """
+        stars = project.get("stargazers_count", 0) or 0
+        language = project.get("language")
+        matched = []
+        
+        bound = (stars, _MAX_KEY)
+        
+        # Keyword-free rules: prefix of the star-sorted language buckets
+        for bucket in (self._buckets.get(None), self._buckets.get(language) if language is not None else None):
+            if bucket:
+                matched.extend(subscriber_id for _, subscriber_id in bucket[:bisect_right(bucket, bound)])
+        
+        # Keyword rules: star-qualified postings of the keywords found, then language checks
+        if self._keyword_postings:
+            text = f"{project.get('description') or ''} {project.get('full_name', '')}".lower()
+            candidates = set()
+            for keyword in self._get_automaton().find(text):
+                postings = self._keyword_postings[keyword]
+                candidates.update(subscriber_id for _, subscriber_id in postings[:bisect_right(postings, bound)])
+            subscriptions = self.subscriptions
+            for subscriber_id in candidates:
+                languages = subscriptions[subscriber_id]["languages"]
+                if not languages or language in languages:
+                    matched.append(subscriber_id)
+        
+        return matched
+    
+    def addresses(self, subscriber_ids):
+        """Delivery addresses of the given subscribers, where set."""
+        return [self.subscriptions[s]["address"] for s in subscriber_ids if self.subscriptions[s]["address"]]
+    
+    def _get_automaton(self):
+        if self._automaton is None:
+            self._automaton = _KeywordAutomaton(self._keyword_postings)
+        return self._automaton
+
+class _MaxKey:
+    """Sorts after every subscriber ID, for bisecting on star thresholds."""
+    
+    def __lt__(self, other):
+        return False
+    
+    def __gt__(self, other):
+        return True
+
+_MAX_KEY = _MaxKey()
+
+class _KeywordAutomaton:
+    """Aho-Corasick automaton reporting which keywords occur in a text."""
+    
+    def __init__(self, keywords):
+        self.transitions = [{}]
+        self.failure = [0]
+        self.outputs = [()]
+        
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions[state][char] = next_state
+                    self.transitions.append({})
+                    self.failure.append(0)
+                    self.outputs.append(())
+                state = next_state
+            self.outputs[state] = (keyword,)
+        
+        # Breadth-first: failure links point at the longest proper suffix in the trie
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.failure[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.failure[fallback]
+                target = self.transitions[fallback].get(char, 0)
+                self.failure[next_state] = target if target != next_state else 0
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.failure[next_state]]
+    
+    def find(self, text):
+        """Set of keywords occurring in text."""
+        transitions, failure, outputs = self.transitions, self.failure, self.outputs
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in transitions[state]:
+                state = failure[state]
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
@@ -0,0 +1,144 @@
+"""
+Streaming trend detection for notifications.
+Tracks each project's star velocity as an exponentially weighted moving
+average across metrics snapshots and reports velocity spikes ("trending")
+and round-number star thresholds crossed ("milestone").
+"""
+
+import json
+import os
+import time
+from bisect import bisect_right
+from math import sqrt
+
+# Trend detection configuration
+TRENDS_FILE = "trends_state.json"
+ALPHA = 0.3  # EWMA weight of the newest velocity
+SPIKE_SIGMA = 3.0  # Standard deviations above the average that count as a spike
+MIN_SPIKE_VELOCITY = 10.0  # Stars per day below which nothing is trending
+WARMUP = 3  # Velocity samples needed before spikes are reported
+# Star milestones: 100, 250, 500, 1000, 2500, ... 50M
+MILESTONES = tuple(int(base * 10 ** exponent) for exponent in range(2, 8) for base in (1, 2.5, 5))
+DAY = 24 * 3600
+
+# Per-project state slots
+_STARS, _TIME, _MEAN, _VAR, _SAMPLES, _MILESTONE = range(6)
+
+class TrendDetector:
+    """
+    Detects trending projects and star milestones from successive snapshots.
+    
+    Each project keeps a fixed six-field state: the last star count and
+    snapshot time, the EWMA and exponentially weighted variance of its
+    velocity (stars per day), the number of velocity samples and the last
+    milestone reached. A snapshot updates every project in O(1), so no
+    star history is stored. A project is trending when its velocity exceeds
+    the average by SPIKE_SIGMA standard deviations (and MIN_SPIKE_VELOCITY);
+    a milestone fires when the star count passes a new MILESTONES value.
+    Projects seen for the first time only set their baseline.
+    """
+    
+    def __init__(self, path=None, alpha=ALPHA, spike_sigma=SPIKE_SIGMA, min_velocity=MIN_SPIKE_VELOCITY,
+                 warmup=WARMUP, milestones=MILESTONES):
+        """
+        Args:
+            path: Optional JSON file the state is loaded from and saved to
+            alpha: EWMA weight of the newest velocity
+            spike_sigma: Standard deviations above the average for a spike
+            min_velocity: Minimum stars per day for a spike
+            warmup: Velocity samples needed before spikes are reported
+            milestones: Ascending star thresholds
+        """
+        self.path = path
+        self.alpha = alpha
+        self.spike_sigma = spike_sigma
+        self.min_velocity = min_velocity
+        self.warmup = warmup
+        self.milestones = tuple(milestones)
+        self.state = {}  # project full_name -> [stars, time, mean, var, samples, milestone]
+        self._dirty = False
+        if path and os.path.exists(path):
+            self.load(path)
+    
+    def __len__(self):
+        return len(self.state)
+    
+    def update(self, projects, now=None):
+        """
+        Feed a metrics snapshot.
+        
+        Args:
+            projects: Iterable of project dictionaries (full_name, stargazers_count)
+            now: Snapshot time in seconds (default: time.time())
+        
+        Returns:
+            List of events: {"project", "type" ("trending" or "milestone"),
+            "threshold" (milestone value or None), "velocity"}
+        """
+        now = now if now is not None else time.time()
+        alpha, spike_sigma, min_velocity, warmup = self.alpha, self.spike_sigma, self.min_velocity, self.warmup
+        milestones = self.milestones
+        state = self.state
+        events = []
+        
+        for project in projects:
+            name = project.get("full_name")
+            stars = project.get("stargazers_count", 0) or 0
+            index = bisect_right(milestones, stars)
+            milestone = milestones[index - 1] if index else 0
+            entry = state.get(name)
+            if entry is None:
+                state[name] = [stars, now, 0.0, 0.0, 0, milestone]
+                continue
+            
+            elapsed = now - entry[_TIME]
+            if elapsed <= 0:
+                continue
+            velocity = (stars - entry[_STARS]) * DAY / elapsed
+            mean, var, samples = entry[_MEAN], entry[_VAR], entry[_SAMPLES]
+            
+            if (samples >= warmup and velocity >= min_velocity
+                    and velocity > mean + spike_sigma * sqrt(var)):
+                events.append({"project": project, "type": "trending", "threshold": None, "velocity": velocity})
+            if milestone > entry[_MILESTONE]:
+                events.append({"project": project, "type": "milestone", "threshold": milestone,
+                               "velocity": velocity})
+                entry[_MILESTONE] = milestone
+            
+            # Incremental EWMA and exponentially weighted variance
+            if samples:
+                diff = velocity - mean
+                increment = alpha * diff
+                entry[_MEAN] = mean + increment
+                entry[_VAR] = (1 - alpha) * (var + diff * increment)
+            else:
+                entry[_MEAN] = velocity
+            entry[_SAMPLES] = samples + 1
+            entry[_STARS] = stars
+            entry[_TIME] = now
+        
+        self._dirty = True
+        return events
+    
+    def velocity(self, name):
+        """Average star velocity (stars per day) of a project, or None if unknown."""
+        entry = self.state.get(name)
+        return entry[_MEAN] if entry and entry[_SAMPLES] else None
+    
+    def load(self, path):
+        """Replace the state with the one saved at path."""
+        with open(path, "r", encoding="utf-8") as f:
+            self.state = json.load(f).get("projects", {})
+        self._dirty = False
+    
+    def save(self, path=None):
+        """Write the state to path (default: the detector's path) if it changed."""
+        path = path or self.path
+        if not path or not self._dirty:
+            return False
+        temp_path = f"{path}.tmp{os.getpid()}"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "projects": self.state}, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+        self._dirty = False
+        return True
@@ -0,0 +1,138 @@
+"""
+Webhook notification channel.
+POSTs batches of notifications as JSON to an HTTP endpoint over a pooled
+keep-alive session, with optional HMAC-SHA256 signing and delivery metrics.
+"""
+
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from modules.dispatcher import Channel
+
+# Webhook configuration
+BATCH_SIZE = 100  # Events per POST
+BATCH_INTERVAL_MS = 200  # Longest wait for a batch to fill
+MAX_CONCURRENCY = 4  # Requests in flight per endpoint
+REQUEST_TIMEOUT = 10  # Seconds
+SIGNATURE_HEADER = "X-Signature-256"
+LATENCY_SAMPLES = 1000  # Recent request latencies kept for percentiles
+
+class WebhookChannel(Channel):
+    """
+    Delivers notifications to a webhook endpoint in batches.
+    
+    Each POST carries up to `batch_size` events, sent once the batch is full
+    or `batch_interval_ms` after its first event. The endpoint gets its own
+    keep-alive connection pool sized to `max_concurrency`, which also caps
+    the requests in flight. With a secret, the body is signed with
+    HMAC-SHA256 in the X-Signature-256 header ("sha256=<hex digest>").
+    Non-2xx responses raise, so the dispatcher retries the batch.
+    """
+    
+    def __init__(self, url, secret=None, name="webhook", batch_size=BATCH_SIZE,
+                 batch_interval_ms=BATCH_INTERVAL_MS, max_concurrency=MAX_CONCURRENCY,
+                 timeout=REQUEST_TIMEOUT, headers=None):
+        """
+        Args:
+            url: Endpoint receiving POSTed batches
+            secret: Optional HMAC signing key
+            name: Channel name used by the dispatcher
+            batch_size: Events per request
+            batch_interval_ms: Longest wait for a batch to fill
+            max_concurrency: Requests in flight to the endpoint
+            timeout: Per-request timeout in seconds
+            headers: Extra request headers
+        """
+        self.url = url
+        self.secret = secret.encode("utf-8") if isinstance(secret, str) else secret
+        self.name = name
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval_ms / 1000
+        self.workers = max_concurrency
+        self.timeout = timeout
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Content-Type"] = "application/json"
+        self.session.headers.update(headers or {})
+        
+        self._in_flight = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._started = None
+        self.stats = {"events": 0, "requests": 0, "failures": 0, "bytes": 0}
+    
+    def send_batch(self, notifications):
+        """POST a batch of notifications; raises on failure."""
+        body = json.dumps({
+            "events": notifications,
+            "sent_at": datetime.now().isoformat()
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        headers = {}
+        if self.secret:
+            headers[SIGNATURE_HEADER] = "sha256=" + hmac.new(self.secret, body, hashlib.sha256).hexdigest()
+        
+        with self._in_flight:
+            start = time.perf_counter()
+            try:
+                response = self.session.post(self.url, data=body, headers=headers, timeout=self.timeout)
+                response.raise_for_status()
+            except requests.exceptions.RequestException:
+                with self._lock:
+                    self.stats["failures"] += 1
+                raise
+            elapsed = time.perf_counter() - start
+        
+        with self._lock:
+            if self._started is None:
+                self._started = start
+            self._latencies.append(elapsed)
+            self.stats["events"] += len(notifications)
+            self.stats["requests"] += 1
+            self.stats["bytes"] += len(body)
+    
+    def metrics(self):
+        """
+        Delivery metrics.
+        
+        Returns:
+            Dictionary with counters, events per second since the first
+            delivery and latency percentiles (ms) over recent requests
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = dict(self.stats)
+            elapsed = time.perf_counter() - self._started if self._started is not None else 0
+        
+        def percentile(fraction):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] * 1000, 2)
+        
+        stats.update({
+            "events_per_second": round(stats["events"] / elapsed, 1) if elapsed else 0.0,
+            "latency_ms_p50": percentile(0.5),
+            "latency_ms_p95": percentile(0.95),
+            "latency_ms_max": percentile(1.0)
+        })
+        return stats
+    
+    def close(self):
+        self.session.close()
+
+def verify_signature(secret, body, signature):
+    """Check an X-Signature-256 header value against a request body."""
+    if isinstance(secret, str):
+        secret = secret.encode("utf-8")
+    expected = "sha256=" + hmac.new(secret, body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature or "")
@@ -37,6 +37,59 @@ def test_promotion(projects):
     
     print("   ✅ Promotion works")
 
+def test_batch_promotion():
+    """Test rendering a batch of projects as one document."""
+    print("\n🧪 Testing batch promotion...")
+    import io
+    import json
+    import os
+    import time
+    from html.parser import HTMLParser
+    from modules import promote
+    
+    def generate(count):
+        for i in range(count):
+            yield {"full_name": f"demo/p{i}", "description": f"Tool <{i}> & more", "stargazers_count": i,
+                   "forks_count": 1, "language": "Python", "html_url": f"https://github.com/demo/p{i}?a=1&b=2"}
+    
+    # JSON is one array, matching the single-project records
+    stream = io.StringIO()
+    assert promote.promote_projects(generate(1203), format="json", sink=stream) == 1203, "Count should be returned"
+    records = json.loads(stream.getvalue())
+    assert len(records) == 1203 and records[1202]["name"] == "demo/p1202", "JSON should be a single array"
+    assert records[0] == json.loads(promote.promote_project(next(generate(1)), format="json")), "Records should match"
+    stream = io.StringIO()
+    promote.promote_projects([], format="json", sink=stream)
+    assert json.loads(stream.getvalue()) == [], "An empty batch should be an empty array"
+    
+    # Console output matches promote_project; HTML is one escaped document
+    stream = io.StringIO()
+    promote.promote_projects(generate(2), format="console", sink=stream)
+    assert stream.getvalue().count("📦 Name: demo/p") == 2, "Console output should list every project"
+    stream = io.StringIO()
+    promote.promote_projects(generate(3), format="html", sink=stream)
+    document = stream.getvalue()
+    assert document.startswith("<!DOCTYPE html>") and document.count("</html>") == 1, "HTML should be one document"
+    assert "Tool &lt;1&gt; &amp; more" in document, "HTML fields should be escaped"
+    HTMLParser().feed(document)
+    single = promote.promote_project(next(generate(1)), format="html")
+    assert "Tool &lt;0&gt; &amp; more" in single and "?a=1&amp;b=2" in single, "Single HTML should be escaped too"
+    stream = io.StringIO()
+    promote.promote_projects(generate(3), format="markdown", sink=stream)
+    assert stream.getvalue().count("\n# ") == 0 and stream.getvalue().count("## 🚀") == 3, "Markdown should have one title"
+    
+    # Large batches stream to a file
+    path = "/tmp/test_promote_batch.json"
+    start = time.time()
+    promote.promote_projects(generate(100000), format="json", sink=path)
+    elapsed = time.time() - start
+    with open(path, encoding="utf-8") as f:
+        assert len(json.load(f)) == 100000, "File output should be a complete array"
+    os.remove(path)
+    print(f"   100k projects rendered to a file in {elapsed:.2f}s")
+    
+    print("   ✅ Batch promotion works")
+
 def test_ai_analysis(projects):
     """Test AI analysis."""
     print("\n🧪 Testing AI analysis...")
@@ -82,20 +135,741 @@ def test_network_analysis(projects):
     print(f"   Network density: {ecosystem['network_density']}")
     print("   ✅ Network analysis works")
 
+def test_network_incremental():
+    """Test incremental network construction."""
+    print("\n🧪 Testing incremental network construction...")
+    from modules.network_analysis import NetworkAnalyzer
+    
+    projects = [
+        {"full_name": f"demo/project-{i}", "language": "Python" if i % 2 else "Go",
+         "description": f"innovative ai tool number {i}", "stargazers_count": 100 + i}
+        for i in range(6)
+    ]
+    
+    full = NetworkAnalyzer()
+    full.add_projects(projects)
+    
+    incremental = NetworkAnalyzer()
+    incremental.add_projects(projects[:3])
+    incremental.add_projects(projects[3:])
+    incremental.add_projects(projects[:2])  # Already known, must not duplicate edges
+    
+    assert len(incremental.projects) == len(projects), "Known projects should be skipped"
+    for project in projects:
+        name = project["full_name"]
+        assert sorted(c["project"] for c in incremental.get_connections(name)) == \
+            sorted(c["project"] for c in full.get_connections(name)), "Batches should match a full build"
+    
+    print("   ✅ Incremental network construction works")
+
+def test_network_blocking():
+    """Test candidate blocking and similarity threshold."""
+    print("\n🧪 Testing network candidate blocking...")
+    from modules.network_analysis import NetworkAnalyzer
+    
+    projects = [
+        {"full_name": "a/quantum", "language": "Rust", "description": "quantum simulator", "stargazers_count": 5000},
+        {"full_name": "b/quantum", "language": "Go", "description": "quantum compiler", "stargazers_count": 40},
+        {"full_name": "c/web", "language": "Ruby", "description": "web framework", "stargazers_count": 3},
+    ]
+    
+    analyzer = NetworkAnalyzer()
+    analyzer.add_projects(projects)
+    assert [c["project"] for c in analyzer.get_connections("a/quantum")] == ["b/quantum"], \
+        "Only projects sharing a block should be compared"
+    assert analyzer.get_connections("c/web") == [], "Unrelated projects should stay unconnected"
+    
+    strict = NetworkAnalyzer(min_similarity=1)
+    strict.add_projects(projects)
+    assert strict.get_connections("a/quantum") == [], "Weak links should be dropped by the threshold"
+    
+    print("   ✅ Network candidate blocking works")
+
+def test_similarity_kernel():
+    """Test the vectorized similarity kernel against the per-pair scorer."""
+    print("\n🧪 Testing similarity kernel...")
+    from modules.network_analysis import NetworkAnalyzer
+    from modules.similarity import SimilarityKernel
+    
+    projects = [
+        {"full_name": "a/one", "language": "Python", "description": "Fast AI toolkit", "stargazers_count": 120},
+        {"full_name": "b/two", "language": "Python", "description": "ai toolkit for data", "stargazers_count": 45},
+        {"full_name": "c/three", "language": None, "description": None, "stargazers_count": 0},
+        {"full_name": "d/four", "language": "Go", "description": "fast cloud toolkit", "stargazers_count": 120},
+    ]
+    
+    kernel = SimilarityKernel()
+    for project in projects:
+        kernel.add(project)
+    
+    left = [i for i in range(len(projects)) for j in range(len(projects)) if i < j]
+    right = [j for i in range(len(projects)) for j in range(len(projects)) if i < j]
+    expected = [NetworkAnalyzer()._calculate_similarity(projects[i], projects[j]) for i, j in zip(left, right)]
+    
+    assert list(kernel.score_pairs(left, right, workers=1)) == expected, "Kernel should match the per-pair scorer"
+    assert list(kernel.score_row(0))[1:] == expected[:3], "Row scoring should match pair scoring"
+    assert list(kernel.score_pairs(left * 20, right * 20, workers=1)) == expected * 20, \
+        "Batch scoring (NumPy when installed) should match the per-pair scorer"
+    
+    # Star counts from JSON caches may be floats, or missing
+    mixed = [dict(projects[0], stargazers_count=120.0), dict(projects[1], stargazers_count=45.5),
+             {key: value for key, value in projects[3].items() if key != "stargazers_count"}]
+    kernel = SimilarityKernel()
+    for project in mixed:
+        kernel.add(project)
+    assert list(kernel.score_pairs([0, 0, 1], [1, 2, 2], workers=1)) == [
+        NetworkAnalyzer()._calculate_similarity(mixed[i], mixed[j]) for i, j in [(0, 1), (0, 2), (1, 2)]
+    ], "Float and missing star counts should score like the per-pair scorer"
+    analyzer = NetworkAnalyzer()
+    analyzer.add_projects(mixed)
+    assert analyzer.get_connections("a/one"), "Networks should accept float star counts"
+    
+    print("   ✅ Similarity kernel works")
+
+def test_project_graph():
+    """Test CSR graph construction from an edge stream."""
+    print("\n🧪 Testing CSR project graph...")
+    from modules.graph import GraphBuilder
+    
+    builder = GraphBuilder()
+    builder.add_edge(0, 1, 2.5)
+    builder.add_edge(1, 2, 1.25)
+    graph = builder.build(3)
+    
+    builder.add_edge(3, 0, 4.0)  # Merged into the existing rows
+    graph = builder.build(4, base=graph)
+    
+    assert graph.num_edges == 3, "Graph should have 3 edges"
+    assert list(graph.neighbors(0)[0]) == [1, 3], "Existing rows should be kept and extended"
+    assert graph.degree(1) == 2, "Node 1 should have 2 neighbours"
+    assert sorted(graph.edges()) == [(0, 1, 2.5), (0, 3, 4.0), (1, 2, 1.25)], "Edges should round-trip"
+    
+    print("   ✅ CSR project graph works")
+
+def test_community_detection():
+    """Test community detection on two loosely linked cliques."""
+    print("\n🧪 Testing community detection...")
+    from modules.graph import GraphBuilder
+    from modules.communities import detect_communities
+    
+    builder = GraphBuilder()
+    for group in (range(0, 4), range(4, 8)):
+        for u in group:
+            for v in group:
+                if u < v:
+                    builder.add_edge(u, v, 3.0)
+    builder.add_edge(3, 4, 0.5)
+    graph = builder.build(9)  # Node 8 is isolated
+    
+    for method in ("louvain", "label_propagation"):
+        result = detect_communities(graph, method=method)
+        labels = result["labels"]
+        assert len(set(labels[:4])) == 1 and len(set(labels[4:8])) == 1, f"{method} should find both cliques"
+        assert labels[0] != labels[4], f"{method} should separate the cliques"
+        assert result["sizes"][:2] == [4, 4], "Community sizes should be reported largest first"
+        assert result["modularity"] > 0.4, "Modularity should reflect the structure"
+    
+    seeded = detect_communities(graph, seeds=result["labels"])
+    assert seeded["modularity"] == result["modularity"], "Seeding with a good partition should keep it"
+    
+    print("   ✅ Community detection works")
+
+def test_centrality():
+    """Test weighted centrality metrics."""
+    print("\n🧪 Testing centrality metrics...")
+    from modules.graph import GraphBuilder
+    from modules import centrality
+    
+    builder = GraphBuilder()
+    for u, v, weight in [(0, 1, 1.0), (1, 2, 1.0), (2, 3, 1.0), (1, 3, 1.0), (3, 4, 2.0)]:
+        builder.add_edge(u, v, weight)
+    graph = builder.build(5)
+    
+    assert list(centrality.weighted_degree(graph)) == [1.0, 3.0, 2.0, 4.0, 2.0], "Weighted degree should sum similarities"
+    
+    ranks = centrality.get_centrality(graph, "pagerank")
+    assert abs(sum(ranks) - 1) < 1e-9, "PageRank should sum to 1"
+    assert max(range(5), key=ranks.__getitem__) == 3, "The heaviest hub should rank first"
+    assert centrality.get_centrality(graph, "pagerank") is ranks, "Results should be cached on the graph"
+    
+    betweenness = centrality.approximate_betweenness(graph, samples=5)
+    assert list(betweenness) == [0.0, 3.0, 0.0, 3.0, 0.0], "Exact when every node is sampled"
+    
+    from modules.network_analysis import NetworkAnalyzer
+    analyzer = NetworkAnalyzer()
+    analyzer.add_projects(
+        [{"full_name": f"demo/lonely{i}", "language": None, "description": f"lonely{i}", "stargazers_count": 0}
+         for i in range(6)] +
+        [{"full_name": f"demo/p{i}", "language": None, "description": f"word{i} word{i + 1}", "stargazers_count": 0}
+         for i in range(4)]
+    )
+    central = analyzer.get_central_projects(limit=4, metric="betweenness")
+    assert [name for name, _ in central] == ["demo/p1", "demo/p2", "demo/p0", "demo/p3"], \
+        "Unconnected projects should not take places in the top list"
+    
+    print("   ✅ Centrality metrics work")
+
+def test_collaborator_query():
+    """Test single-source collaborator suggestions."""
+    print("\n🧪 Testing collaborator suggestions...")
+    from modules.network_analysis import suggest_collaborators
+    
+    projects = [
+        {"full_name": "a/ml", "language": "Python", "description": "machine learning toolkit", "stargazers_count": 500},
+        {"full_name": "b/ml", "language": "Python", "description": "machine learning models", "stargazers_count": 450},
+        {"full_name": "c/web", "language": "Ruby", "description": "web framework", "stargazers_count": 20},
+        {"full_name": "d/misc", "language": None, "description": None, "stargazers_count": 0},
+    ]
+    
+    suggestions = suggest_collaborators("a/ml", projects, limit=2)
+    assert [s["project"] for s in suggestions] == ["b/ml", "c/web"], "Suggestions should be ranked by similarity"
+    assert suggestions[0]["similarity"] == 5.8, "Similarity should match the pairwise score"
+    assert suggest_collaborators("unknown/project", projects) == [], "Unknown projects have no suggestions"
+    
+    print("   ✅ Collaborator suggestions work")
+
+def test_network_traversal():
+    """Test bounded multi-hop network traversal."""
+    print("\n🧪 Testing network traversal...")
+    from modules.network_analysis import NetworkAnalyzer, visualize_network_text
+    
+    # A chain of projects: each shares one word with the next
+    projects = [
+        {"full_name": f"demo/p{i}", "language": None, "description": f"word{i} word{i + 1}", "stargazers_count": 0}
+        for i in range(6)
+    ]
+    analyzer = NetworkAnalyzer()
+    analyzer.add_projects(projects)
+    
+    network = analyzer.get_project_network("demo/p0", depth=3)
+    assert list(network) == ["demo/p0", "demo/p1", "demo/p2"], "Depth should bound the expanded projects"
+    assert network["demo/p1"] == [{"project": "demo/p0", "similarity": 0.5}, {"project": "demo/p2", "similarity": 0.5}], \
+        "Connections should be listed for each expanded project"
+    
+    limited = analyzer.get_project_network("demo/p0", depth=5, fanout=1, min_similarity=0.5, max_nodes=3)
+    assert [len(c) for c in limited.values()] == [1, 2, 1], "Fan-out and node budget should apply"
+    assert limited["demo/p2"] == [{"project": "demo/p1", "similarity": 0.5}], \
+        "Discovered connections should be kept past the node budget"
+    assert analyzer.get_project_network("demo/p2", depth=5, fanout=len(projects)) == \
+        analyzer.get_project_network("demo/p2", depth=5), "An unbounded fan-out should match the full traversal"
+    forward = analyzer.get_project_network("demo/p2", depth=2, fanout=1)
+    assert len(forward) == 2 and len(forward["demo/p2"]) == 1, "Fan-out should bound the projects followed"
+    assert "demo/p0" in visualize_network_text(analyzer.iter_project_network("demo/p0")), "Visualizer should accept streams"
+    
+    print("   ✅ Network traversal works")
+
+def test_graph_snapshot():
+    """Test binary network snapshots with deltas."""
+    print("\n🧪 Testing graph snapshots...")
+    import os
+    from modules.graph_store import GraphStore
+    from modules.network_analysis import NetworkAnalyzer
+    
+    path = "/tmp/test_network.gsnap"
+    for stale in (path, path + ".delta"):
+        if os.path.exists(stale):
+            os.remove(stale)
+    
+    projects = [
+        {"full_name": f"demo/p{i}", "language": None, "description": f"word{i} word{i + 1}", "stargazers_count": 0}
+        for i in range(6)
+    ]
+    analyzer = NetworkAnalyzer()
+    analyzer.add_projects(projects[:4])
+    analyzer.get_central_projects()
+    analyzer.get_central_projects(metric="degree")
+    assert analyzer.save_snapshot(path) == "snapshot", "First save should write a snapshot"
+    assert analyzer.save_snapshot(path) == "unchanged", "Saving without changes should write nothing"
+    assert not os.path.exists(path + ".delta"), "No-op saves should not grow the delta log"
+    
+    loaded = NetworkAnalyzer.load_snapshot(path)
+    assert dict(loaded.connections) == dict(analyzer.connections), "Snapshot should restore the network"
+    assert loaded.get_central_projects() == analyzer.get_central_projects(), "Snapshot should restore metrics"
+    degrees = loaded.get_central_projects(metric="degree")
+    assert degrees == analyzer.get_central_projects(metric="degree"), "Degrees should be restored"
+    assert all(type(score) is int for _, score in degrees), "Degrees should load as integers"
+    
+    loaded.add_projects(projects[4:])
+    assert GraphStore(path, compact_ratio=100).save(loaded) == "delta", "Later saves should append a delta"
+    reloaded = NetworkAnalyzer.load_snapshot(path)
+    assert reloaded.get_connections("demo/p5") == [{"project": "demo/p4", "similarity": 0.5}], \
+        "Deltas should be replayed on load"
+    
+    GraphStore(path).compact()
+    assert not os.path.exists(path + ".delta"), "Compaction should fold deltas into the snapshot"
+    assert len(NetworkAnalyzer.load_snapshot(path).projects) == 6, "Compacted snapshot should hold every project"
+    
+    print("   ✅ Graph snapshots work")
+
+def test_graph_export():
+    """Test streaming network export."""
+    print("\n🧪 Testing graph export...")
+    import gzip
+    import io
+    import xml.etree.ElementTree as ET
+    from modules.network_analysis import NetworkAnalyzer
+    
+    projects = [
+        {"full_name": f"demo/p{i}", "language": None, "description": f"word{i} word{i + 1}", "stargazers_count": i}
+        for i in range(4)
+    ]
+    analyzer = NetworkAnalyzer()
+    analyzer.add_projects(projects)
+    
+    out = io.StringIO()
+    assert analyzer.export(out) == 3, "Every edge should be exported"
+    assert "demo/p0\tdemo/p1\t0.5" in out.getvalue(), "Edge list should name both endpoints"
+    
+    analyzer.find_communities()
+    for format in ("graphml", "gexf"):
+        path = f"/tmp/test_network.{format}.gz"
+        analyzer.export(path, format=format)
+        with gzip.open(path) as f:
+            root = ET.parse(f).getroot()
+        assert len([e for e in root.iter() if e.tag.endswith("}edge")]) == 3, f"{format} should hold every edge"
+    
+    print("   ✅ Graph export works")
+
+def test_contributor_network():
+    """Test the contributor-overlap network against a local API stub."""
+    print("\n🧪 Testing contributor network...")
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from modules.contributors import ContributorNetwork
+    from modules.github_client import GitHubClient
+    from modules.network_analysis import NetworkAnalyzer
+    
+    contributors = {"demo/a": ["alice", "carol"], "demo/b": ["alice", "bob", "carol"], "demo/c": ["bob"]}
+    
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = "/".join(self.path.split("?")[0].split("/")[2:4])
+            if self.headers.get("If-None-Match") == f'"{name}"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = json.dumps([{"login": login, "type": "User"} for login in contributors[name]]).encode()
+            self.send_response(200)
+            self.send_header("ETag", f'"{name}"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = GitHubClient(base_url=f"http://127.0.0.1:{server.server_port}", cache_ttl=0)
+        network = ContributorNetwork(client)
+        analyzer = NetworkAnalyzer()
+        analyzer.add_projects([{"full_name": name, "description": ""} for name in contributors])
+        
+        graph = analyzer.get_contributor_graph(network)
+        assert sorted(graph.edges()) == [(0, 1, 2), (1, 2, 1)], "Edges should count shared contributors"
+        assert network.shared_contributors("demo/a", "demo/b") == ["alice", "carol"], "Shared logins should be listed"
+        assert network.refresh(analyzer.projects) == 0, "Fresh contributor lists should not be refetched"
+        
+        network.refresh(analyzer.projects, force=True)
+        assert client.stats["not_modified"] == 3, "Stale cache entries should be revalidated with ETags"
+    finally:
+        server.shutdown()
+    
+    print("   ✅ Contributor network works")
+
+def notification_config(name, **config):
+    """Write a notification config for a test, with its state files under /tmp."""
+    import glob
+    import json
+    import os
+    
+    for stale in glob.glob(f"/tmp/test_{name}_*"):
+        os.remove(stale)
+    state_files = {
+        "history_file": f"/tmp/test_{name}_history.jsonl",
+        "seen_file": f"/tmp/test_{name}_seen.bin",
+        "trends_file": f"/tmp/test_{name}_trends.json",
+        "digest_file": f"/tmp/test_{name}_digests.json"
+    }
+    config_file = f"/tmp/test_{name}_config.json"
+    with open(config_file, "w") as f:
+        json.dump({"channels": {"console": True}, "preferences": {}, **state_files, **config}, f)
+    return config_file
+
 def test_notifications(projects):
     """Test notification system."""
     print("\n🧪 Testing notifications...")
     from modules.notifications import NotificationManager
     
-    notifier = NotificationManager()
+    notifier = NotificationManager(notification_config("notifications"))
     result = notifier.send_notification("new_project", projects[0], "Test notification")
     assert result == True, "Notification should be sent successfully"
     
     history = notifier.get_notification_history()
     assert len(history) > 0, "Should have notification history"
+    assert notifier.flush(), "Queued notifications should be delivered"
+    notifier.close()
     
     print("   ✅ Notifications work")
 
+def test_notification_dispatcher():
+    """Test background delivery with batching, retries and dead-lettering."""
+    print("\n🧪 Testing notification dispatcher...")
+    import json
+    import os
+    import time
+    from modules.dispatcher import CallbackChannel, Channel, NotificationDispatcher
+    
+    class SlowChannel(Channel):
+        name = "slow"
+        batch_size = 10
+        batch_interval = 0.05
+        
+        def __init__(self):
+            self.batches = []
+        
+        def send_batch(self, notifications):
+            time.sleep(0.2)
+            self.batches.append(len(notifications))
+    
+    def fail(notification):
+        raise ConnectionError("endpoint down")
+    
+    dead_letter_file = "/tmp/test_dead_letter.jsonl"
+    if os.path.exists(dead_letter_file):
+        os.remove(dead_letter_file)
+    slow = SlowChannel()
+    dispatcher = NotificationDispatcher([slow, CallbackChannel("broken", fail)], max_retries=2, retry_delay=0.01,
+                                        dead_letter_file=dead_letter_file)
+    
+    start = time.perf_counter()
+    for i in range(25):
+        dispatcher.submit({"project": f"demo/p{i}"}, channels=["slow"])
+    dispatcher.submit({"project": "demo/lost"}, channels=["broken"])
+    assert time.perf_counter() - start < 0.1, "Submitting should not wait for slow channels"
+    
+    assert dispatcher.flush(), "Flush should wait for delivery"
+    assert sum(slow.batches) == 25 and max(slow.batches) == 10, "Notifications should be delivered in batches"
+    with open(dead_letter_file) as f:
+        dead = [json.loads(line) for line in f]
+    assert [d["notification"]["project"] for d in dead] == ["demo/lost"], "Failed deliveries should be dead-lettered"
+    assert dispatcher.stats["retried"] == 2, "Failed batches should be retried"
+    dispatcher.close()
+    
+    # Trickling events fill whole batches across concurrent senders; a flush sends the rest
+    trickle = SlowChannel()
+    trickle.batch_size, trickle.batch_interval, trickle.workers = 50, 60, 4
+    delivered = []
+    dispatcher = NotificationDispatcher([trickle, CallbackChannel("fast", delivered.append)])
+    for i in range(120):
+        dispatcher.submit({"project": f"demo/p{i}"}, channels=["slow"])
+        time.sleep(0.001)
+    dispatcher.submit({"project": "demo/fast"}, channels=["fast"])
+    time.sleep(0.1)
+    assert delivered, "A busy channel should not hold up the others"
+    assert dispatcher.flush(), "Flush should not wait for the batch interval"
+    assert sorted(trickle.batches) == [20, 50, 50], "Batches should fill before being sent"
+    dispatcher.close()
+    
+    print("   ✅ Notification dispatcher works")
+
+def test_webhook_channel():
+    """Test batched, signed webhook delivery against a local stub."""
+    print("\n🧪 Testing webhook channel...")
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from modules.notifications import NotificationManager
+    from modules.webhook import verify_signature
+    
+    received = []
+    
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            assert verify_signature("secret", body, self.headers.get("X-Signature-256")), "Body should be signed"
+            received.append(len(json.loads(body)["events"]))
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        config_file = notification_config(
+            "webhook",
+            channels={"console": False, "webhook": True},
+            webhook={"url": f"http://127.0.0.1:{server.server_port}/events", "secret": "secret", "batch_size": 50,
+                     "batch_interval_ms": 60000}
+        )
+        notifier = NotificationManager(config_file)
+        
+        for i in range(120):
+            notifier.send_notification("new_project", {"full_name": f"demo/p{i}"})
+        notifier.close()
+        
+        # Batches go out only when full or on the closing flush, whatever the timing
+        assert sorted(received) == [20, 50, 50], "Events should be POSTed in full batches"
+        metrics = notifier.dispatcher.channels["webhook"].metrics()
+        assert metrics["events"] == 120 and metrics["requests"] == len(received), "Metrics should count deliveries"
+    finally:
+        server.shutdown()
+    
+    print("   ✅ Webhook channel works")
+
+def test_email_channel():
+    """Test bulk email delivery over one SMTP connection against a local stub."""
+    print("\n🧪 Testing email channel...")
+    import socketserver
+    import threading
+    from modules.dispatcher import NotificationDispatcher
+    from modules.email_channel import EmailChannel
+    
+    sessions = []
+    
+    class StubSMTPHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            session = {"messages": 0, "recipients": 0}
+            sessions.append(session)
+            self.wfile.write(b"220 stub ESMTP\r\n")
+            for line in self.rfile:
+                command = line.decode().strip().upper()
+                if command == "DATA":
+                    self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    for data in self.rfile:
+                        if data == b".\r\n":
+                            break
+                    session["messages"] += 1
+                elif command.startswith("RCPT"):
+                    session["recipients"] += 1
+                elif command == "QUIT":
+                    self.wfile.write(b"221 Bye\r\n")
+                    return
+                elif command.startswith("EHLO"):
+                    self.wfile.write(b"250 stub\r\n")
+                    continue
+                self.wfile.write(b"250 OK\r\n")
+    
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), StubSMTPHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        subscribers = [f"user{i}@example.com" for i in range(120)]
+        channel = EmailChannel("127.0.0.1", server.server_address[1], sender="alerts@example.com",
+                               recipients=subscribers, use_tls=False, batch_interval_ms=50)
+        dispatcher = NotificationDispatcher([channel])
+        for i in range(30):
+            dispatcher.submit({"type": "new_project", "message": f"New project demo/p{i}", "url": None})
+        dispatcher.close()
+        
+        assert len(sessions) == 1, "All messages should share one SMTP session"
+        assert sessions[0]["messages"] == 90, "Recipients should be grouped into a few messages per notification"
+        assert sessions[0]["recipients"] == 30 * 120, "Every subscriber should receive every notification"
+    finally:
+        server.shutdown()
+    
+    print("   ✅ Email channel works")
+
+def test_subscriptions():
+    """Test indexed matching of many subscribers' preferences."""
+    print("\n🧪 Testing subscriptions...")
+    from modules.subscriptions import SubscriptionIndex
+    
+    index = SubscriptionIndex()
+    index.add_subscription("any", address="any@example.com")
+    index.add_subscription("python-ai", min_stars=100, keywords=["AI"], languages=["Python"])
+    index.add_subscription("popular-go", min_stars=1000, languages=["Go"])
+    index.add_subscription("chain", keywords=["blockchain", "chain"], address="chain@example.com")
+    
+    project = {"full_name": "demo/brain", "description": "AI on the blockchain", "language": "Python",
+               "stargazers_count": 500}
+    assert sorted(index.match(project)) == ["any", "chain", "python-ai"], "Keyword, language and star rules should apply"
+    assert sorted(index.match(dict(project, language="Go"))) == ["any", "chain"], "Language rules should filter"
+    assert sorted(index.match(dict(project, language="Go", stargazers_count=5000))) == ["any", "chain", "popular-go"], \
+        "Star thresholds should filter"
+    
+    index.remove_subscription("chain")
+    assert sorted(index.match(project)) == ["any", "python-ai"], "Removed subscribers should not match"
+    assert index.addresses(index.match(project)) == ["any@example.com"], "Addresses should be resolved"
+    
+    print("   ✅ Subscriptions work")
+
+def test_notification_dedup():
+    """Test persistent deduplication of notifications."""
+    print("\n🧪 Testing notification deduplication...")
+    import os
+    import time
+    from modules.dedup import SeenStore
+    from modules.dispatcher import CallbackChannel, NotificationDispatcher
+    from modules.notifications import NotificationManager
+    
+    path = "/tmp/test_notifications_seen.bin"
+    if os.path.exists(path):
+        os.remove(path)
+    
+    store = SeenStore(path, capacity=8)
+    now = time.time()
+    assert store.check_and_add("alice", "demo/p", "trending", now=now), "First alert should pass"
+    assert not store.check_and_add("alice", "demo/p", "trending", now=now + 3600), "Repeat within TTL should be dropped"
+    assert store.check_and_add("alice", "demo/p", "trending", now=now + 4 * 86400), "Repeat after TTL should pass"
+    assert store.check_and_add("alice", "demo/p", "milestone", threshold=5000), "New milestone should pass"
+    for i in range(20):
+        store.check_and_add("bob", f"demo/p{i}", "new_project")
+    store.close()
+    
+    config_file = notification_config("dedup")
+    notifier = NotificationManager(config_file, seen_store=SeenStore(path))
+    notifier.add_subscriber("alice")
+    notifier.add_subscriber("bob")
+    assert notifier.notify_subscribers({"full_name": "demo/p3"}) == ["alice"], "Seen alerts should persist across runs"
+    assert notifier.notify_subscribers({"full_name": "demo/p3"}) == [], "Each subscriber should be alerted once"
+    notifier.close()
+    
+    # Alerts that could not be delivered are not remembered as sent
+    def fail(notification):
+        raise ConnectionError("endpoint down")
+    
+    dispatcher = NotificationDispatcher([CallbackChannel("console", fail)], max_retries=0,
+                                        dead_letter_file="/tmp/test_dedup_dead_letter.jsonl")
+    notifier = NotificationManager(config_file, seen_store=SeenStore(path), dispatcher=dispatcher)
+    notifier.add_subscriber("carol")
+    assert notifier.notify_subscribers({"full_name": "demo/down"}) == ["carol"], "First alert should be queued"
+    notifier.flush()
+    assert notifier.notify_subscribers({"full_name": "demo/down"}) == ["carol"], "Dead-lettered alerts should be retried"
+    notifier.close()
+    
+    print("   ✅ Notification deduplication works")
+
+def test_notification_history():
+    """Test the bounded history buffer and the rotated, indexed log."""
+    print("\n🧪 Testing notification history...")
+    import glob
+    import os
+    from modules.history import NotificationHistory
+    
+    for stale in glob.glob("/tmp/test_history*"):
+        os.remove(stale)
+    
+    history = NotificationHistory("/tmp/test_history.jsonl", capacity=5, max_bytes=2000, max_segments=100)
+    for i in range(100):
+        history.append({"type": "new_project", "project": f"demo/p{i % 10}",
+                        "timestamp": f"2026-01-01T{i // 60:02d}:{i % 60:02d}:00"})
+    
+    assert [n["project"] for n in history.tail(2)] == ["demo/p8", "demo/p9"], "Ring buffer should keep the newest"
+    assert len(history.recent) == 5, "Ring buffer should be bounded"
+    assert len(glob.glob("/tmp/test_history.*.jsonl")) > 1, "Log should rotate"
+    
+    page = history.query(since="2026-01-01T00:40:00", until="2026-01-01T00:50:00")
+    assert [n["timestamp"][-5:] for n in page] == [f"{i}:00" for i in range(40, 50)], "Time range should be paged"
+    page = history.query(project="demo/p3", limit=3, offset=2)
+    assert [n["timestamp"][-5:] for n in page] == ["23:00", "33:00", "43:00"], "Project history should be paged"
+    assert len(history.query(since="2026-01-01T01:00:00")) == 40, "Later records should come from the active log"
+    history.close()
+    
+    reopened = NotificationHistory("/tmp/test_history.jsonl", max_bytes=2000)
+    assert len(reopened.query(project="demo/p3", limit=100)) == 10, "History should persist across runs"
+    reopened.close()
+    
+    print("   ✅ Notification history works")
+
+def test_digests():
+    """Test digest windows with coalesced events and shared fragments."""
+    print("\n🧪 Testing notification digests...")
+    from datetime import datetime, timedelta
+    from modules import digest
+    from modules.digest import DigestScheduler
+    from modules.notifications import NotificationManager
+    
+    scheduler = DigestScheduler(max_items=3)
+    monday = datetime(2026, 1, 5, 9)
+    projects = [{"full_name": f"demo/p{i}", "stargazers_count": i * 10, "description": f"Project {i}"}
+                for i in range(5)]
+    for subscriber in range(1000):
+        for project in projects:
+            scheduler.add_event(f"user{subscriber}", project, "new_project", now=monday)
+        scheduler.add_event(f"user{subscriber}", projects[0], "trending", now=monday)
+        scheduler.add_event(f"weekly{subscriber}", projects[1], "new_project", "weekly", now=monday)
+    assert scheduler.pending() == 6000, "Repeated events should be coalesced"
+    
+    rendered = []
+    original = digest.render_fragment
+    digest.render_fragment = lambda *args: rendered.append(args) or original(*args)
+    try:
+        assert list(scheduler.close_due(datetime(2026, 1, 5, 23))) == [], "Open windows should not close"
+        daily = list(scheduler.close_due(datetime(2026, 1, 6, 0)))
+    finally:
+        digest.render_fragment = original
+    
+    assert len(daily) == 1000, "Each daily subscriber should get one digest"
+    assert len(rendered) == 3, "Fragments should be rendered once and shared"
+    subscriber, period, text = daily[0]
+    assert period == "daily" and "1. 🔥 demo/p0" in text and "5 projects" in text, "Trending should rank first"
+    assert "demo/p1 " not in text, "Digest should be capped at max_items"
+    assert scheduler.pending() == 1000, "Weekly window should stay open"
+    assert len(list(scheduler.close_due(datetime(2026, 1, 12)))) == 1000, "Weekly window should close on Monday"
+    
+    # Open windows outlive a one-shot run; their events count as seen once saved
+    config_file = notification_config("digest", channels={"console": False})
+    project = {"full_name": "demo/ai-tool", "description": "ai toolkit", "stargazers_count": 50}
+    
+    notifier = NotificationManager(config_file)
+    notifier.add_subscriber("reader", keywords=["ai"], digest="weekly")
+    assert notifier.notify_subscribers(project) == ["reader"], "Digest subscribers should get the event buffered"
+    notifier.close()
+    
+    notifier = NotificationManager(config_file)
+    notifier.add_subscriber("reader", keywords=["ai"], digest="weekly")
+    assert notifier.digests.pending() == 1, "Open windows should be restored on the next run"
+    assert notifier.notify_subscribers(project) == [], "Saved digest events should count as seen"
+    assert notifier.send_digests(now=datetime.now() + timedelta(days=8)) == 1, "The restored window should be sent"
+    notifier.close()
+    assert DigestScheduler("/tmp/test_digest_digests.json").pending() == 0, "Sent windows should be dropped"
+    
+    print("   ✅ Notification digests work")
+
+def test_trend_detector():
+    """Test streaming trending and milestone detection."""
+    print("\n🧪 Testing trend detector...")
+    import os
+    import time
+    from modules.trends import TrendDetector
+    
+    if os.path.exists("/tmp/test_trends.json"):
+        os.remove("/tmp/test_trends.json")
+    
+    detector = TrendDetector("/tmp/test_trends.json")
+    projects = [{"full_name": f"demo/p{i}", "stargazers_count": 90 + i % 50} for i in range(100000)]
+    day = 24 * 3600
+    
+    for snapshot in range(5):
+        for i, project in enumerate(projects):
+            project["stargazers_count"] += i % 3
+        if snapshot == 4:
+            projects[7]["stargazers_count"] += 400
+        start = time.time()
+        events = detector.update(projects, now=snapshot * day)
+        elapsed = time.time() - start
+    
+    assert elapsed < 1.0, "100k-project snapshot should take well under a second"
+    assert len(detector) == 100000, "State should be one entry per project"
+    trending = [event["project"]["full_name"] for event in events if event["type"] == "trending"]
+    assert trending == ["demo/p7"], "Only the velocity spike should be trending"
+    milestones = {event["project"]["full_name"]: event["threshold"] for event in events if event["type"] == "milestone"}
+    assert milestones["demo/p7"] == 500, "Crossing 500 stars should be a milestone"
+    assert all(value in (100, 250, 500) for value in milestones.values()), "Milestones should be round numbers"
+    
+    detector.save()
+    reloaded = TrendDetector("/tmp/test_trends.json")
+    assert reloaded.velocity("demo/p7") == detector.velocity("demo/p7"), "State should persist across runs"
+    
+    print(f"   ✅ Trend detector works ({elapsed * 1000:.0f}ms for 100k projects)")
+
 def test_feedback():
     """Test feedback system."""
     print("\n🧪 Testing feedback system...")
@@ -111,6 +885,290 @@ def test_feedback():
     
     print("   ✅ Feedback system works")
 
+def test_feedback_storage():
+    """Test the append-only feedback log, its compaction and the SQLite backend."""
+    print("\n🧪 Testing feedback storage...")
+    import glob
+    import json
+    import os
+    import sqlite3
+    import time
+    from modules.feedback import FeedbackCollector
+    
+    for stale in glob.glob("/tmp/test_feedback_store*"):
+        os.remove(stale)
+    
+    # Legacy whole-file format is read as the initial snapshot
+    with open("/tmp/test_feedback_store.json", "w") as f:
+        json.dump({"old/project": {"ratings": [4], "comments": [{"user": "a", "rating": 4, "comment": "",
+                                                                    "timestamp": "2025-01-01T00:00:00"}],
+                                   "average_rating": 4.0}}, f)
+    
+    collector = FeedbackCollector("/tmp/test_feedback_store.json")
+    assert glob.glob("/tmp/test_feedback_store*") == ["/tmp/test_feedback_store.json"], "Reading should create no files"
+    for i in range(100):
+        collector.add_feedback(f"demo/p{i % 10}", i % 5 + 1, "ok")
+    assert collector.get_project_stats("old/project")["total_reviews"] == 1, "Legacy feedback should load"
+    with open("/tmp/test_feedback_store.jsonl") as f:
+        assert len(f.readlines()) == 101, "Each rating should be one appended log line"
+    
+    collector.compact()
+    with open("/tmp/test_feedback_store.json") as f:
+        assert len(f.readlines()) == 1 + 11, "Snapshot should be a header line plus one line per project"
+    old_log = open("/tmp/test_feedback_store.jsonl").read()
+    collector.add_feedback("demo/p0", 5, "after compaction")
+    collector.close()
+    
+    reopened = FeedbackCollector("/tmp/test_feedback_store.json")
+    assert reopened.get_project_stats("demo/p0")["total_reviews"] == 11, "Snapshot plus tail should be replayed"
+    reopened.close()
+    
+    # A log left behind by an interrupted compaction is already in the snapshot
+    with open("/tmp/test_feedback_store.jsonl", "w") as f:
+        f.write(old_log)
+    reopened = FeedbackCollector("/tmp/test_feedback_store.json")
+    assert reopened.get_project_stats("demo/p0")["total_reviews"] == 10, "Stale log should not be double-counted"
+    reopened.add_feedback("demo/p0", 4, "restarts the stale log")
+    reopened.close()
+    reopened = FeedbackCollector("/tmp/test_feedback_store.json")
+    assert reopened.get_project_stats("demo/p0")["total_reviews"] == 11, "Writing should restart the stale log"
+    reopened.close()
+    
+    # Version 1 single-document snapshots still load
+    with open("/tmp/test_feedback_store.json") as f:
+        header, *records = [json.loads(line) for line in f]
+    with open("/tmp/test_feedback_store.json", "w") as f:
+        json.dump({"version": 1, "log": header["log"], "offset": header["offset"],
+                   "projects": {record["project"]: record["data"] for record in records}}, f)
+    reopened = FeedbackCollector("/tmp/test_feedback_store.json")
+    assert reopened.get_project_stats("demo/p0")["total_reviews"] == 11, "Version 1 snapshots should load"
+    reopened.close()
+    
+    database = FeedbackCollector("/tmp/test_feedback_store.db")
+    database.add_feedback("demo/p1", 5, "great")
+    database.add_feedback("demo/p1", 3, "fine")
+    database.close()
+    
+    # Loading replays without the write lock, so another writer's open transaction does not stall it
+    writer = sqlite3.connect("/tmp/test_feedback_store.db")
+    writer.execute("BEGIN IMMEDIATE")
+    start = time.time()
+    database = FeedbackCollector("/tmp/test_feedback_store.db")
+    assert time.time() - start < 1.0, "Loading should not wait for other writers"
+    writer.rollback()
+    writer.close()
+    assert database.get_project_stats("demo/p1")["average_rating"] == 4.0, "SQLite backend should persist"
+    database.close()
+    
+    print("   ✅ Feedback storage works")
+
+def test_feedback_ranking():
+    """Test incremental rating aggregates and the top-rated indexes."""
+    print("\n🧪 Testing feedback aggregates and ranking...")
+    import glob
+    import os
+    from modules.feedback import FeedbackCollector
+    
+    for stale in glob.glob("/tmp/test_feedback_rank*"):
+        os.remove(stale)
+    
+    collector = FeedbackCollector("/tmp/test_feedback_rank.json")
+    collector.add_feedback("demo/one-review", 5, "perfect")
+    for rating in (5, 5, 4, 5, 4, 5, 5, 4, 5, 5):
+        collector.add_feedback("demo/popular", rating, "")
+    collector.add_feedback("demo/mixed", 1, "")
+    collector.add_feedback("demo/mixed", 9, "")  # Clamped to 5
+    
+    stats = collector.get_project_stats("demo/popular")
+    assert stats["total_reviews"] == 10 and stats["average_rating"] == 4.7, "Aggregates should be incremental"
+    assert stats["rating_distribution"] == {1: 0, 2: 0, 3: 0, 4: 3, 5: 7}, "Histogram should count ratings"
+    assert "ratings" not in collector.get_feedback("demo/popular"), "Ratings should not be stored twice"
+    
+    assert collector.get_top_rated_projects(1)[0][0] == "demo/one-review", "Plain average favours single reviews"
+    top = collector.get_top_rated_projects(3, bayesian=True)
+    assert [name for name, _ in top] == ["demo/popular", "demo/one-review", "demo/mixed"], "Bayesian ranking"
+    
+    collector.add_feedback("demo/mixed", 5, "")
+    collector.add_feedback("demo/mixed", 5, "")
+    assert collector.get_top_rated_projects(3)[2] == ("demo/mixed", 4.0), "Index should follow updates"
+    collector.close()
+    
+    reopened = FeedbackCollector("/tmp/test_feedback_rank.json")
+    assert reopened.get_top_rated_projects(3, bayesian=True) == collector.get_top_rated_projects(3, bayesian=True)
+    reopened.close()
+    
+    print("   ✅ Feedback aggregates and ranking work")
+
+def test_feedback_concurrency():
+    """Test group-committed feedback writes shared by several processes."""
+    print("\n🧪 Testing concurrent feedback writers...")
+    import glob
+    import os
+    import subprocess
+    from modules.feedback import FeedbackCollector
+    
+    writer = (
+        "import sys\n"
+        "from modules.feedback import FeedbackService\n"
+        "service = FeedbackService(sys.argv[1], batch_size=50)\n"
+        "for i in range(500):\n"
+        "    service.submit(f'demo/p{i % 7}', i % 5 + 1, sys.argv[2])\n"
+        "service.close()\n"
+    )
+    root = os.path.dirname(os.path.abspath(__file__))
+    
+    for path in ("/tmp/test_feedback_mp.json", "/tmp/test_feedback_mp.db"):
+        for stale in glob.glob(os.path.splitext(path)[0] + ".*"):
+            os.remove(stale)
+        
+        reader = FeedbackCollector(path)
+        workers = [subprocess.Popen([sys.executable, "-c", writer, path, f"w{n}"], cwd=root) for n in range(3)]
+        assert all(worker.wait() == 0 for worker in workers), "Writers should succeed"
+        
+        assert reader.refresh(), "Reader should see other processes' ratings"
+        assert sum(data["count"] for data in reader.feedback.values()) == 1500, "No rating should be lost"
+        assert not reader.refresh(), "Refresh without new ratings should be a no-op"
+        
+        reader.compact()
+        subprocess.run([sys.executable, "-c", writer, path, "late"], cwd=root, check=True)
+        reader.refresh()
+        assert reader.get_project_stats("demo/p0")["total_reviews"] == 4 * len(range(0, 500, 7)), "Writes after compaction"
+        reader.close()
+    
+    print("   ✅ Concurrent feedback writers work")
+
+def test_feedback_import_export():
+    """Test bulk feedback import and streaming export."""
+    print("\n🧪 Testing feedback import/export...")
+    import glob
+    import io
+    import json
+    import os
+    import threading
+    from datetime import datetime
+    from modules.feedback import FeedbackCollector
+    
+    for stale in glob.glob("/tmp/test_feedback_io*"):
+        os.remove(stale)
+    
+    collector = FeedbackCollector("/tmp/test_feedback_io.json")
+    jsonl = io.StringIO(
+        '{"project": "demo/a", "rating": 4.6, "user": "ann", "timestamp": "2025-01-01T00:00:00"}\n'
+        '{"project": "demo/a", "rating": 12}\n'
+        '{"project": "demo/b", "rating": "not a number"}\n'
+        'not json\n'
+        '{"rating": 3}\n'
+    )
+    result = collector.import_feedback(jsonl)
+    assert result == {"imported": 2, "skipped": 3}, "Invalid records should be skipped"
+    assert collector.get_project_stats("demo/a")["rating_distribution"][5] == 2, "Ratings should be rounded and clamped"
+    
+    dated = FeedbackCollector("/tmp/test_feedback_io_dates.json")
+    dated.import_feedback([{"project": "demo/t", "rating": 3, "timestamp": timestamp}
+                           for timestamp in ("yesterday", 1700000000, "2025-02-03T04:05:06")])
+    stamps = [entry["timestamp"] for entry in dated.get_feedback("demo/t")["comments"]]
+    assert stamps[2] == "2025-02-03T04:05:06", "ISO timestamps should be kept"
+    assert all(datetime.fromisoformat(stamp) > datetime(2026, 1, 1) for stamp in stamps[:2]), \
+        "Invalid timestamps should be replaced by the import time"
+    dated.close()
+    
+    csv_text = "project,rating,comment\n" + "".join(f"demo/p{i % 10},{i % 5 + 1},row {i}\n" for i in range(1000))
+    with open("/tmp/test_feedback_io.jsonl", "rb") as f:
+        lines_before = len(f.readlines())
+    assert collector.import_feedback(io.StringIO(csv_text))["imported"] == 1000, "CSV should be imported"
+    with open("/tmp/test_feedback_io.jsonl", "rb") as f:
+        assert len(f.readlines()) == lines_before + 1000, "Import should append each rating once"
+    
+    exported = io.StringIO()
+    assert collector.export_feedback(exported) == 1002, "Every rating should be exported"
+    records = [json.loads(line) for line in exported.getvalue().splitlines()]
+    assert records[0]["user"] == "ann" and records[0]["rating"] == 5, "Export should keep entry fields"
+    
+    exported_csv = io.StringIO()
+    collector.export_feedback(exported_csv, format="csv")
+    copy = FeedbackCollector("/tmp/test_feedback_io.db")
+    exported_csv.seek(0)
+    assert copy.import_feedback(exported_csv, format="csv")["imported"] == 1002, "CSV export should round-trip"
+    assert copy.get_top_rated_projects(3) == collector.get_top_rated_projects(3), "Aggregates should match"
+    
+    # Exports stream from storage as of their start, without blocking writers
+    class WritingStream(io.StringIO):
+        def __init__(self, target):
+            super().__init__()
+            self.target = target
+            self.writer_finished = None
+        
+        def write(self, text):
+            if self.writer_finished is None:
+                writer = threading.Thread(target=self.target.add_feedback, args=("demo/late", 5, "during export"))
+                writer.start()
+                writer.join(5)
+                self.writer_finished = not writer.is_alive()
+            return super().write(text)
+    
+    collector.compact()
+    for target in (collector, copy):
+        stream = WritingStream(target)
+        assert target.export_feedback(stream) == 1002, "Export should cover the snapshot and stop at its start"
+        assert stream.writer_finished, "Writers should not wait for an export to finish"
+        assert target.get_project_stats("demo/late")["total_reviews"] == 1, "Writes during an export should land"
+    copy.close()
+    collector.close()
+    
+    print("   ✅ Feedback import/export works")
+
+def test_feedback_ranking_join():
+    """Test the cached feedback join and its use in recommendations."""
+    print("\n🧪 Testing feedback-weighted recommendations...")
+    import glob
+    import os
+    import time
+    from modules import recommend
+    from modules.feedback import FeedbackCollector
+    from modules.ranking import FeedbackRanking
+    
+    for stale in glob.glob("/tmp/test_feedback_join*"):
+        os.remove(stale)
+    
+    projects = [
+        {"full_name": "demo/loved-ai", "description": "ai toolkit", "stargazers_count": 50, "innovation_score": 40},
+        {"full_name": "demo/plain-ai", "description": "ai toolkit", "stargazers_count": 50, "innovation_score": 40},
+        {"full_name": "demo/old-ai", "description": "ai toolkit", "stargazers_count": 50, "innovation_score": 40}
+    ]
+    collector = FeedbackCollector("/tmp/test_feedback_join.json")
+    collector.import_feedback([{"project": "demo/old-ai", "rating": 5, "timestamp": "2020-01-01T00:00:00"}] * 20)
+    ranking = FeedbackRanking(collector)
+    ranking.add_projects(projects)
+    
+    assert ranking.get("demo/old-ai")["average_rating"] == 5.0, "Aggregates should be joined"
+    assert ranking.get("demo/plain-ai")["stars"] == 50, "Features should be joined"
+    assert ranking.score("demo/plain-ai") == 40, "Unrated projects should keep their innovation score"
+    assert ranking.get("unknown/project") is None, "Projects neither joined nor rated should have no row"
+    assert abs(ranking.recency_score("demo/old-ai") - 3.0) < 0.01, "Old ratings should decay to the prior"
+    assert ranking.weight("demo/plain-ai") == 1.0, "Unrated projects should be neutral"
+    
+    # New feedback flows into the table incrementally, without a rebuild
+    for _ in range(10):
+        collector.add_feedback("demo/loved-ai", 5, "great")
+    assert ranking.get("demo/loved-ai")["reviews"] == 10, "Table should follow new ratings"
+    assert ranking.weight("demo/loved-ai") > ranking.weight("demo/old-ai"), "Recent praise should weigh more"
+    assert ranking.score("demo/loved-ai") == 40 * ranking.weight("demo/loved-ai"), "Scores should be precomputed"
+    
+    recs = recommend.recommend_collaborations(projects, user_interests=["ai"], limit=3, ranking=ranking)
+    assert recs[0]["project"]["full_name"] == "demo/loved-ai", "Community ratings should lift recommendations"
+    assert recs[0]["reasons"][0].startswith("Rated 5.0/5"), "Rating should be given as a reason"
+    
+    start = time.time()
+    for _ in range(10000):
+        ranking.weight("demo/loved-ai")
+    assert time.time() - start < 1.0, "Lookups should not touch storage"
+    
+    ranking.rescore(now=time.time() + 3650 * 24 * 3600)
+    assert abs(ranking.weight("demo/loved-ai") - 1.0) < 0.01, "Rescoring should decay the precomputed columns"
+    collector.close()
+    
+    print("   ✅ Feedback-weighted recommendations work")
+
 def test_multilingual():
     """Test multilingual support."""
     print("\n🧪 Testing multilingual support...")
@@ -155,11 +1213,36 @@ def main():
         # Run tests in sequence
         projects = test_detection()
         test_promotion(projects)
+        test_batch_promotion()
         test_ai_analysis(projects)
         test_recommendations(projects)
         test_network_analysis(projects)
+        test_network_incremental()
+        test_network_blocking()
+        test_similarity_kernel()
+        test_project_graph()
+        test_community_detection()
+        test_centrality()
+        test_collaborator_query()
+        test_network_traversal()
+        test_graph_snapshot()
+        test_graph_export()
+        test_contributor_network()
         test_notifications(projects)
+        test_notification_dispatcher()
+        test_webhook_channel()
+        test_email_channel()
+        test_subscriptions()
+        test_notification_dedup()
+        test_notification_history()
+        test_digests()
+        test_trend_detector()
         test_feedback()
+        test_feedback_storage()
+        test_feedback_ranking()
+        test_feedback_concurrency()
+        test_feedback_import_export()
+        test_feedback_ranking_join()
         test_multilingual()
         test_social_media(projects)
         